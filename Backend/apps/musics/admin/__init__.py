@@ -1,6 +1,8 @@
 from .album import *  # noqa
 from .artist import *  # noqa
 from .genres import *  # noqa
+from .listens import *  # noqa
 from .playlist import *  # noqa
+from .recommendations import *  # noqa
 from .stats import *  # noqa
 from .track import *  # noqa
@@ -0,0 +1,27 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin as UnfoldModelAdmin
+
+from apps.musics.models import RollupCheckpoint, TrackListenDaily, TrackListenHourly
+
+
+@admin.register(TrackListenHourly)
+class TrackListenHourlyAdmin(UnfoldModelAdmin):
+    list_display = ("id", "track", "bucket", "plays")
+    list_select_related = ("track",)
+    raw_id_fields = ("track", "album", "artist")
+    date_hierarchy = "bucket"
+    ordering = ("-bucket",)
+
+
+@admin.register(TrackListenDaily)
+class TrackListenDailyAdmin(UnfoldModelAdmin):
+    list_display = ("id", "track", "day", "plays")
+    list_select_related = ("track",)
+    raw_id_fields = ("track", "album", "artist")
+    date_hierarchy = "day"
+    ordering = ("-day",)
+
+
+@admin.register(RollupCheckpoint)
+class RollupCheckpointAdmin(UnfoldModelAdmin):
+    list_display = ("name", "position")
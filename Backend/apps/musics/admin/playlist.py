@@ -11,9 +11,12 @@ class PlaylistTrackInline(admin.TabularInline):
 
 @admin.register(Playlist)
 class PlaylistAdmin(UnfoldModelAdmin):
-    list_display = ("id", "name", "owner", "created_at")
+    list_display = ("id", "name", "owner", "kind", "tracks_count", "created_at")
     search_fields = ("title", "owner__username")
-    list_filter = ("created_at",)
+    list_filter = ("kind", "created_at")
+    raw_id_fields = ("generated_for",)
+    # Счётчики ведут сигналы (services.playlists) — руками не правим
+    readonly_fields = ("tracks_count", "total_duration", "followers_count")
     ordering = ("-created_at",)
     inlines = [PlaylistTrackInline]
     prepopulated_fields = {"slug": ("name",)}
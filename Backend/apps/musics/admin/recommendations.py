@@ -0,0 +1,20 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin as UnfoldModelAdmin
+
+from apps.musics.models import TrackItemNeighbors, TrackNeighbors
+
+
+@admin.register(TrackNeighbors)
+class TrackNeighborsAdmin(UnfoldModelAdmin):
+    list_display = ("track", "computed_at")
+    list_select_related = ("track",)
+    raw_id_fields = ("track",)
+    readonly_fields = ("neighbor_ids", "scores", "computed_at")
+
+
+@admin.register(TrackItemNeighbors)
+class TrackItemNeighborsAdmin(UnfoldModelAdmin):
+    list_display = ("track", "computed_at")
+    list_select_related = ("track",)
+    raw_id_fields = ("track",)
+    readonly_fields = ("neighbor_ids", "scores", "computed_at")
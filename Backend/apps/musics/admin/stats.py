@@ -1,7 +1,7 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin as UnfoldModelAdmin
 
-from apps.musics.models import Like, ListeningHistory
+from apps.musics.models import Like, ListeningEvent, ListeningHistory
 
 
 @admin.register(Like)
@@ -20,3 +20,12 @@ class ListeningHistoryAdmin(UnfoldModelAdmin):
     list_filter = ("listened_at",)
     date_hierarchy = "listened_at"
     ordering = ("-listened_at",)
+
+
+@admin.register(ListeningEvent)
+class ListeningEventAdmin(UnfoldModelAdmin):
+    list_display = ("id", "user", "track", "listened_at", "duration")
+    list_select_related = ("user", "track")
+    raw_id_fields = ("user", "track")
+    date_hierarchy = "listened_at"
+    ordering = ("-listened_at",)
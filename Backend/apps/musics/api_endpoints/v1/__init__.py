@@ -1,5 +1,9 @@
 from .album import *  # noqa
 from .artist import *  # noqa
+from .charts import *  # noqa
+from .mixes import *  # noqa
 from .playlist import *  # noqa
+from .recommendations import *  # noqa
+from .search import *  # noqa
 from .stats import *  # noqa
 from .track import *  # noqa
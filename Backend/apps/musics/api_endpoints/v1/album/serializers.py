@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from apps.musics.models import Album, Track, Artist, Genre
+from apps.musics.api_endpoints.v1.summaries import SummaryField, SummaryListSerializer
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -23,10 +24,11 @@ class ArtistSerializer(serializers.ModelSerializer):
 
 
 class TrackSerializer(serializers.ModelSerializer):
-    genres = GenreSerializer(many=True, read_only=True)
+    genres = SummaryField(GenreSerializer, many=True)
 
     class Meta:
         model = Track
+        list_serializer_class = SummaryListSerializer
         fields = (
             "id",
             "name",
@@ -43,7 +45,7 @@ class TrackSerializer(serializers.ModelSerializer):
 
 class AlbumDetailSerializer(serializers.ModelSerializer):
     tracks = TrackSerializer(many=True, read_only=True)
-    artist = ArtistSerializer(read_only=True)
+    artist = SummaryField(ArtistSerializer, source="artist_id")
     tracks_count = serializers.IntegerField(source='tracks.count', read_only=True)
 
     class Meta:
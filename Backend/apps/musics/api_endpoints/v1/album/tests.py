@@ -1,7 +1,12 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from apps.musics.models import Album, Artist
+from apps.musics.models import Album, Artist, Track
+from apps.musics.services import plays
+from apps.shared.cache import swr
 from apps.users.models import User
 
 
@@ -39,6 +44,61 @@ class AlbumAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["name"], "Album One")
 
+    def test_retrieve_not_modified(self):
+        """Неизменённый альбом — 304 одним запросом к БД, без сериализации"""
+
+        url = reverse("album-detail", args=[self.album1.slug])
+        response = self.client.get(url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_follows_counters(self):
+        """Счётчики пишутся update()-ом мимо updated_at, но задача сбрасывает их тег и ETag меняется"""
+
+        url = reverse("album-list")
+        etag = self.client.get(url)["ETag"]
+        plays.apply_play_deltas({}, {self.album1.pk: 10}, {})
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data[0]["name"], "Album One")
+
+    def test_tracks_count_stale_while_revalidate(self):
+        """Просроченный tracks_count отдаётся как есть, пересчёт — один раз"""
+
+        cache.clear()
+        self.assertEqual(self.album1.tracks_count, 0)
+        Track.objects.create(
+            name="New",
+            artist=self.artist,
+            album=self.album1,
+            owner=self.user,
+            duration=100,
+            is_published=True,
+        )
+
+        with mock.patch.object(swr, "_refresh_in_background") as refresh:
+            # Свежее значение — без пересчёта
+            self.assertEqual(self.album1.tracks_count, 0)
+            refresh.assert_not_called()
+            with mock.patch.object(swr.time, "time", return_value=swr.time.time() + 61):
+                self.assertEqual(self.album1.tracks_count, 0)
+            refresh.assert_called_once()
+
+        with mock.patch.object(swr, "BACKGROUND_REFRESH", False), mock.patch.object(
+            swr.time, "time", return_value=swr.time.time() + 61
+        ):
+            # Без фона пересчёт идёт в этом же запросе, но отдаётся ещё старое значение
+            self.assertEqual(self.album1.tracks_count, 0)
+        self.assertEqual(self.album1.tracks_count, 1)
+
     def test_create_album(self):
         """Тестируем создание нового альбома"""
 
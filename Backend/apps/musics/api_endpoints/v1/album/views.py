@@ -1,7 +1,10 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.exceptions import PermissionDenied
-from apps.musics.models import Album
+from django.db.models import Prefetch
+from apps.musics.models import Album, Genre, Track
 from .serializers import *  # noqa
+from apps.shared.cache import ConditionalGetMixin
+from apps.shared.filters import FullTextSearchFilter
 from apps.shared.permissions import IsOwnerOrReadOnly
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
 
@@ -47,18 +50,24 @@ from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResp
         responses={204: OpenApiResponse(description="Album successfully deleted")},
     ),
 )
-class AlbumViewSet(viewsets.ModelViewSet):
+class AlbumViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     lookup_field = "slug"
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["name", "artist__name"]
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
+    search_fields = ["search_key", "artist__search_key"]
     ordering_fields = ["release_date", "name"]
+    cache_tags = ("albums", "artists", "tracks", "genres", "counters:albums")
+    stamp_fields = ("plays_count", "likes_count")
 
     def get_queryset(self):
+        tracks = Track.objects.all()
+        if self.action == "retrieve":
+            # Жанры треков сериализуются из кэша сводок — нужны только их id
+            tracks = tracks.prefetch_related(Prefetch("genres", queryset=Genre.objects.only("pk")))
         return (
             Album.objects.filter(is_published=True)
             .select_related("artist")
-            .prefetch_related("tracks")
+            .prefetch_related(Prefetch("tracks", queryset=tracks))
             .all()
         )
 
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from apps.musics.models import Artist, Album, Track, Genre
+from apps.musics.api_endpoints.v1.summaries import SummaryField, SummaryListSerializer
 
 
 # ---------------------- GENRE ----------------------
@@ -11,10 +12,11 @@ class GenreSerializer(serializers.ModelSerializer):
 
 # ---------------------- TRACK ----------------------
 class ArtistTrackSerializer(serializers.ModelSerializer):
-    genres = GenreSerializer(many=True, read_only=True)
+    genres = SummaryField(GenreSerializer, many=True)
 
     class Meta:
         model = Track
+        list_serializer_class = SummaryListSerializer
         fields = (
             "id",
             "name",
@@ -47,8 +49,9 @@ class AlbumWithTracksSerializer(serializers.ModelSerializer):
 
 # ---------------------- ARTIST LIST ----------------------
 class ArtistListSerializer(serializers.ModelSerializer):
-    albums_count = serializers.SerializerMethodField()
-    tracks_count = serializers.SerializerMethodField()
+    # Аннотации ArtistQuerySet.with_counts()
+    albums_count = serializers.IntegerField(read_only=True)
+    tracks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Artist
@@ -67,19 +70,14 @@ class ArtistListSerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
-    def get_albums_count(self, obj):
-        return obj.albums.filter(is_published=True).count()
-
-    def get_tracks_count(self, obj):
-        return obj.tracks.filter(is_published=True).count()
-
 
 # ---------------------- ARTIST DETAIL ----------------------
 class ArtistDetailSerializer(serializers.ModelSerializer):
     albums = AlbumWithTracksSerializer(many=True, read_only=True)
     tracks = ArtistTrackSerializer(many=True, read_only=True)
-    albums_count = serializers.SerializerMethodField()
-    tracks_count = serializers.SerializerMethodField()
+    # Аннотации ArtistQuerySet.with_counts()
+    albums_count = serializers.IntegerField(read_only=True)
+    tracks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Artist
@@ -103,12 +101,6 @@ class ArtistDetailSerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
-    def get_albums_count(self, obj):
-        return obj.albums.filter(is_published=True).count()
-
-    def get_tracks_count(self, obj):
-        return obj.tracks.filter(is_published=True).count()
-
 # ---------------------- ARTIST CREATE/UPDATE ----------------------
 class ArtistCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
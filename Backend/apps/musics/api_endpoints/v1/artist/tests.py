@@ -18,7 +18,7 @@ class ArtistAPITestCase(APITestCase):
         self.artist = Artist.objects.create(name="Test Artist", owner=self.admin)
 
         self.album = Album.objects.create(
-            name="Test Album", artist=self.artist, owner=self.admin
+            name="Test Album", artist=self.artist, owner=self.admin, is_published=True
         )
         self.track = Track.objects.create(
             owner=self.admin,
@@ -55,6 +55,38 @@ class ArtistAPITestCase(APITestCase):
         self.assertEqual(len(response.data["albums"]), 1)
         self.assertEqual(response.data["albums"][0]["tracks"][0]["name"], "Test Track")
 
+    def test_artist_retrieve_hides_unpublished(self):
+        """Неопубликованные альбомы и треки в детали не попадают и не считаются"""
+
+        Album.objects.create(name="Draft", artist=self.artist, owner=self.admin)
+        Track.objects.create(
+            owner=self.admin,
+            name="Hidden",
+            artist=self.artist,
+            duration=100,
+            is_published=False,
+        )
+        response = self.client.get(self.detail_url)
+        self.assertEqual([a["name"] for a in response.data["albums"]], ["Test Album"])
+        self.assertEqual([t["name"] for t in response.data["tracks"]], ["Test Track"])
+        self.assertEqual(response.data["albums_count"], 1)
+        self.assertEqual(response.data["tracks_count"], 1)
+
+    def test_artist_list_constant_queries(self):
+        """Число запросов списка не зависит от числа артистов"""
+
+        self.client.get(self.list_url)
+        for i in range(5):
+            artist = Artist.objects.create(name=f"Artist {i}", owner=self.admin)
+            Album.objects.create(
+                name=f"Album {i}", artist=artist, owner=self.admin, is_published=True
+            )
+        # Только сама страница: отпечаток для ETag — версии тегов
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data), 6)
+        self.assertTrue(all(a["albums_count"] == 1 for a in response.data))
+
     def test_artist_create_admin(self):
         """Админ может создать артиста"""
 
@@ -1,8 +1,9 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.exceptions import PermissionDenied
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiResponse
-from django.db.models import Count
 from apps.musics.models import Artist
+from apps.shared.cache import ConditionalGetMixin
+from apps.shared.filters import FullTextSearchFilter
 from .serializers import (
     ArtistListSerializer,
     ArtistDetailSerializer,
@@ -51,18 +52,26 @@ from .serializers import (
         responses={204: OpenApiResponse(description="Artist successfully deleted")},
     ),
 )
-class ArtistViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Artist.objects.all()
-        .annotate(albums_count=Count("albums"))
-        .order_by("-created_at")
-        .prefetch_related("albums__tracks")
-    )
+class ArtistViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = Artist.objects.order_by("-created_at")
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     lookup_field = "slug"
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["name"]
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
+    search_fields = ["search_key"]
     ordering_fields = ["name", "created_at"]
+    cache_tags = ("artists", "albums", "tracks", "counters:artists")
+    stamp_fields = ("followers_count",)
+
+    def get_queryset(self):
+        """Аннотации и prefetch — только там, где их читает сериализатор"""
+        qs = super().get_queryset()
+        match self.action:
+            case "list":
+                return qs.with_counts()
+            case "retrieve":
+                return qs.with_counts().with_catalog()
+            case _:
+                return qs
 
     def get_serializer_class(self):
         if self.action == "list":
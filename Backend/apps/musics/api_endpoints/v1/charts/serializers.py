@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from apps.musics.services import leaderboards
+
+
+class ChartQuerySerializer(serializers.Serializer):
+    """Параметры запроса чарта"""
+
+    type = serializers.ChoiceField(choices=list(leaderboards.ENTITIES), default="tracks")
+    metric = serializers.ChoiceField(choices=leaderboards.METRICS, default="plays")
+    window = serializers.ChoiceField(choices=list(leaderboards.WINDOWS), default="all")
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, max_value=10000, default=0)
@@ -0,0 +1,156 @@
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.musics.models import Album, Artist, Track
+from apps.musics.services import leaderboards, plays
+from apps.musics.tasks import rebuild_leaderboard
+from apps.shared.tests import FakeRedisMixin
+from apps.users.models import User
+
+
+class ChartsAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="pass123"
+        )
+        self.artist = Artist.objects.create(name="Artist 1", owner=self.user)
+        self.album = Album.objects.create(
+            name="Album 1", artist=self.artist, owner=self.user, is_published=True
+        )
+        self.track1 = Track.objects.create(
+            owner=self.user,
+            name="Track 1",
+            artist=self.artist,
+            duration=120,
+            plays_count=5,
+            is_published=True,
+        )
+        self.track2 = Track.objects.create(
+            owner=self.user,
+            name="Track 2",
+            artist=self.artist,
+            duration=150,
+            plays_count=10,
+            is_published=True,
+        )
+        Track.objects.create(
+            owner=self.user,
+            name="Hidden",
+            artist=self.artist,
+            duration=90,
+            plays_count=100,
+            is_published=False,
+        )
+        self.url = reverse("charts-list")
+
+    def test_top_tracks_by_plays(self):
+        """Чарт треков отсортирован по прослушиваниям, неопубликованные не попадают"""
+        response = self.client.get(self.url, {"type": "tracks", "metric": "plays"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [t["id"] for t in response.data["results"]]
+        self.assertEqual(ids, [self.track2.id, self.track1.id])
+
+    def test_limit_and_offset(self):
+        """limit/offset работают как срез рейтинга"""
+        response = self.client.get(self.url, {"limit": 1, "offset": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([t["id"] for t in response.data["results"]], [self.track1.id])
+
+    def test_top_albums(self):
+        """Чарт альбомов; без Redis окно недоступно, и ответ говорит, что он за всё время"""
+        response = self.client.get(self.url, {"type": "albums", "window": "week"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["window"], "all")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_invalid_type(self):
+        """Неизвестный тип чарта — 400"""
+        response = self.client.get(self.url, {"type": "genres"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ChartsRedisTestCase(FakeRedisMixin, APITestCase):
+    """Рейтинги в sorted set-ах Redis (fakeredis)"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="charts", email="charts@example.com", password="pass123"
+        )
+        self.artist = Artist.objects.create(name="Charted", owner=self.user)
+        self.track1 = Track.objects.create(
+            owner=self.user, name="Track 1", artist=self.artist, duration=120, plays_count=5
+        )
+        self.track2 = Track.objects.create(
+            owner=self.user, name="Track 2", artist=self.artist, duration=150, plays_count=10
+        )
+        Track.objects.create(
+            owner=self.user, name="Hidden", artist=self.artist, duration=90,
+            plays_count=100, is_published=False,
+        )
+        self.url = reverse("charts-list")
+
+    def published(self):
+        return Track.objects.filter(is_published=True)
+
+    def test_missing_board_rebuilt_in_background(self):
+        """Без рейтинга ответ идёт из БД, а пересборка ставится в очередь один раз"""
+        with mock.patch.object(rebuild_leaderboard, "delay") as delay:
+            self.assertIsNone(leaderboards.top_objects("tracks", self.published()))
+            self.assertIsNone(leaderboards.top_ids("tracks"))
+            response = self.client.get(self.url)
+        delay.assert_called_once_with("tracks", "plays")
+        self.assertEqual(response.data["window"], "all")
+        self.assertEqual(
+            [t["id"] for t in response.data["results"]], [self.track2.id, self.track1.id]
+        )
+
+        self.assertEqual(leaderboards.rebuild("tracks", "plays"), 3)
+        self.assertFalse(self.redis.exists("musics:charts:tracks:plays:all:lock"))
+        self.assertEqual(
+            [t.id for t in leaderboards.top_objects("tracks", self.published())],
+            [self.track2.id, self.track1.id],
+        )
+
+    def test_empty_rebuild_releases_lock(self):
+        """Пустая пересборка не держит замок: следующую можно поставить сразу"""
+        with mock.patch.object(rebuild_leaderboard, "delay") as delay:
+            self.assertIsNone(leaderboards.top_ids("albums"))
+            self.assertEqual(leaderboards.rebuild("albums", "plays"), 0)
+            self.assertFalse(self.redis.exists("musics:charts:albums:plays:all:lock"))
+            self.assertIsNone(leaderboards.top_ids("albums"))
+        self.assertEqual(delay.call_count, 2)
+
+    def test_windows_follow_flushed_plays(self):
+        """Сброс буфера прослушиваний двигает общий рейтинг и окна"""
+        leaderboards.rebuild("tracks", "plays")
+        ref = plays.get_track_ref(self.track1.slug)
+        for _ in range(10):
+            plays.record_play(ref)
+        plays.flush_play_buffer()
+        self.assertEqual(leaderboards.top_ids("tracks")[1], self.track1.id)
+        self.assertEqual(leaderboards.top_ids("tracks", window="day"), [self.track1.id])
+
+        self.track2.increment_like()
+        self.assertEqual(
+            leaderboards.top_ids("tracks", metric="likes", window="week"), [self.track2.id]
+        )
+        response = self.client.get(self.url, {"window": "day"})
+        self.assertEqual(response.data["window"], "day")
+        self.assertEqual([t["id"] for t in response.data["results"]], [self.track1.id])
+
+    def test_tiebreak_on_page_boundary(self):
+        """Равные по прослушиваниям артисты упорядочены по подписчикам и на границе страницы"""
+        artists = [
+            Artist.objects.create(
+                name=f"Tied {i}", owner=self.user, is_verified=True,
+                total_plays=5, followers_count=i,
+            )
+            for i in range(4)
+        ]
+        leaderboards.rebuild("artists", "plays")
+        top = Artist.get_top_artists(limit=2)
+        self.assertEqual([a.pk for a in top], [artists[3].pk, artists[2].pk])
@@ -0,0 +1,95 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from apps.musics.models import Album, Artist, Track
+from apps.musics.services import leaderboards
+from apps.musics.api_endpoints.v1.viewer_state import ViewerStateMixin
+from apps.musics.api_endpoints.v1.album.serializers import AlbumListSerializer
+from apps.musics.api_endpoints.v1.artist.serializers import ArtistListSerializer
+from apps.musics.api_endpoints.v1.track.serializers import TrackListSerializer
+from .serializers import ChartQuerySerializer
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["Charts"],
+        summary="Get charts",
+        description=(
+            "Top tracks, albums or artists by plays or likes for all time, "
+            "the current day, week or month."
+        ),
+        parameters=[ChartQuerySerializer],
+    ),
+)
+class ChartsViewSet(ViewerStateMixin, viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    serializer_classes = {
+        "tracks": TrackListSerializer,
+        "albums": AlbumListSerializer,
+        "artists": ArtistListSerializer,
+    }
+    # Колонки для запасного ORDER BY, если Redis недоступен
+    fallback_ordering = {
+        ("tracks", "plays"): "-plays_count",
+        ("tracks", "likes"): "-likes_count",
+        ("albums", "plays"): "-plays_count",
+        ("albums", "likes"): "-likes_count",
+        ("artists", "plays"): "-total_plays",
+        ("artists", "likes"): "-total_likes",
+    }
+    chart_type = "tracks"
+
+    def get_queryset(self):
+        if self.chart_type == "albums":
+            return Album.objects.filter(is_published=True).select_related("artist")
+        if self.chart_type == "artists":
+            return Artist.objects.with_counts()
+        return (
+            Track.objects.filter(is_published=True)
+            .select_related("artist", "album")
+            .prefetch_related("genres")
+        )
+
+    def get_serializer_class(self):
+        return self.serializer_classes[self.chart_type]
+
+    def get_viewer_track_field(self):
+        return "pk" if self.chart_type == "tracks" else None
+
+    def list(self, request, *args, **kwargs):
+        params = ChartQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+        self.chart_type = params["type"]
+
+        queryset = self.get_queryset()
+        window = params["window"]
+        objects = leaderboards.top_objects(
+            self.chart_type,
+            queryset,
+            metric=params["metric"],
+            window=window,
+            limit=params["limit"],
+            offset=params["offset"],
+        )
+        if objects is None:
+            # Оконных рейтингов в БД нет: честно отдаём общий
+            window = "all"
+            ordering = self.fallback_ordering[(self.chart_type, params["metric"])]
+            offset = params["offset"]
+            objects = queryset.order_by(ordering, "-pk")[offset : offset + params["limit"]]
+
+        serializer = self.get_serializer(objects, many=True)
+        return Response(
+            {
+                "type": self.chart_type,
+                "metric": params["metric"],
+                "window": window,
+                "results": serializer.data,
+            }
+        )
+
+
+__all__ = ["ChartsViewSet"]
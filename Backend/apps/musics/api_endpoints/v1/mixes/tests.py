@@ -0,0 +1,155 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.musics.models import (
+    Artist,
+    Genre,
+    Like,
+    ListeningEvent,
+    ListeningHistory,
+    Playlist,
+    Track,
+    TrackItemNeighbors,
+)
+from apps.musics.services import mixes
+from apps.musics.signals import playlists as playlist_signals
+from apps.users.models import User
+
+
+class MixAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="pass123"
+        )
+        self.artist = Artist.objects.create(name="Artist", owner=self.user)
+        self.rock = Genre.objects.create(name="Rock")
+        self.jazz = Genre.objects.create(name="Jazz")
+        self.rock_tracks = self._tracks("Rock", 4, self.rock)
+        self.jazz_tracks = self._tracks("Jazz", 2, self.jazz)
+        self.url = reverse("mixes-list")
+
+    def _tracks(self, prefix, count, genre):
+        tracks = []
+        for i in range(count):
+            track = Track.objects.create(
+                owner=self.user, name=f"{prefix} {i}", artist=self.artist, duration=100
+            )
+            track.genres.add(genre)
+            tracks.append(track)
+        return tracks
+
+    def _generate(self):
+        for user_ids in mixes.active_user_ids():
+            mixes.generate_for_users(user_ids)
+
+    def test_generate_mixes(self):
+        """Подборка на каждый жанр: знакомое + соседи, владелец — системный пользователь"""
+        r0, r1, r2, _ = self.rock_tracks
+        ListeningEvent.objects.create(user=self.user, track=r0)
+        ListeningHistory.objects.create(user=self.user, track=r0)
+        Like.objects.create(user=self.user, track=r1)
+        ListeningHistory.objects.create(user=self.user, track=self.jazz_tracks[0])
+        TrackItemNeighbors.objects.create(
+            track=r0, neighbor_ids=[r2.id], scores=[0.9], computed_at="2026-01-01T00:00Z"
+        )
+
+        self._generate()
+        playlists = list(Playlist.objects.filter(generated_for=self.user).order_by("mix_index"))
+        self.assertEqual([p.description for p in playlists], ["Rock", "Jazz"])
+        self.assertEqual(playlists[0].owner.username, mixes.SYSTEM_USERNAME)
+        rock_mix = list(playlists[0].playlist_tracks.values_list("track_id", flat=True))
+        self.assertEqual(rock_mix[0], r2.id)
+        self.assertEqual(set(rock_mix), {t.id for t in self.rock_tracks})
+
+        # Повторный прогон обновляет те же плейлисты
+        self._generate()
+        self.assertEqual(Playlist.objects.filter(generated_for=self.user).count(), 2)
+
+    def test_regenerate_skips_per_row_counters(self):
+        """Пересборка удаляет старые треки подборок без пересчёта счётчиков на каждую строку"""
+        ListeningHistory.objects.create(user=self.user, track=self.rock_tracks[0])
+        self._generate()
+        with mock.patch.object(playlist_signals, "change_counters") as change_counters:
+            self._generate()
+        change_counters.assert_not_called()
+        mix = Playlist.objects.get(generated_for=self.user)
+        self.assertEqual(mix.tracks_count, mix.playlist_tracks.count())
+        self.assertEqual(mix.total_duration, 100 * mix.tracks_count)
+
+    def test_mixes_endpoint(self):
+        """Эндпоинт отдаёт готовые подборки из кэша, мимо списка плейлистов"""
+        ListeningEvent.objects.create(user=self.user, track=self.jazz_tracks[0])
+        ListeningHistory.objects.create(user=self.user, track=self.jazz_tracks[0])
+        self._generate()
+
+        self.client.force_authenticate(user=self.user)
+        # Прогрев сводок артистов/жанров (SummaryField)
+        self.client.get(self.url)
+        with self.assertNumQueries(3):
+            # треки, id их жанров, лайки зрителя — подборки берутся из кэша
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            {t["id"] for t in response.data["results"][0]["tracks"]},
+            {t.id for t in self.jazz_tracks},
+        )
+
+        response = self.client.get(reverse("playlist-list"))
+        self.assertEqual(response.data["count"], 0)
+
+    def test_requires_auth(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_mix_hidden_from_others(self):
+        """Подборка видна только тому, для кого собрана, и slug не выводится из id"""
+        ListeningHistory.objects.create(user=self.user, track=self.jazz_tracks[0])
+        self._generate()
+        mix = Playlist.objects.get(generated_for=self.user)
+        self.assertNotEqual(mix.slug, f"daily-mix-{self.user.pk}-1")
+        orders = list(mix.playlist_tracks.order_by("order").values_list("order", flat=True))
+        self.assertEqual(orders, [mixes.ORDER_GAP * i for i in range(1, len(orders) + 1)])
+
+        url = reverse("playlist-detail", args=[mix.slug])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="pass123"
+        )
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_prune_inactive(self):
+        """Подборки и кэш пользователя, переставшего слушать, удаляются"""
+        ListeningHistory.objects.create(user=self.user, track=self.jazz_tracks[0])
+        self._generate()
+        self.assertEqual(len(mixes.get_user_mixes(self.user)), 1)
+        self.assertEqual(mixes.prune_inactive(), 0)
+
+        ListeningHistory.objects.update(
+            listened_at=timezone.now() - timezone.timedelta(days=mixes.ACTIVE_DAYS + 1)
+        )
+        self.assertEqual(mixes.prune_inactive(), 1)
+        self.assertFalse(Playlist.objects.filter(generated_for=self.user).exists())
+        self.assertIsNone(cache.get(mixes.mixes_cache_key(self.user.pk)))
+
+    def test_active_users_by_shard(self):
+        """Активные пользователи шарда — по свежей истории, порциями"""
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="pass123"
+        )
+        ListeningHistory.objects.create(user=self.user, track=self.jazz_tracks[0])
+        ListeningHistory.objects.create(user=other, track=self.jazz_tracks[0])
+        self.assertEqual(
+            list(mixes.active_user_ids(batch_size=1)), [[self.user.pk], [other.pk]]
+        )
+        shard = other.pk % 2
+        self.assertEqual(list(mixes.active_user_ids(shard, 2)), [[other.pk]])
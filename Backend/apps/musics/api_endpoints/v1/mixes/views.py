@@ -0,0 +1,52 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.db.models import Prefetch
+
+from apps.musics.models import Genre, Track
+from apps.musics.services.mixes import get_user_mixes
+from apps.musics.api_endpoints.v1.viewer_state import ViewerStateMixin
+from apps.musics.api_endpoints.v1.track.serializers import TrackListSerializer
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["Recommendations"],
+        summary="Daily mixes",
+        description=(
+            "The user's precomputed daily mixes with their tracks. "
+            "Mixes are rebuilt once a day by a background job."
+        ),
+    ),
+)
+class MixViewSet(ViewerStateMixin, viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated]
+    serializer_class = TrackListSerializer
+
+    def list(self, request, *args, **kwargs):
+        mixes = get_user_mixes(request.user)
+        track_ids = [track_id for mix in mixes for track_id in mix["track_ids"]]
+        found = (
+            Track.objects.filter(is_published=True)
+            .prefetch_related(Prefetch("genres", queryset=Genre.objects.only("pk")))
+            .in_bulk(track_ids)
+        )
+
+        # Один сериализатор на все треки: лайки зрителя считаются одним запросом
+        tracks = [[found[pk] for pk in mix["track_ids"] if pk in found] for mix in mixes]
+        data = iter(self.get_serializer([t for mix in tracks for t in mix], many=True).data)
+        results = [
+            {
+                "id": mix["id"],
+                "slug": mix["slug"],
+                "name": mix["name"],
+                "description": mix["description"],
+                "tracks": [next(data) for _ in mix_tracks],
+            }
+            for mix, mix_tracks in zip(mixes, tracks)
+        ]
+        return Response({"results": results})
+
+
+__all__ = ["MixViewSet"]
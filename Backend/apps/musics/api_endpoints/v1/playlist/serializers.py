@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.db import transaction
 from apps.musics.models import Playlist, PlaylistTrack, Track
+from apps.musics.services.playlists import add_tracks, set_tracks
 
 
 class TrackInPlaylistSerializer(serializers.ModelSerializer):
@@ -21,11 +22,18 @@ class PlaylistTrackSerializer(serializers.ModelSerializer):
         fields = ("id", "track", "order")
 
 
+class PlaylistTrackPositionSerializer(serializers.ModelSerializer):
+    """Строка плейлиста после правки: трек (id) и его order"""
+
+    class Meta:
+        model = PlaylistTrack
+        fields = ("id", "track", "order")
+
+
 class PlaylistListSerializer(serializers.ModelSerializer):
     """Список плейлистов (краткая информация)"""
 
     owner = serializers.StringRelatedField()
-    tracks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Playlist
@@ -37,6 +45,8 @@ class PlaylistListSerializer(serializers.ModelSerializer):
             "is_public",
             "owner",
             "tracks_count",
+            "total_duration",
+            "followers_count",
             "created_at",
             "updated_at",
         )
@@ -46,7 +56,7 @@ class PlaylistDetailSerializer(serializers.ModelSerializer):
     """Детальная информация о плейлисте"""
 
     tracks = PlaylistTrackSerializer(
-        source="playlisttrack_set",
+        source="playlist_tracks",
         many=True,
         read_only=True,
     )
@@ -61,6 +71,9 @@ class PlaylistDetailSerializer(serializers.ModelSerializer):
             "description",
             "is_public",
             "owner",
+            "tracks_count",
+            "total_duration",
+            "followers_count",
             "tracks",
             "created_at",
             "updated_at",
@@ -82,18 +95,7 @@ class PlaylistCreateUpdateSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "description", "is_public", "track_ids")
 
     def validate_track_ids(self, value):
-        """Проверяем существование треков (один SQL-запрос)"""
-        if not value:
-            return []
-        found_ids = set(
-            Track.objects.filter(id__in=value).only("id").values_list("id", flat=True)
-        )
-        missing = set(value) - found_ids
-        if missing:
-            raise serializers.ValidationError(
-                f"Некоторые треки не найдены: {sorted(missing)}"
-            )
-        return list(found_ids)
+        return validate_track_ids(value)
 
     @transaction.atomic
     def create(self, validated_data):
@@ -102,13 +104,7 @@ class PlaylistCreateUpdateSerializer(serializers.ModelSerializer):
         playlist = Playlist.objects.create(**validated_data)
 
         if track_ids:
-            PlaylistTrack.objects.bulk_create(
-                [
-                    PlaylistTrack(playlist=playlist, track_id=tid, order=i)
-                    for i, tid in enumerate(track_ids)
-                ],
-                batch_size=100,  # ⚡ ускоряет вставку при большом количестве треков
-            )
+            add_tracks(playlist, track_ids, user=playlist.owner)
 
         return playlist
 
@@ -119,22 +115,54 @@ class PlaylistCreateUpdateSerializer(serializers.ModelSerializer):
         instance = super().update(instance, validated_data)
 
         if track_ids is not None:
-            # Удаляем только старые связи без пересоздания самого объекта
-            instance.playlisttrack_set.all().delete()
-            if track_ids:
-                PlaylistTrack.objects.bulk_create(
-                    [
-                        PlaylistTrack(playlist=instance, track_id=tid, order=i)
-                        for i, tid in enumerate(track_ids)
-                    ],
-                    batch_size=100,
-                )
+            # Меняются только удалённые, добавленные и переставленные строки
+            set_tracks(instance, track_ids, user=self.context["request"].user)
 
         return instance
 
 
+class PlaylistTracksEditSerializer(serializers.Serializer):
+    """Добавление/удаление/перенос треков (один или несколько за раз)"""
+
+    track_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        min_length=1,
+        max_length=1000,
+        help_text="ID треков; при добавлении и переносе — в нужном порядке",
+    )
+    position = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        allow_null=True,
+        help_text="Куда поставить треки (0 — в начало); по умолчанию — в конец",
+    )
+
+
+class PlaylistTracksAddSerializer(PlaylistTracksEditSerializer):
+    def validate_track_ids(self, value):
+        return validate_track_ids(value)
+
+
+def validate_track_ids(value):
+    """Проверяем существование треков (один SQL-запрос), порядок сохраняем"""
+    if not value:
+        return []
+    found_ids = set(
+        Track.objects.filter(id__in=value).only("id").values_list("id", flat=True)
+    )
+    missing = set(value) - found_ids
+    if missing:
+        raise serializers.ValidationError(
+            f"Некоторые треки не найдены: {sorted(missing)}"
+        )
+    return list(dict.fromkeys(value))
+
+
 __all__ = [
     "PlaylistListSerializer",
     "PlaylistDetailSerializer",
     "PlaylistCreateUpdateSerializer",
+    "PlaylistTrackPositionSerializer",
+    "PlaylistTracksEditSerializer",
+    "PlaylistTracksAddSerializer",
 ]
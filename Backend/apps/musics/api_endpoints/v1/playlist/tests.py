@@ -1,8 +1,13 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from apps.musics.models import Playlist, Track, Artist
+from apps.musics.services.playlists import add_tracks, clear_tracks, set_tracks
 
 User = get_user_model()
 
@@ -47,6 +52,19 @@ class PlaylistAPITestCase(APITestCase):
         )
         self.assertTrue(len(items) > 0)
 
+    def test_playlist_list_count(self):
+        """count считается один раз и дальше берётся из кэша (total_is_exact=False)"""
+        cache.clear()
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data["count"], 1)
+        self.assertTrue(response.data["total_is_exact"])
+        self.assertEqual(response.data["results"][0]["tracks_count"], 2)
+
+        # Другой query-параметр — мимо кэша ответов, но count тот же
+        response = self.client.get(self.list_url, {"page": 1})
+        self.assertEqual(response.data["count"], 1)
+        self.assertFalse(response.data["total_is_exact"])
+
     def test_playlist_retrieve(self):
         """Тестируем получение детальной информации о плейлисте"""
 
@@ -118,3 +136,176 @@ class PlaylistAPITestCase(APITestCase):
         )
         self.playlist.refresh_from_db()
         self.assertEqual(self.playlist.tracks.count(), 0)
+
+
+class PlaylistTracksEditTestCase(APITestCase):
+    """tracks/add, tracks/remove, tracks/move и PUT с track_ids: меняются только затронутые строки"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="editor", email="editor@example.com", password="pass123"
+        )
+        artist = Artist.objects.create(name="Artist", owner=self.user)
+        self.tracks = [
+            Track.objects.create(name=f"Track {i}", owner=self.user, duration=100, artist=artist)
+            for i in range(6)
+        ]
+        self.playlist = Playlist.objects.create(name="Editable", owner=self.user)
+        add_tracks(self.playlist, [t.id for t in self.tracks[:4]])
+        self.client.force_authenticate(user=self.user)
+
+    def url(self, name):
+        return reverse(f"playlist-{name}", args=[self.playlist.slug])
+
+    def track_ids(self):
+        return list(self.playlist.playlist_tracks.order_by("order").values_list("track_id", flat=True))
+
+    def orders(self):
+        return dict(self.playlist.playlist_tracks.values_list("track_id", "order"))
+
+    def test_add_at_position(self):
+        t = self.tracks
+        before = self.orders()
+        response = self.client.post(
+            self.url("add-tracks"), {"track_ids": [t[4].id, t[5].id, t[0].id], "position": 1}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # t[0] уже был в плейлисте — пропущен
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(self.track_ids(), [t[0].id, t[4].id, t[5].id, t[1].id, t[2].id, t[3].id])
+        after = self.orders()
+        self.assertTrue(all(after[track_id] == order for track_id, order in before.items()))
+
+    def test_move_touches_only_moved_rows(self):
+        t = self.tracks
+        before = self.orders()
+        response = self.client.post(self.url("move-tracks"), {"track_ids": [t[3].id], "position": 0})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.track_ids(), [t[3].id, t[0].id, t[1].id, t[2].id])
+        after = self.orders()
+        self.assertEqual([tid for tid in before if before[tid] != after[tid]], [t[3].id])
+
+        # Несколько треков за раз — в конец, в переданном порядке
+        self.client.post(self.url("move-tracks"), {"track_ids": [t[0].id, t[3].id]})
+        self.assertEqual(self.track_ids(), [t[1].id, t[2].id, t[0].id, t[3].id])
+
+    def test_renumber_when_gap_runs_out(self):
+        t = self.tracks
+        # Раз за разом между первыми двумя — промежуток кончается, и плейлист перенумеровывается
+        for _ in range(12):
+            self.client.post(self.url("move-tracks"), {"track_ids": [t[3].id], "position": 1})
+            self.client.post(self.url("move-tracks"), {"track_ids": [t[2].id], "position": 1})
+        self.assertEqual(self.track_ids(), [t[0].id, t[2].id, t[3].id, t[1].id])
+        self.assertEqual(len(set(self.orders().values())), 4)
+
+    def test_remove(self):
+        t = self.tracks
+        response = self.client.post(self.url("remove-tracks"), {"track_ids": [t[1].id, t[5].id]})
+        self.assertEqual(response.data, {"removed": 1})
+        self.assertEqual(self.track_ids(), [t[0].id, t[2].id, t[3].id])
+
+    def test_update_with_track_ids(self):
+        t = self.tracks
+        before = self.orders()
+        ids = [t[1].id, t[5].id, t[2].id, t[3].id, t[0].id]
+        response = self.client.patch(
+            reverse("playlist-detail", args=[self.playlist.slug]), {"track_ids": ids}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.track_ids(), ids)
+        after = self.orders()
+        # t[1], t[2], t[3] остались на месте — переставлен только t[0]
+        self.assertEqual([tid for tid in before if before[tid] != after[tid]], [t[0].id])
+
+    def test_not_owner(self):
+        other = User.objects.create_user(username="x", email="x@example.com", password="pass123")
+        self.client.force_authenticate(user=other)
+        response = self.client.post(self.url("remove-tracks"), {"track_ids": [self.tracks[0].id]})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PlaylistCountersTestCase(APITestCase):
+    """tracks_count / total_duration / followers_count ведутся при каждой правке и чинятся командой"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="counter", email="counter@example.com", password="pass123"
+        )
+        artist = Artist.objects.create(name="Counter Artist", owner=self.user)
+        self.tracks = [
+            Track.objects.create(
+                name=f"Song {i}", owner=self.user, duration=100 + i, artist=artist
+            )
+            for i in range(4)
+        ]
+        self.playlist = Playlist.objects.create(name="Counted", owner=self.user)
+
+    def counters(self):
+        self.playlist.refresh_from_db()
+        return (
+            self.playlist.tracks_count,
+            self.playlist.total_duration,
+            self.playlist.followers_count,
+        )
+
+    def test_tracks(self):
+        t = self.tracks
+        add_tracks(self.playlist, [t[0].id, t[1].id])
+        self.playlist.tracks.add(t[2])
+        self.assertEqual(self.counters(), (3, 303, 0))
+
+        self.playlist.tracks.remove(t[0])
+        self.client.force_authenticate(user=self.user)
+        self.client.post(
+            reverse("playlist-remove-tracks", args=[self.playlist.slug]), {"track_ids": [t[1].id]}
+        )
+        self.assertEqual(self.counters(), (1, 102, 0))
+
+        # Снятие трека с публикации и удаление трека
+        t[2].is_published = False
+        t[2].save()
+        self.assertEqual(self.counters(), (1, 0, 0))
+        t[2].delete()
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+    def test_bulk_removal_single_delta(self):
+        # Число запросов не зависит от числа удаляемых строк
+        t = self.tracks
+        Track.objects.filter(pk=t[3].pk).update(is_published=False)
+        add_tracks(self.playlist, [track.id for track in t])
+        with self.assertNumQueries(9):
+            set_tracks(self.playlist, [t[0].id])
+        self.assertEqual(self.counters(), (1, 100, 0))
+
+        add_tracks(self.playlist, [track.id for track in t[1:]])
+        with self.assertNumQueries(8):
+            self.assertEqual(clear_tracks(self.playlist), 4)
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+    def test_followers(self):
+        other = User.objects.create_user(username="fan", email="fan@example.com", password="pass123")
+        self.playlist.followers.add(self.user, other)
+        other.followed_playlists.add(self.playlist)
+        self.assertEqual(self.counters()[2], 2)
+        other.followed_playlists.remove(self.playlist)
+        self.playlist.followers.remove(other)
+        self.assertEqual(self.counters()[2], 1)
+        self.playlist.followers.clear()
+        self.assertEqual(self.counters()[2], 0)
+
+    def test_endpoints_read_fields(self):
+        add_tracks(self.playlist, [t.id for t in self.tracks])
+        response = self.client.get(reverse("playlist-detail", args=[self.playlist.slug]))
+        self.assertEqual(response.data["tracks_count"], 4)
+        self.assertEqual(response.data["total_duration"], 406)
+
+    def test_repair_command(self):
+        add_tracks(self.playlist, [t.id for t in self.tracks[:2]])
+        Playlist.objects.filter(pk=self.playlist.pk).update(tracks_count=7, followers_count=3)
+        with self.assertRaises(CommandError):
+            call_command("repair_playlist_counters", "--check", stdout=StringIO())
+
+        out = StringIO()
+        call_command("repair_playlist_counters", stdout=out)
+        self.assertIn("Repaired counters of 1 playlists", out.getvalue())
+        self.assertEqual(self.counters(), (2, 201, 0))
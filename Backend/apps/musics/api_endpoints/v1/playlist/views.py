@@ -2,14 +2,20 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
-from django.db.models import Count
-from apps.musics.models import Playlist
+from django.db.models import Prefetch, Q
+from apps.musics.models import Playlist, PlaylistTrack
+from apps.musics.services.playlists import add_tracks, clear_tracks, move_tracks, remove_tracks
 from .serializers import (
     PlaylistListSerializer,
     PlaylistDetailSerializer,
     PlaylistCreateUpdateSerializer,
+    PlaylistTrackPositionSerializer,
+    PlaylistTracksAddSerializer,
+    PlaylistTracksEditSerializer,
 )
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
+from apps.shared.cache import ConditionalGetMixin
+from apps.shared.paginations import EstimatedCountPagination
 from apps.shared.permissions import IsOwnerOrReadOnly
 
 
@@ -54,27 +60,47 @@ from apps.shared.permissions import IsOwnerOrReadOnly
         responses={204: OpenApiResponse(description="Playlist successfully deleted")},
     ),
 )
-class PlaylistViewSet(viewsets.ModelViewSet):
+class PlaylistViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления плейлистами.
-    Поддерживает CRUD, поиск, сортировку и очистку треков.
+    Поддерживает CRUD, поиск, сортировку, очистку треков и точечную
+    правку списка (tracks/add, tracks/remove, tracks/move).
     """
 
     permission_classes = [IsOwnerOrReadOnly]
+    pagination_class = EstimatedCountPagination
     lookup_field = "slug"
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["name", "description", "owner__username"]
-    ordering_fields = ["created_at", "updated_at", "name"]
+    ordering_fields = ["created_at", "updated_at", "name", "tracks_count", "followers_count"]
+    cache_tags = ("playlists", "tracks")
+    # Видимость зависит от пользователя (свои приватные плейлисты и подборки)
+    cache_per_user = True
+    stamp_fields = ("tracks_count", "total_duration", "followers_count")
 
     def get_queryset(self):
         """Оптимизированный queryset с подсчётом треков"""
 
-        qs = (
-            Playlist.objects.all()
-            .annotate(tracks_count=Count("playlisttrack"))
-            .select_related("owner")
-        )
-        return qs.select_related("owner").prefetch_related("tracks")
+        # Чужие приватные плейлисты и подборки не видны ни в одном действии
+        user = self.request.user
+        visible = Q(is_public=True)
+        if user.is_authenticated:
+            visible |= Q(owner=user) | Q(generated_for=user)
+        qs = Playlist.objects.filter(visible).select_related("owner")
+
+        if self.action in ("add_tracks", "remove_tracks", "move_tracks"):
+            # Правка списка не должна читать весь плейлист
+            return qs
+        # Счётчики — поля Playlist, их ведут сигналы: без агрегатов на чтении
+        if self.action == "list":
+            # Системные подборки отдаются через /mixes/
+            qs = qs.filter(kind=Playlist.KindChoices.USER)
+        if self.action == "retrieve":
+            # Треки сериализуются через playlist_tracks — без запроса на строку
+            qs = qs.prefetch_related(
+                Prefetch("playlist_tracks", queryset=PlaylistTrack.objects.select_related("track"))
+            )
+        return qs
 
     def get_serializer_class(self):
         """Выбор сериализатора по действию"""
@@ -86,6 +112,10 @@ class PlaylistViewSet(viewsets.ModelViewSet):
                 return PlaylistDetailSerializer
             case "create" | "update" | "partial_update":
                 return PlaylistCreateUpdateSerializer
+            case "add_tracks":
+                return PlaylistTracksAddSerializer
+            case "remove_tracks" | "move_tracks":
+                return PlaylistTracksEditSerializer
             case _:
                 return PlaylistDetailSerializer
 
@@ -116,11 +146,77 @@ class PlaylistViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        deleted_count, _ = playlist.playlisttrack_set.all().delete()
+        deleted_count = clear_tracks(playlist)
         return Response(
             {"status": f"{deleted_count} tracks cleared"},
             status=status.HTTP_200_OK,
         )
 
+    @extend_schema(
+        tags=["Playlists"],
+        summary="Add tracks to a playlist",
+        description=(
+            "Insert tracks as a block before `position` (0 — at the start), "
+            "or append them when it is omitted. Tracks already in the playlist are skipped."
+        ),
+        request=PlaylistTracksAddSerializer,
+        responses={200: PlaylistTrackPositionSerializer(many=True)},
+    )
+    @action(detail=True, methods=["post"], url_path="tracks/add")
+    def add_tracks(self, request, slug=None):
+        """Добавляет треки, не трогая порядок остальных"""
+
+        playlist = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rows = add_tracks(
+            playlist,
+            serializer.validated_data["track_ids"],
+            position=serializer.validated_data.get("position"),
+            user=request.user,
+        )
+        return Response(PlaylistTrackPositionSerializer(rows, many=True).data)
+
+    @extend_schema(
+        tags=["Playlists"],
+        summary="Remove tracks from a playlist",
+        request=PlaylistTracksEditSerializer,
+        responses={200: OpenApiResponse(description="Number of removed tracks")},
+    )
+    @action(detail=True, methods=["post"], url_path="tracks/remove")
+    def remove_tracks(self, request, slug=None):
+        """Удаляет треки из плейлиста"""
+
+        playlist = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        removed = remove_tracks(playlist, serializer.validated_data["track_ids"])
+        return Response({"removed": removed})
+
+    @extend_schema(
+        tags=["Playlists"],
+        summary="Move tracks within a playlist",
+        description=(
+            "Move tracks as a block (in the given order) to `position` in the "
+            "playlist without them; omitted `position` moves them to the end. "
+            "Only the moved rows change."
+        ),
+        request=PlaylistTracksEditSerializer,
+        responses={200: PlaylistTrackPositionSerializer(many=True)},
+    )
+    @action(detail=True, methods=["post"], url_path="tracks/move")
+    def move_tracks(self, request, slug=None):
+        """Переносит треки на новую позицию"""
+
+        playlist = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rows = move_tracks(
+            playlist,
+            serializer.validated_data["track_ids"],
+            position=serializer.validated_data.get("position"),
+        )
+        return Response(PlaylistTrackPositionSerializer(rows, many=True).data)
+
 
 __all__ = ["PlaylistViewSet"]
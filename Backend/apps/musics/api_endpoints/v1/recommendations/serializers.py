@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class RecommendationQuerySerializer(serializers.Serializer):
+    """Параметры рекомендаций"""
+
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
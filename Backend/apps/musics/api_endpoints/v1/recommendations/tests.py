@@ -0,0 +1,69 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.musics.models import Artist, Like, ListeningHistory, Track, TrackItemNeighbors
+from apps.musics.services import collaborative
+from apps.users.models import User
+
+
+class RecommendationAPITestCase(APITestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}", email=f"user{i}@example.com", password="pass123"
+            )
+            for i in range(4)
+        ]
+        self.artist = Artist.objects.create(name="Artist", owner=self.users[0])
+        self.tracks = [
+            Track.objects.create(
+                owner=self.users[0], name=f"Track {i}", artist=self.artist, duration=100
+            )
+            for i in range(4)
+        ]
+        self.url = reverse("recommendations-list")
+
+    def _listen(self, user, *tracks):
+        for track in tracks:
+            ListeningHistory.objects.create(user=user, track=track)
+
+    def test_item_neighbors(self):
+        """Соседи — треки с общими слушателями (не меньше MIN_CO_USERS)"""
+        t0, t1, t2, t3 = self.tracks
+        self._listen(self.users[0], t0, t1)
+        self._listen(self.users[1], t0, t1, t2)
+        Like.objects.create(user=self.users[2], track=t2)
+        self._listen(self.users[2], t3)
+
+        collaborative.compute_item_neighbors()
+        row = TrackItemNeighbors.objects.get(track=t0)
+        self.assertEqual(row.neighbor_ids, [t1.id])
+        self.assertAlmostEqual(row.scores[0], 1.0, places=3)
+        self.assertFalse(TrackItemNeighbors.objects.filter(track=t3).exists())
+
+    def test_personal_recommendations(self):
+        """Рекомендации — соседи прослушанного, без уже знакомых треков"""
+        t0, t1, t2, _ = self.tracks
+        for user in self.users[:2]:
+            self._listen(user, t0, t1, t2)
+        self._listen(self.users[2], t0)
+        collaborative.compute_item_neighbors()
+
+        self.client.force_authenticate(user=self.users[2])
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["source"], "personal")
+        self.assertEqual({t["id"] for t in response.data["results"]}, {t1.id, t2.id})
+
+    def test_cold_start_popular(self):
+        """Без истории — популярные треки"""
+        self.client.force_authenticate(user=self.users[3])
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["source"], "popular")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_requires_auth(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,44 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from apps.musics.models import Track
+from apps.musics.services.recommendations import recommend
+from apps.musics.api_endpoints.v1.viewer_state import ViewerStateMixin
+from apps.musics.api_endpoints.v1.track.serializers import TrackListSerializer
+from .serializers import RecommendationQuerySerializer
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["Recommendations"],
+        summary="Personal recommendations",
+        description=(
+            "Tracks similar to the user's recent listens and likes "
+            "(item-to-item collaborative filtering over precomputed neighbors). "
+            "Users without history get popular tracks; `source` tells which."
+        ),
+        parameters=[RecommendationQuerySerializer],
+    ),
+)
+class RecommendationViewSet(ViewerStateMixin, viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated]
+    serializer_class = TrackListSerializer
+
+    def list(self, request, *args, **kwargs):
+        params = RecommendationQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        limit = params.validated_data["limit"]
+
+        tracks = recommend(request.user, limit=limit)
+        source = "personal"
+        if not tracks:
+            tracks = Track.get_top_tracks(limit=limit)
+            source = "popular"
+
+        serializer = self.get_serializer(tracks, many=True)
+        return Response({"source": source, "results": serializer.data})
+
+
+__all__ = ["RecommendationViewSet"]
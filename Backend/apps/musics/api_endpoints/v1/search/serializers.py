@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from apps.musics.services import autocomplete
+
+SEARCH_TYPES = ("tracks", "artists", "albums")
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Параметры поиска"""
+
+    q = serializers.CharField(min_length=1, max_length=100, trim_whitespace=True)
+    types = serializers.MultipleChoiceField(
+        choices=SEARCH_TYPES, required=False, default=set(SEARCH_TYPES)
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=5)
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    """Параметры подсказок"""
+
+    q = serializers.CharField(min_length=1, max_length=100, trim_whitespace=True)
+    types = serializers.MultipleChoiceField(
+        choices=autocomplete.ENTITIES, required=False, default=set(autocomplete.ENTITIES)
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=10, default=5)
+
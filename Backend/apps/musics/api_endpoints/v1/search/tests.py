@@ -0,0 +1,196 @@
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.musics.models import Album, Artist, Playlist, Track
+from apps.musics.services import autocomplete
+from apps.musics.signals import search as search_signals
+from apps.musics.tasks import rebuild_autocomplete
+from apps.shared.tests import FakeRedisMixin
+from apps.users.models import User
+
+
+class SearchAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="pass123"
+        )
+        self.artist = Artist.objects.create(name="Sevara", owner=self.user)
+        self.other_artist = Artist.objects.create(name="Shahzoda", owner=self.user)
+        self.album = Album.objects.create(
+            name="Yolg'izim", artist=self.artist, owner=self.user, is_published=True
+        )
+        self.track = Track.objects.create(
+            owner=self.user,
+            name="Bahor",
+            artist=self.artist,
+            album=self.album,
+            duration=120,
+        )
+        Track.objects.create(
+            owner=self.user, name="Kuz", artist=self.other_artist, duration=100
+        )
+        self.url = reverse("search-list")
+
+    def test_grouped_results(self):
+        """Результаты сгруппированы по типам"""
+        response = self.client.get(self.url, {"q": "Sevara"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([a["id"] for a in response.data["artists"]], [self.artist.id])
+        self.assertEqual([t["id"] for t in response.data["tracks"]], [self.track.id])
+        self.assertEqual([a["id"] for a in response.data["albums"]], [self.album.id])
+
+    def test_types_filter(self):
+        """types ограничивает группы в ответе"""
+        response = self.client.get(self.url, {"q": "Bahor", "types": "tracks"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("artists", response.data)
+        self.assertEqual(len(response.data["tracks"]), 1)
+
+    def test_query_required(self):
+        """Пустой запрос — 400"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_manager_search_by_album(self):
+        """Track.objects.search ищет и по названию альбома"""
+        self.assertEqual(list(Track.objects.search("Yolg'izim")), [self.track])
+
+    def test_vectors_cascade_only_on_rename(self):
+        """Правка био артиста обновляет только его вектор, переименование — и его альбомов/треков"""
+        artist = Artist.objects.get(pk=self.artist.pk)
+        with mock.patch.object(search_signals, "schedule_refresh") as refresh:
+            artist.bio = "Updated bio"
+            artist.save()
+            self.assertEqual(refresh.call_count, 1)
+            artist.name = "Sevara N."
+            artist.save()
+            self.assertEqual(refresh.call_count, 4)
+            album = Album.objects.get(pk=self.album.pk)
+            album.save(update_fields=["is_published"])
+            self.assertEqual(refresh.call_count, 5)
+
+    def test_autocomplete_prefix(self):
+        """Подсказки по началу любого слова, по популярности"""
+        Track.objects.create(
+            owner=self.user, name="Bahorgi kuy", artist=self.artist, duration=90, plays_count=10
+        )
+        response = self.client.get(
+            reverse("search-autocomplete"), {"q": "bah", "types": "tracks"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [t["name"] for t in response.data["tracks"]], ["Bahorgi kuy", "Bahor"]
+        )
+        self.assertEqual(response.data["tracks"][0]["artist"], "Sevara")
+        self.assertNotIn("artists", response.data)
+
+    def test_cross_script(self):
+        """Кириллица находит латиницу и наоборот"""
+        Track.objects.create(
+            owner=self.user, name="Юлдуз", artist=self.other_artist, duration=90
+        )
+        response = self.client.get(self.url, {"q": "Севара", "types": "artists"})
+        self.assertEqual([a["id"] for a in response.data["artists"]], [self.artist.id])
+
+        response = self.client.get(
+            reverse("search-autocomplete"), {"q": "yuld", "types": "tracks"}
+        )
+        self.assertEqual([t["name"] for t in response.data["tracks"]], ["Юлдуз"])
+
+    def test_autocomplete_query_required(self):
+        response = self.client.get(reverse("search-autocomplete"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AutocompleteRedisTestCase(FakeRedisMixin, APITestCase):
+    """Индекс подсказок в Redis с переключением версий (fakeredis)"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="suggest", email="suggest@example.com", password="pass123"
+        )
+        # Пересборку из complete() проверяем по вызовам, без брокера
+        patcher = mock.patch.object(rebuild_autocomplete, "delay")
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.artist = Artist.objects.create(
+            name="Sevara Nazarkhan", owner=self.user, followers_count=5
+        )
+        self.track1 = Track.objects.create(
+            owner=self.user, name="Bahor tuni", artist=self.artist, duration=3, plays_count=10
+        )
+        self.track2 = Track.objects.create(
+            owner=self.user, name="Bahorgi kuy", artist=self.artist, duration=3, plays_count=50
+        )
+        Track.objects.create(
+            owner=self.user, name="Bahor hidden", artist=self.artist, duration=3,
+            plays_count=99, is_published=False,
+        )
+        self.playlist = Playlist.objects.create(name="Best of bahor", owner=self.user)
+
+    def ids(self, query, entity):
+        return [item["id"] for item in autocomplete.complete(query)[entity]]
+
+    def rebuild(self):
+        for entity in autocomplete.ENTITIES:
+            autocomplete.rebuild(entity)
+
+    def test_missing_index_served_from_database(self):
+        """Пока индекса нет, подсказки из БД, а пересборка ставится в очередь один раз"""
+        self.assertEqual(self.ids("bah", "tracks"), [self.track2.id, self.track1.id])
+        autocomplete.complete("bah")
+        self.assertEqual(self.delay.call_count, len(autocomplete.ENTITIES))
+
+        self.rebuild()
+        self.assertFalse(self.redis.exists("musics:autocomplete:tracks:lock"))
+        with self.assertNumQueries(0):
+            result = autocomplete.complete("bah")
+        self.assertEqual([t["id"] for t in result["tracks"]], [self.track2.id, self.track1.id])
+        self.assertEqual(result["tracks"][0]["artist"], "Sevara Nazarkhan")
+        self.assertEqual([p["id"] for p in result["playlists"]], [self.playlist.id])
+        self.assertEqual(self.ids("naz", "artists"), [self.artist.id])
+
+    def test_version_keys_expire(self):
+        """Указатель версии истекает не позже её ключей, старые версии удаляются"""
+        self.rebuild()
+        autocomplete.rebuild("tracks")
+        ttl = self.redis.ttl("musics:autocomplete:tracks:version")
+        self.assertTrue(0 < ttl <= autocomplete.VERSION_TIMEOUT)
+        keys = [
+            key.decode()
+            for key in self.redis.scan_iter(match="musics:autocomplete:tracks:*")
+            if not key.endswith(b":version")
+        ]
+        self.assertTrue(keys)
+        self.assertTrue(all(self.redis.ttl(key) >= ttl for key in keys))
+        self.assertEqual(len({key.split(":")[3] for key in keys}), 1)
+
+    def test_incremental_updates(self):
+        """Переименование, снятие с публикации и удаление правят текущую версию"""
+        self.rebuild()
+        self.track1.name = "Kuz"
+        self.track1.save()
+        autocomplete.index_queryset("tracks", Track.objects.filter(pk=self.track1.pk))
+        self.assertEqual(self.ids("bah", "tracks"), [self.track2.id])
+        self.assertEqual(self.ids("kuz", "tracks"), [self.track1.id])
+
+        self.track2.is_published = False
+        self.track2.save()
+        autocomplete.index_queryset("tracks", Track.objects.filter(pk=self.track2.pk))
+        self.assertEqual(self.ids("bah", "tracks"), [])
+
+        autocomplete.remove_objects("artists", [self.artist.pk])
+        self.assertEqual(self.ids("sev", "artists"), [])
+
+    def test_long_query_filtered_by_name(self):
+        """Запрос длиннее индексируемого префикса дофильтровывается по названию"""
+        Track.objects.create(
+            owner=self.user, name="Averyveryverylongtrackname here", artist=self.artist, duration=3
+        )
+        autocomplete.rebuild("tracks")
+        self.assertEqual(len(self.ids("averyveryverylongtrackname h", "tracks")), 1)
+        self.assertEqual(self.ids("averyveryverylongtrackname x", "tracks"), [])
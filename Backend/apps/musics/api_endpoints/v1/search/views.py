@@ -0,0 +1,96 @@
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from apps.musics.models import Album, Artist, Track
+from apps.musics.services import autocomplete as suggestions, search
+from apps.musics.api_endpoints.v1.viewer_state import ViewerStateMixin
+from apps.musics.api_endpoints.v1.album.serializers import AlbumListSerializer
+from apps.musics.api_endpoints.v1.artist.serializers import ArtistListSerializer
+from apps.musics.api_endpoints.v1.track.serializers import TrackListSerializer
+from .serializers import (
+    SEARCH_TYPES,
+    AutocompleteQuerySerializer,
+    SearchQuerySerializer,
+)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["Search"],
+        summary="Search",
+        description=(
+            "Full-text search over tracks, artists and albums with typo tolerance. "
+            "Results are grouped by type and ranked by relevance "
+            "(name > artist > album > lyrics)."
+        ),
+        parameters=[SearchQuerySerializer],
+    ),
+    autocomplete=extend_schema(
+        tags=["Search"],
+        summary="Autocomplete",
+        description=(
+            "Search-as-you-type suggestions by name prefix for tracks, artists, "
+            "albums and public playlists, ranked by popularity. Served from a "
+            "prefix index without touching the database."
+        ),
+        parameters=[AutocompleteQuerySerializer],
+    ),
+)
+class SearchViewSet(ViewerStateMixin, viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    serializer_classes = {
+        "tracks": TrackListSerializer,
+        "artists": ArtistListSerializer,
+        "albums": AlbumListSerializer,
+    }
+    result_type = "tracks"
+
+    def get_queryset(self):
+        if self.result_type == "albums":
+            return Album.objects.filter(is_published=True).select_related("artist")
+        if self.result_type == "artists":
+            return Artist.objects.with_counts()
+        return (
+            Track.objects.filter(is_published=True)
+            .select_related("artist", "album")
+            .prefetch_related("genres")
+        )
+
+    def get_serializer_class(self):
+        return self.serializer_classes[self.result_type]
+
+    def get_viewer_track_field(self):
+        return "pk" if self.result_type == "tracks" else None
+
+    def list(self, request, *args, **kwargs):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+        types = params.get("types") or SEARCH_TYPES
+
+        data = {"query": params["q"]}
+        for result_type in SEARCH_TYPES:
+            if result_type not in types:
+                continue
+            self.result_type = result_type
+            objects = search.search(self.get_queryset(), params["q"])[: params["limit"]]
+            data[result_type] = self.get_serializer(objects, many=True).data
+        return Response(data)
+
+    @action(detail=False, methods=["get"], url_path="autocomplete")
+    def autocomplete(self, request):
+        params = AutocompleteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+        types = params.get("types") or suggestions.ENTITIES
+        entities = [entity for entity in suggestions.ENTITIES if entity in types]
+
+        data = {"query": params["q"]}
+        data.update(suggestions.complete(params["q"], entities, limit=params["limit"]))
+        return Response(data)
+
+
+__all__ = ["SearchViewSet"]
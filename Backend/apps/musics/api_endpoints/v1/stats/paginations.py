@@ -1,7 +1,9 @@
-from rest_framework.pagination import PageNumberPagination
+from apps.shared.paginations import KeysetPagination
 
 
-class StatsPagination(PageNumberPagination):
+class StatsPagination(KeysetPagination):
+    # ?page=N оставлен для текущего фронтенда, без него — курсор
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+    page_number_compat = True
@@ -1,12 +1,13 @@
 from rest_framework import serializers
 from apps.musics.models import Like, ListeningHistory
 from apps.musics.models.track import Track
+from apps.musics.api_endpoints.v1.viewer_state import IsLikedField
 
 
 class TrackMiniSerializer(serializers.ModelSerializer):
     artist_name = serializers.CharField(source="artist.name", read_only=True)
     album_name = serializers.CharField(source="album.name", read_only=True)
-    is_liked = serializers.SerializerMethodField()
+    is_liked = IsLikedField()
 
     class Meta:
         model = Track
@@ -23,26 +24,36 @@ class TrackMiniSerializer(serializers.ModelSerializer):
             "is_liked",
         ]
 
-    def get_is_liked(self, obj):
-        user = self.context.get("request").user
-        if not user.is_authenticated:
-            return False
-        return obj.likes.filter(user=user).exists()
+
+class TrackRefField(serializers.PrimaryKeyRelatedField):
+    """Принимает id трека, а отдаёт его в виде TrackMiniSerializer."""
+
+    def use_pk_only_optimization(self):
+        return False
+
+    def to_representation(self, track):
+        return TrackMiniSerializer(track, context=self.context).data
 
 
 class LikeSerializer(serializers.ModelSerializer):
-    track = TrackMiniSerializer(read_only=True)
+    track = TrackRefField(queryset=Track.objects.filter(is_published=True))
 
     class Meta:
         model = Like
         fields = ["id", "track"]
-        read_only_fields = ["id", "track"]
+        read_only_fields = ["id"]
+
+    def validate_track(self, track):
+        user = self.context["request"].user
+        if Like.objects.filter(user=user, track=track).exists():
+            raise serializers.ValidationError("Track is already liked.")
+        return track
 
 
 class ListeningHistorySerializer(serializers.ModelSerializer):
-    track = TrackMiniSerializer(read_only=True)
+    track = TrackRefField(queryset=Track.objects.filter(is_published=True))
 
     class Meta:
         model = ListeningHistory
         fields = ["id", "track", "listened_at", "duration", "additional_info"]
-        read_only_fields = ["id", "track", "listened_at"]
+        read_only_fields = ["id", "listened_at"]
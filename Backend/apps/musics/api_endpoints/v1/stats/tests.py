@@ -1,7 +1,12 @@
+from datetime import timedelta
+
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
-from apps.musics.models import Track, Like, ListeningHistory, Artist
+from apps.musics.models import Track, Like, ListeningEvent, ListeningHistory, Artist
+from apps.musics.services import history
+from apps.shared.tests import FakeRedisMixin
 from apps.users.models import User
 
 
@@ -55,6 +60,24 @@ class StatsAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(Like.objects.filter(user=self.user, track=self.track2).exists())
 
+    def test_like_create_duplicate(self):
+        """Повторный лайк того же трека возвращает 400"""
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.likes_url, {"track": self.track1.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_like_destroy_auth(self):
+        """Удаление лайка уменьшает счётчик трека"""
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post(self.likes_url, {"track": self.track2.id})
+        like = Like.objects.get(user=self.user, track=self.track2)
+        response = self.client.delete(reverse("like-detail", args=[like.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.track2.refresh_from_db()
+        self.assertEqual(self.track2.likes_count, 0)
+
     def test_like_create_anon(self):
         """Тестируем создание лайка анонимным пользователем"""
 
@@ -71,6 +94,22 @@ class StatsAPITestCase(APITestCase):
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["track_name"], self.track2.name)
 
+    def test_history_cursor_and_page(self):
+        """История листается курсором, а ?page=N по-прежнему работает"""
+
+        ListeningHistory.objects.create(user=self.user, track=self.track1, duration=30)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.history_url, {"page_size": 1})
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get(self.history_url, {"page": 1, "page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+
     def test_history_list_anon(self):
         """Тестируем получение списка истории прослушиваний анонимным пользователем"""
 
@@ -95,3 +134,48 @@ class StatsAPITestCase(APITestCase):
         data = {"track": self.track1.id, "duration": 90}
         response = self.client.post(self.history_url, data)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class HistoryRedisTestCase(FakeRedisMixin, APITestCase):
+    """Сброс буфера истории в Redis-режиме (fakeredis)"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="listener", email="listener@example.com", password="pass123"
+        )
+        artist = Artist.objects.create(name="Buffered Artist", owner=self.user)
+        self.track = Track.objects.create(
+            owner=self.user, name="Buffered", artist=artist, duration=120
+        )
+        self.now = timezone.now()
+
+    def listen(self, duration, listened_at):
+        history.record_listen(self.user.pk, self.track.pk, duration=duration, listened_at=listened_at)
+        history.flush_listen_buffer()
+        return ListeningHistory.objects.get(user=self.user, track=self.track)
+
+    def test_late_event_does_not_rewind(self):
+        """Запоздавшее событие не откатывает последнее прослушивание назад"""
+        self.listen(9, self.now)
+        latest = self.listen(1, self.now - timedelta(hours=1))
+        self.assertEqual((latest.duration, latest.listened_at), (9, self.now))
+        latest = self.listen(3, self.now + timedelta(seconds=1))
+        self.assertEqual(latest.duration, 3)
+        self.assertEqual(ListeningEvent.objects.count(), 3)
+
+    def test_clear_drops_buffered_events(self):
+        """События из буфера, записанные до очистки, историю не возвращают"""
+        history.record_listen(self.user.pk, self.track.pk, duration=4)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.delete(reverse("history-clear"))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(history.flush_listen_buffer(), 1)
+        self.assertFalse(ListeningHistory.objects.exists())
+        self.assertFalse(ListeningEvent.objects.exists())
+
+        # А более поздние — уже пишутся
+        history.record_listen(self.user.pk, self.track.pk, listened_at=timezone.now() + timedelta(seconds=1))
+        history.flush_listen_buffer()
+        self.assertTrue(ListeningHistory.objects.exists())
@@ -3,10 +3,14 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework import status
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
 from apps.musics.models import Like, ListeningHistory
 from .paginations import StatsPagination
 from .serializers import LikeSerializer, ListeningHistorySerializer
+from apps.musics.api_endpoints.v1.viewer_state import ViewerStateMixin
+from apps.musics.services.history import clear_history, record_listen
+from apps.musics.services.likes import remember_like
 
 
 @extend_schema_view(
@@ -29,21 +33,28 @@ from .serializers import LikeSerializer, ListeningHistorySerializer
         responses={204: OpenApiResponse(description="No Content")},
     ),
 )
-class LikeViewSet(ModelViewSet):
+class LikeViewSet(ViewerStateMixin, ModelViewSet):
     serializer_class = LikeSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StatsPagination
+    viewer_track_field = "track_id"
 
     def get_queryset(self):
         qs = Like.objects.filter(user=self.request.user)
-        return (
-            qs.select_related("track", "user")
-            .prefetch_related("track__likes")
-            .order_by("-created_at")
-        )
+        return qs.select_related(
+            "track", "track__artist", "track__album", "user"
+        ).order_by("-created_at")
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        like = serializer.save(user=self.request.user)
+        like.track.increment_like()
+        remember_like(like.user_id, like.track_id, True)
+
+    def perform_destroy(self, instance):
+        track = instance.track
+        instance.delete()
+        track.decrement_like()
+        remember_like(instance.user_id, track.pk, False)
 
 
 @extend_schema_view(
@@ -54,21 +65,34 @@ class LikeViewSet(ModelViewSet):
         responses={200: ListeningHistorySerializer(many=True)},
     ),
 )
-class ListeningHistoryViewSet(ModelViewSet):
+class ListeningHistoryViewSet(ViewerStateMixin, ModelViewSet):
     serializer_class = ListeningHistorySerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StatsPagination
     lookup_field = "slug"
+    viewer_track_field = "track_id"
 
     def get_queryset(self):
         qs = ListeningHistory.objects.filter(user=self.request.user).order_by(
             "-listened_at"
-        )[:50]
-        return qs.select_related("track", "user").prefetch_related("track__likes")
+        )
+        return qs.select_related("track", "track__artist", "track__album", "user")
 
-    # create можно оставить, но обычно записи создаются автоматически при play()
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+    def create(self, request, *args, **kwargs):
+        # Запись идёт через буфер событий, ListeningHistory обновится при его сбросе
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        event = record_listen(
+            request.user.pk,
+            data["track"].pk,
+            duration=data.get("duration"),
+            additional_info=data.get("additional_info"),
+        )
+        return Response(
+            {**serializer.data, "listened_at": event.listened_at},
+            status=status.HTTP_201_CREATED,
+        )
 
     @action(detail=False, methods=["delete"], url_path="clear", url_name="clear")
     @extend_schema(
@@ -78,8 +102,7 @@ class ListeningHistoryViewSet(ModelViewSet):
         responses={204: OpenApiResponse(description="No Content")},
     )
     def clear(self, request, *args, **kwargs):
-        user = request.user
-        deleted_count, _ = ListeningHistory.objects.filter(user=user).delete()
+        deleted_count = clear_history(request.user.pk)
         return Response(
             {"message": f"Cleared {deleted_count} listening history records."},
             status=204,
@@ -0,0 +1,95 @@
+from django.db import models
+from drf_spectacular.extensions import OpenApiSerializerFieldExtension
+from drf_spectacular.plumbing import build_array_type
+from rest_framework import serializers
+
+from apps.musics.services.summaries import get_summaries
+
+
+class SummaryField(serializers.Field):
+    """
+    Вложенное представление связанной сущности из TieredCache
+    (apps.musics.services.summaries) вместо сериализации объекта.
+
+    source — id (``artist_id``) или m2m-менеджер (``genres``, many=True):
+    для m2m нужны только pk, так что хватает Prefetch(..., only("pk")).
+    """
+
+    def __init__(self, serializer_class, many=False, **kwargs):
+        self.serializer_class = serializer_class
+        self.many = many
+        self.prefetched = {}
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_ids(self, value):
+        return [obj.pk for obj in value.all()] if self.many else [value]
+
+    def prefetch(self, instances):
+        """Сводки сразу для всей страницы (см. SummaryListSerializer)."""
+        ids = set()
+        for instance in instances:
+            value = self.get_attribute(instance)
+            if value is not None:
+                ids.update(self.get_ids(value))
+        self.prefetched = get_summaries(self.serializer_class, ids)
+
+    def to_representation(self, value):
+        ids = self.get_ids(value)
+        summaries = self.prefetched
+        if not all(pk in summaries for pk in ids):
+            summaries = get_summaries(self.serializer_class, ids)
+        data = [self._absolute(summaries[pk]) for pk in ids if pk in summaries]
+        if self.many:
+            return data
+        return data[0] if data else None
+
+    def _absolute(self, data):
+        # В кэше ссылки на файлы относительные — как и без request
+        request = self.context.get("request")
+        if request is None:
+            return data
+        data = dict(data)
+        for name in _file_fields(self.serializer_class):
+            if data.get(name):
+                data[name] = request.build_absolute_uri(data[name])
+        return data
+
+
+class SummaryListSerializer(serializers.ListSerializer):
+    """
+    many=True для сериализаторов с SummaryField: сводки грузятся одним
+    get_many на всю страницу, а не по объекту.
+    Подключается через Meta.list_serializer_class.
+    """
+
+    def to_representation(self, data):
+        instances = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        for field in self.child.fields.values():
+            if isinstance(field, SummaryField):
+                field.prefetch(instances)
+        return super().to_representation(instances)
+
+
+class SummaryFieldExtension(OpenApiSerializerFieldExtension):
+    """В схеме SummaryField — это его serializer_class."""
+
+    target_class = SummaryField
+
+    def map_serializer_field(self, auto_schema, direction):
+        component = auto_schema.resolve_serializer(self.target.serializer_class, direction)
+        if self.target.many:
+            return build_array_type(component.ref)
+        return component.ref
+
+
+def _file_fields(serializer_class):
+    model = serializer_class.Meta.model
+    return [
+        field.name
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and field.name in serializer_class.Meta.fields
+    ]
+
+
+__all__ = ["SummaryField", "SummaryListSerializer"]
@@ -0,0 +1,104 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.musics.models import Album, Artist, Like, ListeningEvent, Playlist, PlaylistTrack, Track
+from apps.shared.tests import BenchmarkAPITestCase
+from apps.users.models import User
+
+# Потолок запросов к БД на один GET (при пустом кэше) — ровно по замерам:
+# любой лишний запрос валит тест
+QUERY_BUDGETS = {
+    "tracks.list": 3,
+    "tracks.detail": 11,
+    "albums.list": 2,
+    "albums.detail": 4,
+    "artists.list": 1,
+    "artists.detail": 7,
+    "playlists.list": 2,
+    "playlists.detail": 3,
+    "likes.list": 2,
+    "history.list": 2,
+}
+# p95 с запасом для sqlite в CI; регрессии ловит в первую очередь число запросов
+P95_MS = 300
+
+
+class EndpointBudgetTestCase(BenchmarkAPITestCase):
+    """
+    Бюджеты запросов и p95 для основных эндпоинтов каталога.
+    Число запросов не должно зависеть от размера страницы и объёма
+    данных (проверяется прогоном с BENCHMARK_SCALE).
+    """
+
+    def setUp(self):
+        # Самый активный пользователь: непустые лайки и история
+        self.user = User.objects.annotate(n=Count("likes")).order_by("-n").first()
+        self.client.force_authenticate(user=self.user)
+
+    def check(self, name, url, params=None):
+        self.assertBudget(name, url, QUERY_BUDGETS[name], P95_MS, params)
+
+    def test_tracks(self):
+        track = Track.objects.filter(is_published=True).first()
+        self.check("tracks.list", reverse("track-list"), {"page_size": 20})
+        self.check("tracks.detail", reverse("track-detail", args=[track.slug]))
+
+    def test_albums(self):
+        album = Album.objects.filter(is_published=True).first()
+        self.check("albums.list", reverse("album-list"))
+        self.check("albums.detail", reverse("album-detail", args=[album.slug]))
+
+    def test_artists(self):
+        artist = Artist.objects.first()
+        self.check("artists.list", reverse("artist-list"))
+        self.check("artists.detail", reverse("artist-detail", args=[artist.slug]))
+
+    def test_playlists(self):
+        playlist = Playlist.objects.filter(is_public=True).first()
+        self.check("playlists.list", reverse("playlist-list"))
+        self.check("playlists.detail", reverse("playlist-detail", args=[playlist.slug]))
+
+    def test_likes(self):
+        self.check("likes.list", reverse("like-list"))
+
+    def test_history(self):
+        self.check("history.list", reverse("history-list"))
+
+
+class HighVolumeSeedTestCase(TestCase):
+    """seed_music --high-volume: согласованные счётчики и «тяжёлая голова» Зипфа."""
+
+    def test_seed(self):
+        call_command(
+            "seed_music",
+            high_volume=True,
+            users=30,
+            artists=5,
+            albums=8,
+            tracks=100,
+            playlists=6,
+            playlist_tracks=5,
+            likes=300,
+            history=400,
+            events=2000,
+            chunk_size=64,
+            workers=1,
+            seed=7,
+            stdout=StringIO(),
+        )
+        self.assertEqual(Track.objects.count(), 100)
+        self.assertEqual(PlaylistTrack.objects.count(), 30)
+
+        totals = Track.objects.aggregate(plays=Sum("plays_count"), likes=Sum("likes_count"))
+        self.assertEqual(totals["plays"], ListeningEvent.objects.count())
+        self.assertEqual(totals["likes"], Like.objects.count())
+        self.assertEqual(
+            Artist.objects.aggregate(plays=Sum("total_plays"))["plays"], totals["plays"]
+        )
+
+        top = Track.objects.order_by("-plays_count").values_list("plays_count", flat=True)[:10]
+        self.assertGreater(sum(top), totals["plays"] * 0.3)
@@ -0,0 +1,9 @@
+from apps.shared.paginations import KeysetPagination
+
+
+class TrackPagination(KeysetPagination):
+    # Без ?cursor / ?page_size список отдаётся целиком, как раньше
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    optional = True
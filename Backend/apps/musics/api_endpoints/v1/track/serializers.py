@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from apps.musics.models import Track, Like as TrackLike, Genre
+from apps.musics.models import Track, Genre
+from apps.musics.api_endpoints.v1.summaries import SummaryField, SummaryListSerializer
+from apps.musics.api_endpoints.v1.viewer_state import IsLikedField
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -21,13 +23,14 @@ class AlbumSerializer(serializers.ModelSerializer):
 
 
 class TrackListSerializer(serializers.ModelSerializer):
-    artist = ArtistSerializer(read_only=True)
-    album = AlbumSerializer(read_only=True)
-    is_liked = serializers.SerializerMethodField()
-    genres = GenreSerializer(many=True, read_only=True)
+    artist = SummaryField(ArtistSerializer, source="artist_id")
+    album = SummaryField(AlbumSerializer, source="album_id")
+    is_liked = IsLikedField()
+    genres = SummaryField(GenreSerializer, many=True)
 
     class Meta:
         model = Track
+        list_serializer_class = SummaryListSerializer
         fields = [
             "id",
             "name",
@@ -46,17 +49,11 @@ class TrackListSerializer(serializers.ModelSerializer):
             "likes_count",
         ]
 
-    def get_is_liked(self, obj):
-        user = self.context.get("request").user
-        if not user.is_authenticated:
-            return False
-        return TrackLike.objects.filter(user=user, track=obj).exists()
-
 
 class TrackDetailSerializer(serializers.ModelSerializer):
-    artist = ArtistSerializer(read_only=True)
-    album = AlbumSerializer(read_only=True)
-    genres = GenreSerializer(many=True, read_only=True)
+    artist = SummaryField(ArtistSerializer, source="artist_id")
+    album = SummaryField(AlbumSerializer, source="album_id")
+    genres = SummaryField(GenreSerializer, many=True)
 
     class Meta:
         model = Track
@@ -1,10 +1,35 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from apps.musics.models import Track, Artist, Album
+from apps.musics.models import (
+    Track,
+    Artist,
+    Album,
+    Genre,
+    Like,
+    ListeningEvent,
+    ListeningHistory,
+    TrackListenDaily,
+    TrackListenHourly,
+    TrackNeighbors,
+)
+from apps.musics.services import counters, history, likes, listens, neighbors, plays
+from apps.shared.filters import RelevanceOrderingFilter
+from apps.shared.tests import FakeRedisMixin
+from apps.musics.api_endpoints.v1.track.views import TrackViewSet
 
 User = get_user_model()
 
@@ -76,6 +101,43 @@ class TrackAPITestCase(APITestCase):
         self.assertEqual(response.data["name"], self.track1.name)
         self.assertEqual(response.data["artist_name"], self.artist.name)
 
+    def test_list_cursor_pagination(self):
+        """С ?page_size список отдаётся страницами по курсору"""
+        Track.objects.filter(pk=self.track2.pk).update(plays_count=5)
+        response = self.client.get(self.list_url, {"page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([t["id"] for t in response.data["results"]], [self.track2.id])
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual([t["id"] for t in response.data["results"]], [self.track1.id])
+        self.assertIsNone(response.data["next"])
+
+    def test_list_invalid_cursor(self):
+        """Подделанный курсор — 404"""
+        response = self.client.get(self.list_url, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_is_liked_single_query(self):
+        """is_liked для всей страницы определяется одним запросом к лайкам"""
+        Like.objects.create(user=self.user, track=self.track1)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        liked = {t["id"]: t["is_liked"] for t in response.data}
+        self.assertEqual(liked, {self.track1.id: True, self.track2.id: False})
+        likes_queries = [q for q in ctx.captured_queries if "musics_likes" in q["sql"]]
+        self.assertEqual(len(likes_queries), 1)
+
+    def test_retrieve_appends_listening_event(self):
+        """Каждый просмотр — новое событие, а ListeningHistory хранит последнее"""
+        self.client.get(self.detail_url(self.track1.slug))
+        self.client.get(self.detail_url(self.track1.slug))
+        events = ListeningEvent.objects.filter(user=self.user, track=self.track1)
+        self.assertEqual(events.count(), 2)
+        history = ListeningHistory.objects.get(user=self.user, track=self.track1)
+        self.assertEqual(history.listened_at, events.latest("listened_at").listened_at)
+
     # ---------------- Auth Create & Update ----------------
     def test_create_track_anon(self):
         """Тестируем создание трека анонимным пользователем (должно быть запрещено)"""
@@ -122,6 +184,41 @@ class TrackAPITestCase(APITestCase):
         self.track1.refresh_from_db()
         self.assertEqual(self.track1.plays_count, 1)
 
+    def test_play_updates_album_and_artist(self):
+        """Прослушивание увеличивает счётчики альбома и артиста"""
+        response = self._auth_post(self.play_url(self.track1.slug))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], self.track1.id)
+        self.assertEqual(response.data["plays_count"], 1)
+        self.album.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual(self.album.plays_count, 1)
+        self.assertEqual(self.artist.total_plays, 1)
+
+    def test_play_unknown_track(self):
+        """Прослушивание несуществующего трека возвращает 404"""
+        response = self._auth_post(self.play_url("missing-track"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_play_ref_dropped_on_change(self):
+        """Смена slug, снятие с публикации и удаление сразу закрывают play() по старому slug"""
+        old_slug = self.track1.slug
+        self.assertEqual(self._auth_post(self.play_url(old_slug)).status_code, status.HTTP_200_OK)
+        track = Track.objects.get(pk=self.track1.pk)
+        track.slug = "renamed"
+        track.save()
+        self.assertEqual(self._auth_post(self.play_url(old_slug)).status_code, status.HTTP_404_NOT_FOUND)
+
+        self._auth_post(self.play_url("renamed"))
+        track.is_published = False
+        track.save()
+        self.assertEqual(self._auth_post(self.play_url("renamed")).status_code, status.HTTP_404_NOT_FOUND)
+
+        self._auth_post(self.play_url(self.track2.slug))
+        Track.objects.filter(pk=self.track2.pk).delete()
+        response = self._auth_post(self.play_url(self.track2.slug))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_like_increment(self):
         """Тестируем увеличение счетчика лайков"""
         try:
@@ -133,6 +230,137 @@ class TrackAPITestCase(APITestCase):
         self.track1.refresh_from_db()
         self.assertEqual(self.track1.likes_count, 1)
 
+    def test_like_rolls_up_to_album_and_artist(self):
+        """Лайк трека сдвигает likes_count альбома и total_likes артиста"""
+        self._auth_post(self.like_url(self.track1.slug))
+        self.album.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual((self.album.likes_count, self.artist.total_likes), (1, 1))
+        self._auth_post(self.like_url(self.track1.slug))
+        self.artist.refresh_from_db()
+        self.assertEqual(self.artist.total_likes, 0)
+
+    def test_like_toggle(self):
+        """Повторный лайк снимает его и уменьшает счётчик"""
+        self._auth_post(self.like_url(self.track1.slug))
+        response = self._auth_post(self.like_url(self.track1.slug))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["is_liked"])
+        self.track1.refresh_from_db()
+        self.assertEqual(self.track1.likes_count, 0)
+        self.assertEqual(self.track1.stats["likes"], 0)
+
+    def test_stats_read_from_database(self):
+        """stats без Redis берёт счётчики из БД, а не из загруженного экземпляра"""
+        cache.clear()
+        track = Track.objects.get(pk=self.track1.pk)
+        Track.objects.filter(pk=track.pk).update(plays_count=7)
+        self.assertEqual(track.stats["plays"], 7)
+
+    # ---------------- Trending ----------------
+    def test_trending_from_rollups(self):
+        """Тренды и скользящие окна считаются из почасовых/дневных свёрток"""
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="pass123"
+        )
+        ListeningEvent.objects.create(user=self.user, track=self.track2)
+        ListeningEvent.objects.create(user=other, track=self.track2)
+        ListeningEvent.objects.create(user=self.user, track=self.track1)
+
+        later = timezone.now() + timezone.timedelta(hours=2)
+        self.assertGreater(listens.rollup_hours(now=later), 0)
+        listens.rollup_days()
+        listens.refresh_rolling_counts()
+
+        self.track2.refresh_from_db()
+        self.album.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual(self.track2.listens_last_week, 2)
+        self.assertEqual(self.album.listens_last_month, 1)
+        self.assertEqual(self.artist.listens_last_week, 3)
+
+        response = self.client.get(reverse("track-trending"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [t["id"] for t in response.data], [self.track2.id, self.track1.id]
+        )
+
+    # ---------------- Similar ----------------
+    def test_similar_from_neighbors(self):
+        """Похожие треки берутся из посчитанных соседей"""
+        rock = Genre.objects.create(name="Rock")
+        other_artist = Artist.objects.create(name="Artist 2", owner=self.user)
+        close = Track.objects.create(
+            owner=self.user, name="Close", artist=other_artist, duration=125, bpm=120
+        )
+        far = Track.objects.create(
+            owner=self.user, name="Far", artist=other_artist, duration=400, bpm=60
+        )
+        self.track1.bpm = 122
+        self.track1.save()
+        for track in (self.track1, close):
+            track.genres.add(rock)
+        Like.objects.create(user=self.user, track=self.track1)
+        Like.objects.create(user=self.user, track=close)
+
+        self.assertEqual(neighbors.compute_neighbors(k=2), 4)
+        row = TrackNeighbors.objects.get(track=self.track1)
+        self.assertEqual(row.neighbor_ids[0], close.id)
+        self.assertNotIn(self.track1.id, row.neighbor_ids)
+
+        response = self.client.get(reverse("track-similar", args=[self.track1.slug]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([t["id"] for t in response.data][0], close.id)
+        self.assertNotIn(far.id, [t["id"] for t in response.data])
+
+    def test_similar_without_neighbors(self):
+        """Пока соседи не посчитаны — треки того же артиста"""
+        response = self.client.get(reverse("track-similar", args=[self.track1.slug]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([t["id"] for t in response.data], [self.track2.id])
+
+    # ---------------- Response cache ----------------
+    def test_retrieve_etag_not_modified(self):
+        """Повтор с If-None-Match — 304 без тела"""
+        cache.clear()
+        url = reverse("track-detail", args=[self.track1.slug])
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse(response.content)
+
+    def test_cached_list_invalidated_on_save(self):
+        """Закэшированный список сбрасывается после коммита изменений трека"""
+        cache.clear()
+        self.client.get(self.list_url)
+        # Отпечаток списка — версии тегов, сам список — из кэша
+        with self.assertNumQueries(0):
+            self.client.get(self.list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.track2.name = "Renamed"
+            self.track2.save()
+        response = self.client.get(self.list_url)
+        self.assertIn("Renamed", [t["name"] for t in response.data])
+
+    def test_artist_summary_from_process_cache(self):
+        """Сводка артиста берётся из L1 и сбрасывается при его сохранении"""
+        self.client.get(self.list_url)
+        cache.clear()
+        # Ни кэша ответов, ни L2 — но артист/альбом уже в памяти процесса
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.data[0]["artist"]["name"], "Artist 1")
+        self.assertFalse(any("musics_artists" in q["sql"] for q in queries))
+
+        self.artist.name = "Renamed Artist"
+        self.artist.save()
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data[0]["artist"]["name"], "Renamed Artist")
+
     # ---------------- Filters & Search ----------------
     def test_filter_by_artist(self):
         """Тестируем фильтрацию треков по артисту"""
@@ -147,3 +375,195 @@ class TrackAPITestCase(APITestCase):
         results = response.data
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]["name"], "Track One")
+
+    def test_search_keeps_relevance_ordering(self):
+        """При поиске ordering вьюхи по умолчанию не перебивает search_rank"""
+        backend = RelevanceOrderingFilter()
+        view = TrackViewSet()
+        queryset = Track.objects.all()
+
+        def ordering(**params):
+            request = Request(APIRequestFactory().get("/", params))
+            return backend.get_ordering(request, queryset, view)
+
+        self.assertIsNone(ordering(search="track"))
+        self.assertEqual(list(ordering()), ["-plays_count"])
+        self.assertEqual(ordering(search="track", ordering="duration"), ["duration"])
+
+
+class TrackRedisTestCase(FakeRedisMixin, APITestCase):
+    """Redis-путь счётчиков, буферов прослушиваний и множеств лайков (fakeredis)"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="redis", email="redis@example.com", password="pass123"
+        )
+        self.artist = Artist.objects.create(name="Redis Artist", owner=self.user)
+        self.album = Album.objects.create(name="Redis Album", artist=self.artist, owner=self.user)
+        self.track1 = Track.objects.create(
+            owner=self.user, name="Buffered", artist=self.artist, album=self.album,
+            duration=120, plays_count=10,
+        )
+        self.track2 = Track.objects.create(
+            owner=self.user, name="Second", artist=self.artist, duration=150
+        )
+
+    def test_play_counters_buffered(self):
+        """Прослушивания и лайки копятся в Redis и сверяются с БД пачкой"""
+        ref = plays.get_track_ref(self.track1.slug)
+        for expected in (11, 12, 13):
+            self.assertEqual(plays.record_play(ref), expected)
+        self.track1.increment_like()
+        self.track1.increment_like()
+        self.track1.decrement_like()
+        self.assertEqual(self.track1.stats["plays"], 13)
+        self.assertEqual(self.track1.stats["likes"], 1)
+        self.track1.refresh_from_db()
+        self.assertEqual(self.track1.plays_count, 10)
+
+        self.assertEqual(counters.reconcile_counters(), 1)
+        self.assertEqual(counters.reconcile_counters(), 0)
+        self.track1.refresh_from_db()
+        self.assertEqual((self.track1.plays_count, self.track1.likes_count), (13, 1))
+        # Лайки доходят до альбома и артиста разницей при сверке
+        self.album.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual((self.album.likes_count, self.artist.total_likes), (1, 1))
+        self.track1.decrement_like()
+        counters.reconcile_counters()
+        self.artist.refresh_from_db()
+        self.assertEqual(self.artist.total_likes, 0)
+
+        self.assertEqual(plays.flush_play_buffer(), 3)
+        self.album.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual((self.album.plays_count, self.artist.total_plays), (3, 3))
+        self.assertEqual(plays.flush_play_buffer(), 0)
+
+    def test_counters_rebuilt_from_database(self):
+        """После потери Redis счётчики восстанавливаются из БД"""
+        Like.objects.create(user=self.user, track=self.track1)
+        self.redis.flushall()
+        self.assertEqual(counters.rebuild_counters(), 2)
+        self.assertEqual(
+            counters.get_counts([self.track1.id])[self.track1.id],
+            {"plays": 10, "likes": 1, "downloads": 0},
+        )
+
+    def test_play_buffer_requeued_on_failure(self):
+        """Если запись в БД упала, события возвращаются в буфер"""
+        plays.record_play(plays.get_track_ref(self.track1.slug))
+        with mock.patch.object(plays, "apply_play_deltas", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                plays.flush_play_buffer()
+        self.assertEqual(self.redis.llen(plays.PLAY_BUFFER_KEY), 1)
+        self.assertEqual(plays.flush_play_buffer(), 1)
+        self.artist.refresh_from_db()
+        self.assertEqual(self.artist.total_plays, 1)
+
+    def test_listen_buffer(self):
+        """Просмотры трека пишутся в буфер и попадают в журнал и историю пачкой"""
+        self.client.force_authenticate(user=self.user)
+        for _ in range(3):
+            self.client.get(reverse("track-detail", args=[self.track1.slug]))
+        history.record_listen(self.user.pk, self.track2.pk, duration=5)
+        history.record_listen(self.user.pk, 999999)
+        self.assertFalse(ListeningEvent.objects.exists())
+
+        self.assertEqual(history.flush_listen_buffer(), 5)
+        # Событие удалённого трека отброшено
+        self.assertEqual(ListeningEvent.objects.count(), 4)
+        self.assertEqual(ListeningHistory.objects.count(), 2)
+        self.assertEqual(ListeningHistory.objects.get(track=self.track2).duration, 5)
+        self.assertEqual(history.flush_listen_buffer(), 0)
+
+    def test_listen_buffer_requeued_on_failure(self):
+        history.record_listen(self.user.pk, self.track1.pk)
+        with mock.patch.object(history, "write_events", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                history.flush_listen_buffer()
+        self.assertEqual(history.flush_listen_buffer(), 1)
+        self.assertTrue(ListeningHistory.objects.filter(track=self.track1).exists())
+
+    def test_rollups_from_hourly_hashes(self):
+        """Свёртки считают события журнала в час прослушивания — как и backfill по журналу"""
+        now = timezone.now()
+        # Первый запуск только ставит отметку
+        self.assertEqual(listens.rollup_hours(now=now), 0)
+        # /play/ — счётчик трека, а не событие журнала
+        plays.record_play(plays.get_track_ref(self.track1.slug))
+        plays.flush_play_buffer()
+        for _ in range(3):
+            history.record_listen(self.user.pk, self.track1.pk, listened_at=now)
+        history.flush_listen_buffer()
+
+        self.assertGreaterEqual(listens.rollup_hours(now=now + timedelta(hours=1, minutes=10)), 1)
+        hourly = TrackListenHourly.objects.get()
+        self.assertEqual((hourly.bucket, hourly.plays), (now.replace(minute=0, second=0, microsecond=0), 3))
+
+        # Опоздавшее событие попадает в свой час при следующей свёртке
+        history.record_listen(self.user.pk, self.track1.pk, listened_at=now)
+        history.flush_listen_buffer()
+        listens.rollup_hours(now=now + timedelta(hours=1, minutes=20))
+        self.assertEqual(TrackListenHourly.objects.get().plays, 4)
+
+        listens.rollup_days()
+        listens.refresh_rolling_counts()
+        self.assertEqual(TrackListenDaily.objects.get().plays, 4)
+        self.track1.refresh_from_db()
+        self.assertEqual(self.track1.listens_last_week, 4)
+
+        call_command("rollup_listens", "--backfill", "--since-days", "1", stdout=StringIO())
+        self.assertEqual(TrackListenHourly.objects.get().plays, 4)
+
+        listens.refresh_rolling_counts(today=timezone.now().date() + timedelta(days=40))
+        self.track1.refresh_from_db()
+        self.album.refresh_from_db()
+        self.assertEqual((self.track1.listens_last_month, self.album.listens_last_week), (0, 0))
+
+    def test_rollup_backfill_from_events(self):
+        """Часы без hash-а — ноль; журнал читается только по явному --backfill"""
+        ListeningEvent.objects.create(user=self.user, track=self.track1)
+        ListeningEvent.objects.update(listened_at=timezone.now() - timedelta(hours=3))
+        self.assertEqual(listens.rollup_hours(now=timezone.now()), 0)
+        self.assertFalse(TrackListenHourly.objects.exists())
+
+        call_command("rollup_listens", "--backfill", "--since-days", "1", stdout=StringIO())
+        self.assertEqual(TrackListenHourly.objects.get().plays, 1)
+
+    def test_liked_set(self):
+        """is_liked — SMISMEMBER по множеству, загруженному из БД один раз"""
+        Like.objects.create(user=self.user, track=self.track1)
+        track_ids = [self.track1.id, self.track2.id]
+        with self.assertNumQueries(1):
+            self.assertEqual(likes.get_liked_track_ids(self.user, track_ids), {self.track1.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(likes.get_liked_track_ids(self.user, track_ids), {self.track1.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            likes.remember_like(self.user.id, self.track2.id, True)
+            likes.remember_like(self.user.id, self.track1.id, False)
+        self.assertEqual(likes.get_liked_track_ids(self.user, track_ids), {self.track2.id})
+
+        # Незагруженное множество не создаётся частично
+        with self.captureOnCommitCallbacks(execute=True):
+            likes.remember_like(999, self.track2.id, True)
+        self.assertFalse(self.redis.exists("musics:liked:999"))
+
+    def test_like_during_load(self):
+        """Лайк, закоммиченный во время загрузки множества, не теряется"""
+        Like.objects.create(user=self.user, track=self.track1)
+        real_filter = likes.Like.objects.filter
+
+        def racing_filter(**kwargs):
+            with self.captureOnCommitCallbacks(execute=True):
+                likes.remember_like(self.user.id, self.track2.id, True)
+            return real_filter(**kwargs)
+
+        with mock.patch.object(likes.Like.objects, "filter", side_effect=racing_filter):
+            liked = likes.get_liked_track_ids(self.user, [self.track1.id, self.track2.id])
+        self.assertEqual(liked, {self.track1.id, self.track2.id})
+        self.assertFalse(self.redis.exists(f"musics:liked:{self.user.id}:pending"))
+        self.assertGreater(self.redis.ttl(f"musics:liked:{self.user.id}"), 0)
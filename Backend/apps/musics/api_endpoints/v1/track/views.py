@@ -1,21 +1,31 @@
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from django.utils import timezone
-from rest_framework import filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
+from rest_framework.exceptions import NotFound
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter,
+    OpenApiResponse,
+)
 
-from apps.musics.models import Track, Like as TrackLike
-from apps.musics.models.stats import ListeningHistory
+from django.db.models import Prefetch
+from apps.musics.models import Genre, Track, Like as TrackLike
+from apps.musics.services.history import record_listen
+from apps.musics.services.likes import remember_like
+from apps.musics.services.plays import get_track_ref, record_play
+from apps.musics.api_endpoints.v1.viewer_state import ViewerStateMixin
+from .paginations import TrackPagination
 from .serializers import (
     TrackListSerializer,
     TrackDetailSerializer,
     TrackCreateUpdateSerializer,
 )
-from apps.shared.paginations.base import SmallResultsSetPagination
+from apps.shared.cache import ConditionalGetMixin
+from apps.shared.filters import FullTextSearchFilter, RelevanceOrderingFilter
 from apps.shared.permissions.base import IsOwnerOrReadOnly
 
 
@@ -60,27 +70,40 @@ from apps.shared.permissions.base import IsOwnerOrReadOnly
         responses={204: OpenApiResponse(description="Track successfully deleted")},
     ),
 )
-class TrackViewSet(ModelViewSet):
+class TrackViewSet(ViewerStateMixin, ConditionalGetMixin, ModelViewSet):
     queryset = Track.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        FullTextSearchFilter,
+        RelevanceOrderingFilter,
     ]
     lookup_field = "slug"
     filterset_fields = ["genres", "artist", "album"]
-    search_fields = ["name", "artist__name", "album__name"]
+    search_fields = ["search_key", "artist__search_key", "album__search_key"]
     ordering_fields = ["plays_count", "likes_count", "duration"]
     ordering = ["-plays_count"]
-    # pagination_class = SmallResultsSetPagination
+    pagination_class = TrackPagination
+    cache_tags = ("tracks", "artists", "albums", "genres", "counters:tracks")
+    stamp_fields = ("plays_count", "likes_count")
+    cache_per_user = True
+
+    def get_cache_tags(self, request):
+        tags = super().get_cache_tags(request)
+        if request.user.is_authenticated:
+            # is_liked в ответе — сбрасывается при лайке/дизлайке
+            tags.append(f"likes:{request.user.pk}")
+        return tags
 
     def get_queryset(self):
         qs = Track.objects.filter(is_published=True)
-        return qs.select_related("artist", "album").order_by("-plays_count")
+        # artist/album/genres сериализуются из кэша сводок (SummaryField) —
+        # из БД нужны только id жанров
+        genres = Prefetch("genres", queryset=Genre.objects.only("pk"))
+        return qs.prefetch_related(genres).order_by("-plays_count")
 
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action in ["list", "trending", "similar"]:
             return TrackListSerializer
         if self.action == "retrieve":
             return TrackDetailSerializer
@@ -92,31 +115,25 @@ class TrackViewSet(ModelViewSet):
         serializer.save(owner=self.request.user)
 
     def retrieve(self, request, *args, **kwargs):
-        track = self.get_object()
-
-        # Сохраняем историю прослушивания, если пользователь аутентифицирован
+        # Событие уходит в буфер, историю запишет flush_listening_events.
+        # id — из кэшированной ссылки, чтобы запись шла и при ответе из кэша
         if request.user.is_authenticated:
-            ListeningHistory.objects.update_or_create(
-                user=request.user,
-                track=track,
-                defaults={
-                    "listened_at": timezone.now(),
-                    # Можно передать duration или дополнительные поля
-                    # "duration": request.data.get("duration"),
-                    # "additional_info": {"device": "web", "source": "track_page"}
-                },
-            )
-
-        serializer = self.get_serializer(track)
-        return Response(serializer.data)
+            ref = get_track_ref(kwargs[self.lookup_field])
+            if ref is not None:
+                record_listen(request.user.pk, ref.track_id)
+        return super().retrieve(request, *args, **kwargs)
 
     @action(detail=True, methods=["post"], url_path="play")
     def play(self, request, slug=None):
-        track = self.get_object()
-        track.plays_count += 1
-        track.save(update_fields=["plays_count"])
-        serializer = self.get_serializer(track)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Не трогаем Postgres: событие уходит в буфер, счётчики обновит flush_play_events
+        ref = get_track_ref(slug)
+        if ref is None:
+            raise NotFound()
+        plays_count = record_play(ref)
+        return Response(
+            {"id": ref.track_id, "plays_count": plays_count, "status": "queued"},
+            status=status.HTTP_200_OK,
+        )
 
     @action(detail=True, methods=["post"], url_path="like")
     def like(self, request, slug=None):
@@ -132,18 +149,40 @@ class TrackViewSet(ModelViewSet):
         )
 
         if created:
+            track.increment_like()
             track.likes_count += 1
-            track.save(update_fields=["likes_count"])
             is_liked = True
         else:
             like_obj.delete()
+            track.decrement_like()
             track.likes_count -= 1
-            track.save(update_fields=["likes_count"])
             is_liked = False
+        remember_like(request.user.pk, track.pk, is_liked)
 
         serializer = self.get_serializer(track)
         data = serializer.data
         data["is_liked"] = is_liked
+        return Response(data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        tags=["Tracks"],
+        summary="Trending tracks",
+        description="Tracks with the most listens over the last `days` days (1-30).",
+        parameters=[OpenApiParameter("days", int, default=7)],
+        responses={200: TrackListSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"], url_path="trending")
+    def trending(self, request):
+        try:
+            days = min(max(int(request.query_params.get("days", 7)), 1), 30)
+        except ValueError:
+            days = 7
+        tracks = (
+            Track.objects.filter(is_published=True)
+            .trending(days)
+            .select_related("artist", "album")[:50]
+        )
+        serializer = self.get_serializer(tracks, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["get"], url_path="similar")
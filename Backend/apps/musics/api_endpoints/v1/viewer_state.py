@@ -0,0 +1,50 @@
+from rest_framework import serializers
+
+from apps.musics.services.likes import get_liked_track_ids, is_track_liked
+
+
+class ViewerStateMixin:
+    """
+    Для списков заранее вычисляет состояние текущего пользователя (лайки)
+    по всей странице и кладёт его в контекст сериализатора.
+    viewer_track_field — атрибут объекта с id трека ("pk" для Track,
+    "track_id" для Like/ListeningHistory).
+    """
+
+    viewer_track_field = "pk"
+
+    def get_viewer_track_field(self):
+        return self.viewer_track_field
+
+    def get_serializer(self, *args, **kwargs):
+        field = self.get_viewer_track_field()
+        if field and kwargs.get("many") and args:
+            objects = list(args[0])
+            args = (objects, *args[1:])
+            context = kwargs.setdefault("context", self.get_serializer_context())
+            context["liked_track_ids"] = get_liked_track_ids(
+                self.request.user,
+                [getattr(obj, field) for obj in objects],
+            )
+        return super().get_serializer(*args, **kwargs)
+
+
+class IsLikedField(serializers.BooleanField):
+    """is_liked трека: из контекста ViewerStateMixin, иначе отдельным запросом."""
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, track):
+        liked_ids = self.context.get("liked_track_ids")
+        if liked_ids is not None:
+            return track.pk in liked_ids
+        request = self.context.get("request")
+        if request is None:
+            return False
+        return is_track_liked(request.user, track.pk)
+
+
+__all__ = ["ViewerStateMixin", "IsLikedField"]
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.musics.services.collaborative import ITEM_NEIGHBORS_COUNT, compute_item_neighbors
+
+
+class Command(BaseCommand):
+    help = "Precompute item-to-item collaborative filtering neighbors from likes and listening history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-k", type=int, default=ITEM_NEIGHBORS_COUNT, help="Neighbors per track")
+
+    def handle(self, *args, **options):
+        computed = compute_item_neighbors(k=options["k"])
+        self.stdout.write(self.style.SUCCESS(f"Computed item neighbors for {computed} tracks"))
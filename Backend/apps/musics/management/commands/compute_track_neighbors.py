@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.musics.services.neighbors import NEIGHBORS_COUNT, compute_neighbors
+
+
+class Command(BaseCommand):
+    help = "Precompute top-K similar tracks (TrackNeighbors) from track features and co-listens."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-k", type=int, default=NEIGHBORS_COUNT, help="Neighbors per track")
+
+    def handle(self, *args, **options):
+        computed = compute_neighbors(k=options["k"])
+        self.stdout.write(self.style.SUCCESS(f"Computed neighbors for {computed} tracks"))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.musics.services import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage monthly partitions of the listening event log (PostgreSQL): "
+        "pre-create upcoming months and detach, archive or drop expired ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=3,
+            help="How many months ahead of the current one to pre-create",
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            help="Expire partitions older than this many months (nothing is expired if omitted)",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=["detach", "archive", "drop"],
+            default="detach",
+            help=f"What to do with expired partitions (archive moves them to the "
+            f"'{partitions.ARCHIVE_SCHEMA}' schema)",
+        )
+        parser.add_argument("--list", action="store_true", help="Only list partitions")
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            raise CommandError(
+                "Listening events table is not partitioned (PostgreSQL only, see migration 0015)."
+            )
+
+        if options["list"]:
+            for name, month in partitions.list_partitions():
+                self.stdout.write(f"{month:%Y-%m}  {name}")
+            return
+
+        created = partitions.ensure_partitions(months_ahead=options["ahead"])
+        for name in created:
+            self.stdout.write(self.style.SUCCESS(f"Created {name}"))
+
+        if options["retain_months"] is not None:
+            expired = partitions.expire_partitions(
+                options["retain_months"], mode=options["mode"]
+            )
+            done = {"detach": "Detached", "archive": "Archived", "drop": "Dropped"}[options["mode"]]
+            for name in expired:
+                self.stdout.write(self.style.SUCCESS(f"{done} {name}"))
+
+        if not created and options["retain_months"] is None:
+            self.stdout.write("Partitions are up to date.")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.musics.services.autocomplete import ENTITIES, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Redis prefix index used by search autocomplete."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--entities",
+            nargs="*",
+            choices=ENTITIES,
+            default=list(ENTITIES),
+            help="Only rebuild these entity types",
+        )
+
+    def handle(self, *args, **options):
+        for entity in options["entities"]:
+            indexed = rebuild(entity)
+            self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} {entity}"))
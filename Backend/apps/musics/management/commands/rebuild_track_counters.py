@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.musics.services.counters import rebuild_counters, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild Redis track counters (plays/likes/downloads) from Like and the listening event log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tracks", type=int, nargs="*", help="Only these track ids")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--reconcile",
+            action="store_true",
+            help="Write rebuilt values back to the database right away",
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_counters(
+            track_ids=options["tracks"], chunk_size=options["chunk_size"]
+        )
+        if not rebuilt:
+            self.stdout.write(
+                self.style.WARNING("Nothing rebuilt (no tracks or cache is not Redis).")
+            )
+            return
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counters for {rebuilt} tracks"))
+
+        if options["reconcile"]:
+            total = 0
+            while True:
+                reconciled = reconcile_counters()
+                if not reconciled:
+                    break
+                total += reconciled
+            self.stdout.write(self.style.SUCCESS(f"Reconciled {total} tracks"))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.musics.services.playlists import repair_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify denormalized playlist counters (tracks_count, total_duration, "
+        "followers_count) against the actual rows and repair mismatches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report mismatches; exit with an error if there are any",
+        )
+        parser.add_argument("--verbose-diff", action="store_true", help="Print every mismatch")
+
+    def handle(self, *args, **options):
+        mismatches = repair_counters(fix=not options["check"], chunk_size=options["chunk_size"])
+        if options["verbose_diff"]:
+            for playlist_id, diff in mismatches:
+                changes = ", ".join(
+                    f"{field} {stored} -> {actual}" for field, (stored, actual) in diff.items()
+                )
+                self.stdout.write(f"playlist {playlist_id}: {changes}")
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All playlist counters are consistent."))
+            return
+        if options["check"]:
+            raise CommandError(f"{len(mismatches)} playlists have inconsistent counters")
+        self.stdout.write(self.style.SUCCESS(f"Repaired counters of {len(mismatches)} playlists"))
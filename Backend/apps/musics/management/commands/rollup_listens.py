@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.musics.services.listens import (
+    MAX_HOURS_PER_RUN,
+    refresh_rolling_counts,
+    rollup_days,
+    rollup_hours,
+)
+
+
+class Command(BaseCommand):
+    help = "Roll up listens into hourly/daily tables. --backfill reads the listening event log instead of Redis."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Build hours from ListeningEvent (history from before the Redis buffer)",
+        )
+        parser.add_argument(
+            "--since-days",
+            type=int,
+            help="Re-roll hours starting this many days ago instead of the checkpoint",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since_days"] is not None:
+            since = timezone.now() - timedelta(days=options["since_days"])
+
+        total = 0
+        while True:
+            hours = rollup_hours(backfill=options["backfill"], since=since)
+            total += hours
+            since = None
+            if hours < MAX_HOURS_PER_RUN:
+                break
+        if not total:
+            self.stdout.write(self.style.WARNING("No closed hours to roll up."))
+            return
+
+        days = rollup_days()
+        refresh_rolling_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {total} hours and {days} days"))
@@ -1,8 +1,8 @@
 import random
 from datetime import timedelta
 
-from django.core.management.base import BaseCommand
-from django.db import transaction, IntegrityError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction, IntegrityError
 from django.utils.text import slugify
 from django.utils import timezone
 from django.apps import apps
@@ -10,9 +10,23 @@ from django.contrib.auth import get_user_model
 
 from faker import Faker
 
+from apps.musics.services.playlists import ORDER_GAP, refresh_counters
+from apps.shared.utils.text import fold
+
 fake = Faker()
 
 
+def unique_slug(name, seen):
+    """slug как в save() моделей: bulk_create его не вызывает."""
+    base = slugify(name) or "item"
+    slug, counter = base, 1
+    while slug in seen:
+        slug = f"{base}-{counter}"
+        counter += 1
+    seen.add(slug)
+    return slug
+
+
 class Command(BaseCommand):
     help = "Seed the musics app with fake data (users, artists, albums, tracks, playlists, likes, history)."
 
@@ -24,7 +38,25 @@ class Command(BaseCommand):
         parser.add_argument("--playlists", type=int, default=30)
         parser.add_argument("--likes", type=int, default=100)
         parser.add_argument("--history", type=int, default=200)
+        parser.add_argument("--playlist-tracks", type=int, default=10)
         parser.add_argument("--flush", action="store_true")
+        # Режим нагрузочных данных (apps.musics.services.seeding)
+        parser.add_argument(
+            "--high-volume",
+            action="store_true",
+            help="Stream rows via COPY (PostgreSQL) from a process pool; Zipf-distributed activity",
+        )
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=0,
+            help="Listening events to log (--high-volume only); plays_count follows them",
+        )
+        parser.add_argument("--chunk-size", type=int, default=100_000)
+        parser.add_argument("--workers", type=int, help="Generator processes (default: CPU count)")
+        parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of track popularity")
+        parser.add_argument("--days", type=int, default=90, help="Spread activity over this many days")
+        parser.add_argument("--seed", type=int, help="Random seed for reproducible data")
 
     def handle(self, *args, **options):
         artists_count = options["artists"]
@@ -37,12 +69,16 @@ class Command(BaseCommand):
         do_flush = options["flush"]
 
         self.stdout.write(self.style.MIGRATE_HEADING("Seeding musics app data..."))
+        if options["high_volume"]:
+            self.seed_high_volume(options)
+            return
 
         # Загружаем модели безопасно
         Artist = apps.get_model("musics", "Artist")
         Album = apps.get_model("musics", "Album")
         Track = apps.get_model("musics", "Track")
         Playlist = apps.get_model("musics", "Playlist")
+        Genre = apps.get_model("musics", "Genre")
 
         PlaylistTrack = None
         Like = None
@@ -87,19 +123,27 @@ class Command(BaseCommand):
             u.set_password("password")
             created_users.append(u)
 
-        User.objects.bulk_create(created_users)
-        users_qs = list(User.objects.order_by("-id")[:users_count])
+        # bulk_create проставляет pk (PostgreSQL, SQLite 3.35+) — перечитывать не нужно
+        users_qs = User.objects.bulk_create(created_users)
         self.stdout.write(self.style.SUCCESS(f"Created {len(users_qs)} users"))
 
         # ------------------------------
         # 2) Artists
         # ------------------------------
-        artists = [
-            Artist(name=fake.unique.company()[:200], bio=fake.text(max_nb_chars=200))
-            for _ in range(artists_count)
-        ]
-        Artist.objects.bulk_create(artists)
-        artists_qs = list(Artist.objects.order_by("-id")[:artists_count])
+        slugs = set(Artist.objects.values_list("slug", flat=True))
+        artists = []
+        for _ in range(artists_count):
+            name = fake.unique.company()[:200]
+            artists.append(
+                Artist(
+                    name=name,
+                    slug=unique_slug(name, slugs),
+                    search_key=fold(name),
+                    owner=random.choice(users_qs),
+                    bio=fake.text(max_nb_chars=200),
+                )
+            )
+        artists_qs = Artist.objects.bulk_create(artists)
         self.stdout.write(self.style.SUCCESS(f"Created {len(artists_qs)} artists"))
 
         # ------------------------------
@@ -112,16 +156,27 @@ class Command(BaseCommand):
             slug = slugify(title)[:200]
             release_date = fake.date_between(start_date="-5y", end_date="today")
             albums.append(
-                Album(name=title, artist=artist, release_date=release_date, slug=slug)
+                Album(
+                    name=title,
+                    artist=artist,
+                    owner=artist.owner,
+                    release_date=release_date,
+                    slug=slug,
+                    search_key=fold(title),
+                    is_published=True,
+                )
             )
-        Album.objects.bulk_create(albums)
-        albums_qs = list(Album.objects.order_by("-id")[:albums_count])
+        albums_qs = Album.objects.bulk_create(albums)
         self.stdout.write(self.style.SUCCESS(f"Created {len(albums_qs)} albums"))
 
         # ------------------------------
         # 4) Tracks
         # ------------------------------
-        genres = ["pop", "rock", "electronic", "hiphop", "jazz", "classical", "indie"]
+        genres = [
+            Genre.objects.get_or_create(name=name)[0]
+            for name in ["pop", "rock", "electronic", "hiphop", "jazz", "classical", "indie"]
+        ]
+        slugs = set(Track.objects.values_list("slug", flat=True))
         tracks = []
         for _ in range(tracks_count):
             artist = random.choice(artists_qs)
@@ -132,53 +187,74 @@ class Command(BaseCommand):
             )
             name = fake.sentence(nb_words=4).rstrip(".")[:200]
             duration = random.randint(60, 420)
-            genre = random.choice(genres)
             plays = random.randint(0, 5000)
             likes = random.randint(0, 1000)
             tracks.append(
                 Track(
                     name=name,
+                    slug=unique_slug(name, slugs),
+                    search_key=fold(name),
+                    owner=artist.owner,
                     artist=artist,
                     album=album,
                     duration=duration,
-                    genre=genre,
                     plays_count=plays,
                     likes_count=likes,
                     is_published=True,
                 )
             )
-        Track.objects.bulk_create(tracks)
-        tracks_qs = list(Track.objects.order_by("-id")[:tracks_count])
+        tracks_qs = Track.objects.bulk_create(tracks)
+        Track.genres.through.objects.bulk_create(
+            [
+                Track.genres.through(track_id=track.pk, genre_id=genre.pk)
+                for track in tracks_qs
+                for genre in random.sample(genres, k=random.randint(1, 2))
+            ]
+        )
         self.stdout.write(self.style.SUCCESS(f"Created {len(tracks_qs)} tracks"))
 
         # ------------------------------
         # 5) Playlists
         # ------------------------------
+        slugs = set(Playlist.objects.values_list("slug", flat=True))
         playlists = []
         for _ in range(playlists_count):
             owner = random.choice(users_qs)
             title = fake.sentence(nb_words=3).rstrip(".")[:200]
             playlists.append(
-                Playlist(name=title, owner=owner, is_public=random.random() > 0.3)
+                Playlist(
+                    name=title,
+                    slug=unique_slug(title, slugs),
+                    search_key=fold(title),
+                    owner=owner,
+                    is_public=random.random() > 0.3,
+                )
             )
-        Playlist.objects.bulk_create(playlists)
-        playlists_qs = list(Playlist.objects.order_by("-id")[:playlists_count])
+        playlists_qs = Playlist.objects.bulk_create(playlists)
         self.stdout.write(self.style.SUCCESS(f"Created {len(playlists_qs)} playlists"))
 
         # PlaylistTrack / ManyToMany
         if PlaylistTrack:
             pt_bulk = []
             for pl in playlists_qs:
-                sample_tracks = random.sample(tracks_qs, k=min(10, len(tracks_qs)))
+                sample_tracks = random.sample(
+                    tracks_qs, k=min(options["playlist_tracks"], len(tracks_qs))
+                )
                 for order_idx, t in enumerate(sample_tracks, start=1):
-                    pt_bulk.append(PlaylistTrack(playlist=pl, track=t, order=order_idx))
+                    pt_bulk.append(
+                        PlaylistTrack(playlist=pl, track=t, order=order_idx * ORDER_GAP)
+                    )
             PlaylistTrack.objects.bulk_create(pt_bulk)
+            # bulk_create мимо сигналов — счётчики плейлистов пересчитываем разом
+            refresh_counters(Playlist.objects.filter(pk__in=[pl.pk for pl in playlists_qs]))
             self.stdout.write(
                 self.style.SUCCESS(f"Created {len(pt_bulk)} playlist-track relations")
             )
         else:
             for pl in playlists_qs:
-                sample_tracks = random.sample(tracks_qs, k=min(10, len(tracks_qs)))
+                sample_tracks = random.sample(
+                    tracks_qs, k=min(options["playlist_tracks"], len(tracks_qs))
+                )
                 pl.tracks.add(*sample_tracks)
 
         # ------------------------------
@@ -209,9 +285,14 @@ class Command(BaseCommand):
         # ------------------------------
         if ListeningHistory:
             hist_bulk = []
+            seen = set()
             for _ in range(history_count):
                 user = random.choice(users_qs)
                 track = random.choice(tracks_qs)
+                # Одна запись истории на пару пользователь-трек
+                if (user.id, track.id) in seen:
+                    continue
+                seen.add((user.id, track.id))
                 listened_at = timezone.now() - timedelta(
                     days=random.randint(0, 90), minutes=random.randint(0, 1440)
                 )
@@ -224,20 +305,95 @@ class Command(BaseCommand):
                         duration=duration,
                     )
                 )
-            # bulk_create в маленьких пачках для избежания ошибок транзакции
-            batch_size = 50
-            for i in range(0, len(hist_bulk), batch_size):
-                with transaction.atomic():
-                    ListeningHistory.objects.bulk_create(hist_bulk[i : i + batch_size])
+            # Пары уже уникальны — одна транзакция, крупные пачки
+            with transaction.atomic():
+                ListeningHistory.objects.bulk_create(hist_bulk, batch_size=1000)
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Created {len(hist_bulk)} listening history records"
                 )
             )
 
+        # bulk_create не вызывает save(): поисковые индексы обновляем отдельно
+        from apps.musics.services.seeding import refresh_search_indexes
+
+        refresh_search_indexes(
+            {
+                model: (min(obj.pk for obj in objs), max(obj.pk for obj in objs))
+                for model, objs in ((Artist, artists_qs), (Album, albums_qs), (Track, tracks_qs))
+                if objs
+            },
+            log=lambda message: self.stdout.write(self.style.SUCCESS(message)),
+        )
         self.stdout.write(self.style.SUCCESS("Seeding completed."))
         self.stdout.write(
             self.style.WARNING(
                 "Default password for created users is 'password' — change it in production!"
             )
         )
+
+    def seed_high_volume(self, options):
+        from apps.musics.services.seeding import BulkSeeder
+
+        counts = {
+            name: options[name]
+            for name in (
+                "users",
+                "artists",
+                "albums",
+                "tracks",
+                "playlists",
+                "playlist_tracks",
+                "likes",
+                "history",
+                "events",
+            )
+        }
+        for name in ("users", "artists", "tracks"):
+            if counts[name] < 1:
+                raise CommandError(f"--high-volume needs at least one of --{name}")
+        if connection.vendor != "postgresql":
+            self.stdout.write(
+                self.style.WARNING("COPY needs PostgreSQL, falling back to executemany inserts.")
+            )
+        if options["flush"]:
+            self.stdout.write(self.style.WARNING("Flushing existing musics data..."))
+            self.flush_high_volume()
+
+        BulkSeeder(
+            counts,
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            zipf=options["zipf"],
+            days=options["days"],
+            seed=options["seed"],
+            log=lambda message: self.stdout.write(self.style.SUCCESS(message)),
+        ).run()
+        self.stdout.write(self.style.SUCCESS("Seeding completed."))
+        self.stdout.write(
+            self.style.WARNING(
+                "Counters were written to the database; run rebuild_track_counters "
+                "if live counters are kept in Redis. Default password is 'password'."
+            )
+        )
+
+    def flush_high_volume(self):
+        """Как --flush, но TRUNCATE на PostgreSQL: delete() по миллионам строк не дождаться."""
+        from apps.musics.models import (
+            Album,
+            Artist,
+            Like,
+            ListeningEvent,
+            ListeningHistory,
+            Playlist,
+            Track,
+        )
+
+        models = [ListeningEvent, ListeningHistory, Like, Playlist, Track, Album, Artist]
+        if connection.vendor != "postgresql":
+            for model in models:
+                model.objects.all().delete()
+            return
+        tables = ", ".join(connection.ops.quote_name(model._meta.db_table) for model in models)
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {tables} CASCADE")
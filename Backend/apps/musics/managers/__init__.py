@@ -1,2 +1,3 @@
+from .artist import *  # noqa
 from .playlist import *  # noqa
 from .track import *  # noqa
@@ -0,0 +1,51 @@
+from django.db import models
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+
+class ArtistQuerySet(models.QuerySet):
+    def with_counts(self):
+        """
+        albums_count / tracks_count — только опубликованные. Подзапросами,
+        а не Count по двум join'ам: тот перемножал бы альбомы на треки.
+        """
+        from apps.musics.models import Album, Track
+
+        return self.annotate(
+            albums_count=_published_count(Album),
+            tracks_count=_published_count(Track),
+        )
+
+    def with_catalog(self):
+        """Опубликованные альбомы с треками и треки артиста — одним набором prefetch."""
+        from apps.musics.models import Album, Genre, Track
+
+        # Жанры сериализуются из кэша сводок (SummaryField) — нужны только id
+        tracks = Track.objects.filter(is_published=True).prefetch_related(
+            Prefetch("genres", queryset=Genre.objects.only("pk"))
+        )
+        albums = Album.objects.filter(is_published=True).prefetch_related(
+            Prefetch("tracks", queryset=tracks)
+        )
+        return self.prefetch_related(
+            Prefetch("albums", queryset=albums),
+            Prefetch("tracks", queryset=tracks),
+        )
+
+
+class ArtistManager(models.Manager.from_queryset(ArtistQuerySet)):
+    pass
+
+
+def _published_count(model):
+    published = (
+        model.objects.filter(artist=OuterRef("pk"), is_published=True)
+        .order_by()
+        .values("artist")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(published), 0)
+
+
+__all__ = ["ArtistQuerySet", "ArtistManager"]
@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models import Q
+from django.db.models import Sum
 from django.utils import timezone
 
 
@@ -11,13 +11,23 @@ class TrackQuerySet(models.QuerySet):
             return qs.filter(created_at__gte=since)
         return qs
 
+    def trending(self, days=7):
+        """Сортировка по прослушиваниям за последние days дней из дневных свёрток"""
+        since = timezone.now().date() - timezone.timedelta(days=days - 1)
+        return (
+            self.filter(daily_listens__day__gte=since)
+            .annotate(recent_plays=Sum("daily_listens__plays"))
+            .order_by("-recent_plays", "-pk")
+        )
+
     def by_genre(self, genre):
         return self.filter(genres__name__iexact=genre)
 
     def search(self, q):
-        return self.filter(
-            Q(name__icontains=q) | Q(artist__name__icontains=q) | Q(album__icontains=q)
-        )
+        """Полнотекстовый поиск с ранжированием (см. services.search)"""
+        from apps.musics.services.search import search
+
+        return search(self, q)
 
     def with_artist_album(self):
         return self.select_related("artist", "album")
@@ -30,21 +40,32 @@ class TrackManager(models.Manager):
     def popular(self, *args, **kwargs):
         return self.get_queryset().popular(*args, **kwargs)
 
+    def trending(self, *args, **kwargs):
+        return self.get_queryset().trending(*args, **kwargs)
+
     def search(self, q):
         return self.get_queryset().search(q)
 
     def get_similar_tracks(self, track, limit=10):
         """
-        Возвращает похожие треки по жанру или артисту
+        Похожие треки из заранее посчитанных соседей (TrackNeighbors,
+        services.neighbors): поиск по первичному ключу + in_bulk.
+        Пока соседи не посчитаны — популярные треки того же артиста.
         """
-        return (
-            self.get_queryset()
-            .filter(
-                Q(genres__in=track.genres.all()) | Q(artist=track.artist),
-                is_published=True,
-            )
-            .exclude(pk=track.pk)
-            .distinct()
-            .order_by("-plays_count")[:limit]
+        from apps.musics.models import TrackNeighbors
+
+        neighbor_ids = (
+            TrackNeighbors.objects.filter(track_id=track.pk)
+            .values_list("neighbor_ids", flat=True)
+            .first()
         )
+        queryset = self.get_queryset().filter(is_published=True).with_artist_album()
+        if not neighbor_ids:
+            return list(
+                queryset.filter(artist_id=track.artist_id)
+                .exclude(pk=track.pk)
+                .order_by("-plays_count")[:limit]
+            )
+        found = queryset.in_bulk(neighbor_ids[: limit * 2])
+        return [found[pk] for pk in neighbor_ids if pk in found][:limit]
 
@@ -0,0 +1,177 @@
+# Generated by Django 5.0.8 on 2026-10-18 16:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0012_alter_playlist_options_alter_playlisttrack_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("position", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Rollup checkpoint",
+                "verbose_name_plural": "Rollup checkpoints",
+                "db_table": "musics_rollup_checkpoints",
+            },
+        ),
+        migrations.AddField(
+            model_name="artist",
+            name="listens_last_month",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="artist",
+            name="listens_last_week",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="track",
+            name="listens_last_month",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="track",
+            name="listens_last_week",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="album",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+        ),
+        migrations.AlterField(
+            model_name="album",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+        ),
+        migrations.CreateModel(
+            name="TrackListenDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Day")),
+                ("plays", models.BigIntegerField(default=0)),
+                (
+                    "album",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="daily_listens",
+                        to="musics.album",
+                    ),
+                ),
+                (
+                    "artist",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_listens",
+                        to="musics.artist",
+                    ),
+                ),
+                (
+                    "track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_listens",
+                        to="musics.track",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily listens",
+                "verbose_name_plural": "Daily listens",
+                "db_table": "musics_track_listens_daily",
+                "indexes": [
+                    models.Index(
+                        fields=["day", "track"], name="musics_trac_day_890d63_idx"
+                    ),
+                    models.Index(
+                        fields=["day", "album"], name="musics_trac_day_c8021a_idx"
+                    ),
+                    models.Index(
+                        fields=["day", "artist"], name="musics_trac_day_2fad61_idx"
+                    ),
+                ],
+                "unique_together": {("track", "day")},
+            },
+        ),
+        migrations.CreateModel(
+            name="TrackListenHourly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField(verbose_name="Hour")),
+                ("plays", models.BigIntegerField(default=0)),
+                (
+                    "album",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="musics.album",
+                    ),
+                ),
+                (
+                    "artist",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="musics.artist",
+                    ),
+                ),
+                (
+                    "track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="hourly_listens",
+                        to="musics.track",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Hourly listens",
+                "verbose_name_plural": "Hourly listens",
+                "db_table": "musics_track_listens_hourly",
+                "indexes": [
+                    models.Index(
+                        fields=["bucket"], name="musics_trac_bucket_e96c6a_idx"
+                    )
+                ],
+                "unique_together": {("track", "bucket")},
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.0.8 on 2026-10-18 16:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0013_track_listen_rollups"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="listeninghistory",
+            name="listened_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name="ListeningEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "listened_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "duration",
+                    models.PositiveIntegerField(
+                        blank=True, help_text="how many seconds listened", null=True
+                    ),
+                ),
+                ("additional_info", models.JSONField(blank=True, default=dict)),
+                (
+                    "track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listening_events",
+                        to="musics.track",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listening_events",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "musics_listening_events",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "listened_at"],
+                        name="musics_list_user_id_93556f_idx",
+                    ),
+                    models.Index(
+                        fields=["track", "listened_at"],
+                        name="musics_list_track_i_612d8d_idx",
+                    ),
+                    models.Index(
+                        fields=["listened_at"], name="musics_list_listene_d8ba9e_idx"
+                    ),
+                ],
+            },
+        ),
+        # Существующие записи истории становятся первыми событиями журнала
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO musics_listening_events
+                    (user_id, track_id, listened_at, duration, additional_info)
+                SELECT user_id, track_id, listened_at, duration, additional_info
+                FROM musics_listening_history
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,88 @@
+from datetime import date
+
+from django.db import migrations
+
+TABLE = "musics_listening_events"
+LEGACY_TABLE = f"{TABLE}_legacy"
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_listening_events(apps, schema_editor):
+    """
+    Переводит журнал прослушиваний в PARTITION BY RANGE (listened_at) по месяцам.
+    Только PostgreSQL: первичный ключ становится (id, listened_at), как того
+    требуют партиции, id берётся из обычной последовательности.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    Event = apps.get_model("musics", "ListeningEvent")
+    execute = schema_editor.execute
+
+    execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+    execute(
+        f"CREATE TABLE {TABLE} (LIKE {LEGACY_TABLE} INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (listened_at)"
+    )
+    execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT MIN(listened_at AT TIME ZONE 'UTC')::date FROM {LEGACY_TABLE}"
+        )
+        first_day = cursor.fetchone()[0]
+        cursor.execute("SELECT (NOW() AT TIME ZONE 'UTC')::date")
+        today = cursor.fetchone()[0]
+
+    month = (first_day or today).replace(day=1)
+    last_month = _add_months(today.replace(day=1), MONTHS_AHEAD)
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        execute(
+            f"CREATE TABLE {TABLE}_y{month.year:04d}m{month.month:02d} "
+            f"PARTITION OF {TABLE} FOR VALUES FROM ('{month} 00:00:00+00') "
+            f"TO ('{next_month} 00:00:00+00')"
+        )
+        month = next_month
+
+    execute(
+        f"INSERT INTO {TABLE} (id, user_id, track_id, listened_at, duration, additional_info) "
+        f"SELECT id, user_id, track_id, listened_at, duration, additional_info "
+        f"FROM {LEGACY_TABLE}"
+    )
+    # Вместе с таблицей уходят её индексы и identity-последовательность,
+    # так что имена ниже совпадают с теми, что создал бы Django
+    execute(f"DROP TABLE {LEGACY_TABLE}")
+
+    execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+    execute(
+        f"SELECT setval('{TABLE}_id_seq', COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+    )
+    execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, listened_at)")
+
+    for name in ("user", "track"):
+        field = Event._meta.get_field(name)
+        execute(schema_editor._create_fk_sql(Event, field, "_fk_%(to_table)s_%(to_column)s"))
+        for statement in schema_editor._field_indexes_sql(Event, field):
+            execute(statement)
+    for index in Event._meta.indexes:
+        schema_editor.add_index(Event, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0014_listening_events"),
+    ]
+
+    operations = [
+        # Обратно не переводим: партиционированная таблица работает так же,
+        # а откат 0014 удаляет её целиком
+        migrations.RunPython(partition_listening_events, migrations.RunPython.noop),
+    ]
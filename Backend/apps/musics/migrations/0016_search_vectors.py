@@ -0,0 +1,88 @@
+# Generated by Django 5.0.8 on 2026-10-18 16:51
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+TABLES = ("musics_tracks", "musics_artists", "musics_albums")
+
+
+def _weighted(expression, weight):
+    return f"setweight(to_tsvector('simple', coalesce({expression}, '')), '{weight}')"
+
+
+# Те же веса, что и в apps.musics.services.search.build_vector
+BACKFILL = {
+    "musics_tracks": " || ".join(
+        [
+            _weighted("t.name", "A"),
+            _weighted("(SELECT name FROM musics_artists WHERE id = t.artist_id)", "B"),
+            _weighted("(SELECT name FROM musics_albums WHERE id = t.album_id)", "C"),
+            _weighted("t.lyrics", "D"),
+        ]
+    ),
+    "musics_albums": " || ".join(
+        [
+            _weighted("t.name", "A"),
+            _weighted("(SELECT name FROM musics_artists WHERE id = t.artist_id)", "B"),
+            _weighted("t.description", "D"),
+        ]
+    ),
+    "musics_artists": " || ".join([_weighted("t.name", "A"), _weighted("t.bio", "D")]),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    """GIN по search_vector и триграммный GIN по name, затем заполнение векторов (PostgreSQL)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in TABLES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_name_trgm "
+            f"ON {table} USING gin (name gin_trgm_ops)"
+        )
+        schema_editor.execute(f"UPDATE {table} AS t SET search_vector = {BACKFILL[table]}")
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in TABLES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_gin")
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0015_partition_listening_events"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="album",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="artist",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="track",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,141 @@
+# Generated by Django 5.0.8 on 2026-10-18 16:57
+
+from django.db import migrations, models
+
+MODELS = ("Track", "Album", "Artist", "Playlist")
+TABLES = ("musics_tracks", "musics_artists", "musics_albums", "musics_playlists")
+CHUNK_SIZE = 2000
+
+
+def _named(expression):
+    return f"coalesce({expression}.name, '') || ' ' || coalesce({expression}.search_key, '')"
+
+
+def _weighted(expression, weight):
+    return f"setweight(to_tsvector('simple', coalesce({expression}, '')), '{weight}')"
+
+
+def _related(table, fk):
+    return f"(SELECT {_named('r')} FROM {table} AS r WHERE r.id = t.{fk})"
+
+
+# Векторы теперь включают search_key (см. apps.musics.services.search.build_vector)
+VECTORS = {
+    "musics_tracks": " || ".join(
+        [
+            _weighted(_named("t"), "A"),
+            _weighted(_related("musics_artists", "artist_id"), "B"),
+            _weighted(_related("musics_albums", "album_id"), "C"),
+            _weighted("t.lyrics", "D"),
+        ]
+    ),
+    "musics_albums": " || ".join(
+        [
+            _weighted(_named("t"), "A"),
+            _weighted(_related("musics_artists", "artist_id"), "B"),
+            _weighted("t.description", "D"),
+        ]
+    ),
+    "musics_artists": " || ".join([_weighted(_named("t"), "A"), _weighted("t.bio", "D")]),
+}
+
+
+def fill_search_keys(apps, schema_editor):
+    from apps.shared.utils.text import fold
+
+    for model_name in MODELS:
+        model = apps.get_model("musics", model_name)
+        last_pk = 0
+        while True:
+            rows = list(
+                model.objects.filter(pk__gt=last_pk).order_by("pk").only("pk", "name")[:CHUNK_SIZE]
+            )
+            if not rows:
+                break
+            for row in rows:
+                row.search_key = fold(row.name)[:255]
+            model.objects.bulk_update(rows, ["search_key"])
+            last_pk = rows[-1].pk
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in TABLES:
+        # Триграммы теперь по search_key, индекс по name больше не нужен
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_name_trgm")
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_search_key_trgm "
+            f"ON {table} USING gin (search_key gin_trgm_ops)"
+        )
+    for table, vector in VECTORS.items():
+        schema_editor.execute(f"UPDATE {table} AS t SET search_vector = {vector}")
+
+
+def drop_search_key_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in TABLES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_key_trgm")
+        if table != "musics_playlists":
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_name_trgm "
+                f"ON {table} USING gin (name gin_trgm_ops)"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0016_search_vectors"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="album",
+            name="search_key",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="Search key",
+            ),
+        ),
+        migrations.AddField(
+            model_name="artist",
+            name="search_key",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="Search key",
+            ),
+        ),
+        migrations.AddField(
+            model_name="playlist",
+            name="search_key",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="Search key",
+            ),
+        ),
+        migrations.AddField(
+            model_name="track",
+            name="search_key",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=255,
+                verbose_name="Search key",
+            ),
+        ),
+        migrations.RunPython(fill_search_keys, drop_search_key_indexes),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.8 on 2026-10-18 17:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0017_search_keys"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrackNeighbors",
+            fields=[
+                (
+                    "track",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="neighbors",
+                        serialize=False,
+                        to="musics.track",
+                    ),
+                ),
+                ("neighbor_ids", models.JSONField(default=list)),
+                ("scores", models.JSONField(default=list)),
+                ("computed_at", models.DateTimeField(verbose_name="Computed at")),
+            ],
+            options={
+                "verbose_name": "Track neighbors",
+                "verbose_name_plural": "Track neighbors",
+                "db_table": "musics_track_neighbors",
+            },
+        ),
+    ]
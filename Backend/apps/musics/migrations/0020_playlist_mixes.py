@@ -0,0 +1,52 @@
+# Generated by Django 5.0.8 on 2026-10-18 17:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0019_track_item_neighbors"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="playlist",
+            name="generated_for",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="mixes",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Generated for",
+            ),
+        ),
+        migrations.AddField(
+            model_name="playlist",
+            name="kind",
+            field=models.CharField(
+                choices=[("user", "User playlist"), ("daily_mix", "Daily mix")],
+                db_index=True,
+                default="user",
+                max_length=20,
+                verbose_name="Kind",
+            ),
+        ),
+        migrations.AddField(
+            model_name="playlist",
+            name="mix_index",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="playlist",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("generated_for__isnull", False)),
+                fields=("generated_for", "kind", "mix_index"),
+                name="unique_mix_per_user",
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.8 on 2026-10-18 18:07
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def _count_for_playlist(queryset, aggregate):
+    return Coalesce(
+        Subquery(
+            queryset.filter(playlist=OuterRef("pk"))
+            .order_by()
+            .values("playlist")
+            .annotate(value=aggregate)
+            .values("value")
+        ),
+        0,
+    )
+
+
+def fill_counters(apps, schema_editor):
+    """Начальные значения счётчиков (дальше их ведут сигналы, см. services.playlists)."""
+    Playlist = apps.get_model("musics", "Playlist")
+    PlaylistTrack = apps.get_model("musics", "PlaylistTrack")
+    Playlist.objects.update(
+        tracks_count=_count_for_playlist(PlaylistTrack.objects.all(), Count("pk")),
+        total_duration=_count_for_playlist(
+            PlaylistTrack.objects.filter(track__is_published=True), Sum("track__duration")
+        ),
+        followers_count=_count_for_playlist(
+            Playlist.followers.through.objects.all(), Count("pk")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0020_playlist_mixes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="playlist",
+            name="followers_count",
+            field=models.PositiveIntegerField(
+                db_index=True, default=0, verbose_name="Followers count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="playlist",
+            name="tracks_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Tracks count"),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -4,3 +4,5 @@ from .playlist import *  # noqa
 from .stats import *  # noqa
 from .track import *  # noqa
 from .genres import *  # noqa
+from .listens import *  # noqa
+from .recommendations import *  # noqa
@@ -1,8 +1,8 @@
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.conf import settings
-from django.core.cache import cache
 from apps.shared.models.base import NamedModel
 from .artist import Artist
 
@@ -43,6 +43,8 @@ class Album(NamedModel):
     listens_last_week = models.BigIntegerField(default=0)
     listens_last_month = models.BigIntegerField(default=0)
 
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         db_table = "musics_albums"
         indexes = [
@@ -69,12 +71,13 @@ class Album(NamedModel):
     # --- Количество треков ---
     @property
     def tracks_count(self):
-        cache_key = f"album_{self.id}_tracks_count"
-        count = cache.get(cache_key)
-        if count is None:
-            count = self.tracks.filter(is_published=True).count()
-            cache.set(cache_key, count, timeout=60)
-        return count
+        from apps.shared.cache import get_or_refresh
+
+        return get_or_refresh(
+            f"album_{self.id}_tracks_count",
+            lambda: self.tracks.filter(is_published=True).count(),
+            ttl=60,
+        )
 
     # --- Оптимизированный список треков ---
     def get_tracks(self):
@@ -83,12 +86,21 @@ class Album(NamedModel):
     # --- Топовые альбомы по прослушиваниям ---
     @classmethod
     def get_top_albums(cls, limit=10):
-        key = f"top_albums_{limit}"
-        albums = cache.get(key)
-        if albums is None:
-            albums = list(cls.objects.filter(is_published=True).order_by("-plays_count")[:limit])
-            cache.set(key, albums, timeout=60)
-        return albums
+        from apps.musics.services import leaderboards
+
+        albums = leaderboards.top_objects(
+            "albums", cls.objects.filter(is_published=True), limit=limit
+        )
+        if albums is not None:
+            return albums
+
+        from apps.shared.cache import get_or_refresh
+
+        return get_or_refresh(
+            f"top_albums_{limit}",
+            lambda: list(cls.objects.filter(is_published=True).order_by("-plays_count")[:limit]),
+            ttl=60,
+        )
 
     def __str__(self):
         return f"{self.name} — {self.artist.name}"
@@ -2,8 +2,10 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 from django.conf import settings
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.core.cache import cache
 from apps.shared.models.base import NamedModel
+from apps.musics.managers.artist import ArtistManager
 
 
 class Artist(NamedModel):
@@ -34,9 +36,15 @@ class Artist(NamedModel):
     followers_count = models.PositiveIntegerField(default=0, db_index=True)
     total_plays = models.BigIntegerField(default=0, db_index=True)
     total_likes = models.BigIntegerField(default=0, db_index=True)
+    listens_last_week = models.BigIntegerField(default=0)
+    listens_last_month = models.BigIntegerField(default=0)
 
     is_verified = models.BooleanField(default=False, verbose_name=_("Verified artist"))
-    
+
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ArtistManager()
+
     class Meta:
         db_table = "musics_artists"
         indexes = [
@@ -62,6 +70,17 @@ class Artist(NamedModel):
     # --- Кэш популярных артистов ---
     @classmethod
     def get_top_artists(cls, limit=10):
+        from apps.musics.services import leaderboards
+
+        artists = leaderboards.top_objects(
+            "artists",
+            cls.objects.filter(is_verified=True),
+            limit=limit,
+            tiebreak="-followers_count",
+        )
+        if artists is not None:
+            return artists
+
         cache_key = f"top_artists_{limit}"
         artists = cache.get(cache_key)
         if artists is None:
@@ -0,0 +1,82 @@
+from django.utils.translation import gettext_lazy as _
+from django.db import models
+from .album import Album
+from .artist import Artist
+from .track import Track
+
+
+class TrackListenHourly(models.Model):
+    """Прослушивания трека за час (корзина — начало часа, UTC)"""
+
+    track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="hourly_listens"
+    )
+    # Денормализовано, чтобы агрегировать альбомы и артистов без JOIN
+    album = models.ForeignKey(
+        Album, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    artist = models.ForeignKey(Artist, on_delete=models.CASCADE, related_name="+")
+    bucket = models.DateTimeField(verbose_name=_("Hour"))
+    plays = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "musics_track_listens_hourly"
+        unique_together = (("track", "bucket"),)
+        indexes = [
+            models.Index(fields=["bucket"]),
+        ]
+        verbose_name = _("Hourly listens")
+        verbose_name_plural = _("Hourly listens")
+
+    def __str__(self):
+        return f"{self.track_id} @ {self.bucket:%Y-%m-%d %H}:00 — {self.plays}"
+
+
+class TrackListenDaily(models.Model):
+    """Прослушивания трека за день (UTC), собирается из почасовых строк"""
+
+    track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="daily_listens"
+    )
+    album = models.ForeignKey(
+        Album,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="daily_listens",
+    )
+    artist = models.ForeignKey(
+        Artist, on_delete=models.CASCADE, related_name="daily_listens"
+    )
+    day = models.DateField(verbose_name=_("Day"))
+    plays = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "musics_track_listens_daily"
+        unique_together = (("track", "day"),)
+        indexes = [
+            models.Index(fields=["day", "track"]),
+            models.Index(fields=["day", "album"]),
+            models.Index(fields=["day", "artist"]),
+        ]
+        verbose_name = _("Daily listens")
+        verbose_name_plural = _("Daily listens")
+
+    def __str__(self):
+        return f"{self.track_id} @ {self.day} — {self.plays}"
+
+
+class RollupCheckpoint(models.Model):
+    """До какого момента уже свёрнуты данные (чтобы задачи брали только новые корзины)"""
+
+    name = models.CharField(max_length=50, unique=True)
+    position = models.DateTimeField()
+
+    class Meta:
+        db_table = "musics_rollup_checkpoints"
+        verbose_name = _("Rollup checkpoint")
+        verbose_name_plural = _("Rollup checkpoints")
+
+    def __str__(self):
+        return f"{self.name}: {self.position}"
+
@@ -1,6 +1,6 @@
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
 
@@ -10,6 +10,10 @@ from apps.musics.managers.playlist import PlayListManager
 
 
 class Playlist(NamedModel):
+    class KindChoices(models.TextChoices):
+        USER = "user", _("User playlist")
+        DAILY_MIX = "daily_mix", _("Daily mix")
+
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -41,12 +45,37 @@ class Playlist(NamedModel):
         blank=True,
         verbose_name=_("Followers"),
     )
+    # Денормализованные счётчики: ведутся инкрементально при изменении
+    # PlaylistTrack и подписчиков (signals.playlists), сверка и починка —
+    # команда repair_playlist_counters
     total_duration = models.PositiveIntegerField(
         verbose_name=_("Total Duration (seconds)"),
         default=0,
         help_text=_("Calculated automatically based on tracks duration."),
     )
-    
+    tracks_count = models.PositiveIntegerField(verbose_name=_("Tracks count"), default=0)
+    followers_count = models.PositiveIntegerField(
+        verbose_name=_("Followers count"), default=0, db_index=True
+    )
+    # Системные подборки (services.mixes): владелец — системный пользователь,
+    # generated_for — для кого собрана, mix_index — номер подборки у пользователя
+    kind = models.CharField(
+        verbose_name=_("Kind"),
+        max_length=20,
+        choices=KindChoices.choices,
+        default=KindChoices.USER.value,
+        db_index=True,
+    )
+    generated_for = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="mixes",
+        verbose_name=_("Generated for"),
+    )
+    mix_index = models.PositiveSmallIntegerField(null=True, blank=True)
+
     objects = PlayListManager()
 
     class Meta:
@@ -55,6 +84,13 @@ class Playlist(NamedModel):
             models.Index(fields=["owner", "is_public"]),
             models.Index(fields=["slug"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["generated_for", "kind", "mix_index"],
+                condition=models.Q(generated_for__isnull=False),
+                name="unique_mix_per_user",
+            )
+        ]
         verbose_name = _("Playlist")
         verbose_name_plural = _("Playlists")
         ordering = ["-updated_at"]
@@ -70,31 +106,10 @@ class Playlist(NamedModel):
             self.slug = slug
         super().save(*args, **kwargs)
 
-    def update_total_duration(self):
-        """Рассчитать и обновить общую длительность треков."""
-        duration = (
-            self.tracks.filter(is_published=True)
-            .aggregate(models.Sum("duration"))
-            .get("duration__sum")
-            or 0
-        )
-        self.total_duration = duration
-        self.save(update_fields=["total_duration"])
-
-    @property
-    def tracks_count(self):
-        """Количество треков в плейлисте."""
-        return self.tracks.count()
-
-    @property
-    def followers_count(self):
-        """Количество подписчиков."""
-        return self.followers.count()
-
     @property
     def is_empty(self):
         """Проверка, пуст ли плейлист."""
-        return not self.tracks.exists()
+        return self.tracks_count == 0
 
     def __str__(self):
         return f"{self.name} — {self.owner.username}"
@@ -121,6 +136,11 @@ class PlaylistTrack(models.Model):
         related_name="added_tracks",
     )
 
+    def save(self, *args, **kwargs):
+        # post_save обновляет счётчики плейлиста — в той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         db_table = "musics_playlist_tracks"
         unique_together = (("playlist", "track"),)
@@ -0,0 +1,53 @@
+from django.utils.translation import gettext_lazy as _
+from django.db import models
+from .track import Track
+
+
+class TrackNeighbors(models.Model):
+    """
+    Заранее посчитанные ближайшие треки (services.neighbors): одна строка
+    на трек, id соседей и их сходство — массивами по убыванию сходства.
+    """
+
+    track = models.OneToOneField(
+        Track,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="neighbors",
+    )
+    neighbor_ids = models.JSONField(default=list)
+    scores = models.JSONField(default=list)
+    computed_at = models.DateTimeField(verbose_name=_("Computed at"))
+
+    class Meta:
+        db_table = "musics_track_neighbors"
+        verbose_name = _("Track neighbors")
+        verbose_name_plural = _("Track neighbors")
+
+    def __str__(self):
+        return f"{self.track_id}: {len(self.neighbor_ids)} neighbors"
+
+
+class TrackItemNeighbors(models.Model):
+    """
+    Соседи трека по совместным лайкам/прослушиваниям (item-item CF,
+    services.collaborative). Формат тот же, что у TrackNeighbors.
+    """
+
+    track = models.OneToOneField(
+        Track,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="item_neighbors",
+    )
+    neighbor_ids = models.JSONField(default=list)
+    scores = models.JSONField(default=list)
+    computed_at = models.DateTimeField(verbose_name=_("Computed at"))
+
+    class Meta:
+        db_table = "musics_track_item_neighbors"
+        verbose_name = _("Track item neighbors")
+        verbose_name_plural = _("Track item neighbors")
+
+    def __str__(self):
+        return f"{self.track_id}: {len(self.neighbor_ids)} neighbors"
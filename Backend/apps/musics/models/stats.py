@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from .track import Track
 
 
@@ -31,7 +32,8 @@ class ListeningHistory(models.Model):
     track = models.ForeignKey(
         Track, on_delete=models.CASCADE, related_name="listened_by"
     )
-    listened_at = models.DateTimeField(auto_now=True)
+    # Время последнего прослушивания: переносится из ListeningEvent при сбросе буфера
+    listened_at = models.DateTimeField(default=timezone.now)
     duration = models.PositiveIntegerField(
         null=True, blank=True, help_text="how many seconds listened"
     )
@@ -51,3 +53,35 @@ class ListeningHistory(models.Model):
 
     def __str__(self):
         return f"{self.user} listened to {self.track} at {self.listened_at}"
+
+
+class ListeningEvent(models.Model):
+    """
+    Журнал прослушиваний (только вставки). Пишется пачками через
+    services.history, ListeningHistory — производное "последнее прослушивание".
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="listening_events",
+    )
+    track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="listening_events"
+    )
+    listened_at = models.DateTimeField(default=timezone.now)
+    duration = models.PositiveIntegerField(
+        null=True, blank=True, help_text="how many seconds listened"
+    )
+    additional_info = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        db_table = "musics_listening_events"
+        indexes = [
+            models.Index(fields=["user", "listened_at"]),
+            models.Index(fields=["track", "listened_at"]),
+            models.Index(fields=["listened_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} listened to {self.track_id} at {self.listened_at}"
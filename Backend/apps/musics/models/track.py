@@ -1,7 +1,9 @@
+from functools import partial
+
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 from django.db import models
-from django.db.models import F
+from django.contrib.postgres.search import SearchVectorField
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from apps.shared.models.base import NamedModel
@@ -9,7 +11,6 @@ from .artist import Artist
 from .album import Album
 from .genres import Genre
 from apps.musics.managers.track import TrackManager
-from django.core.cache import cache
 
 
 class Track(NamedModel):
@@ -64,6 +65,9 @@ class Track(NamedModel):
     download_count = models.BigIntegerField(
         verbose_name=_("Download Count"), default=0
     )
+    # Скользящие окна, пересчитываются из дневных свёрток (services.listens)
+    listens_last_week = models.BigIntegerField(default=0)
+    listens_last_month = models.BigIntegerField(default=0)
 
     is_explicit = models.BooleanField(verbose_name=_("Explicit Content"), default=False)
     lyrics = models.TextField(verbose_name=_("Lyrics"), blank=True, null=True)
@@ -83,6 +87,9 @@ class Track(NamedModel):
 
     is_published = models.BooleanField(verbose_name=_("Is published"), default=True, db_index=True)
 
+    # name (A) > артист (B) > альбом (C) > текст песни (D), см. services.search
+    search_vector = SearchVectorField(null=True, editable=False)
+
     objects = TrackManager()
 
     class Meta:
@@ -104,6 +111,9 @@ class Track(NamedModel):
         return f"{self.name} — {self.artist.name}"
 
     def save(self, *args, **kwargs):
+        from apps.musics.services.plays import forget_track_ref
+
+        previous_slug = self.loaded_value("slug")
         if not self.slug:
             base_slug = slugify(self.name)
             slug = base_slug
@@ -113,47 +123,94 @@ class Track(NamedModel):
                 counter += 1
             self.slug = slug
         super().save(*args, **kwargs)
+        # Ссылка для play() могла устареть: трек сняли с публикации или сменили slug
+        forget_track_ref(self.slug, previous_slug)
 
+    # --- Счётчики живут в Redis (services.counters), колонки догоняют по расписанию ---
     def increment_play(self):
-        Track.objects.filter(id=self.id).update(plays_count=F("plays_count") + 1)
-        cache.delete(f"track_{self.id}_stats")
+        from apps.musics.services import counters
+
+        counters.incr(self.id, "plays")
 
     def increment_like(self):
-        Track.objects.filter(id=self.id).update(likes_count=F("likes_count") + 1)
-        cache.delete(f"track_{self.id}_stats")
-    
+        self._change_likes(1)
+
+    def decrement_like(self):
+        self._change_likes(-1)
+
+    def _change_likes(self, delta):
+        from apps.musics.services import counters, leaderboards
+
+        counters.incr(self.id, "likes", delta)
+        leaderboards.record(
+            "likes",
+            {self.id: delta},
+            {self.album_id: delta} if self.album_id else {},
+            {self.artist_id: delta},
+        )
+
     def increment_download(self):
-        Track.objects.filter(id=self.id).update(download_count=F("download_count") + 1)
+        from apps.musics.services import counters
+
+        counters.incr(self.id, "downloads")
 
     @property
     def stats(self):
-        """Возвращает данные о треке с кэшем."""
-        key = f"track_{self.id}_stats"
-        data = cache.get(key)
-        if data is None:
-            data = {
-                "plays": self.plays_count,
-                "likes": self.likes_count,
-                "downloads": self.download_count,
+        """Возвращает данные о треке: живые счётчики из Redis или кэш колонок."""
+        from apps.musics.services import counters
+
+        live = counters.get_counts([self.id]).get(self.id)
+        if live is not None:
+            return {
+                **live,
                 "duration": self.duration,
                 "album": self.album_name,
             }
-            cache.set(key, data, timeout=30)
-        return data
+
+        from apps.shared.cache import get_or_refresh
+
+        # Пересчёт может уйти в фон и пережить этот экземпляр — читаем из БД
+        return get_or_refresh(
+            f"track_{self.id}_stats", partial(Track.load_stats, self.id), ttl=30
+        )
+
+    @staticmethod
+    def load_stats(track_id):
+        """Счётчики трека из колонок БД (для кэша stats)."""
+        row = (
+            Track.objects.filter(pk=track_id)
+            .values("plays_count", "likes_count", "download_count", "duration", "album__name")
+            .first()
+        )
+        if row is None:
+            return None
+        return {
+            "plays": row["plays_count"],
+            "likes": row["likes_count"],
+            "downloads": row["download_count"],
+            "duration": row["duration"],
+            "album": row["album__name"],
+        }
     
     # --- Кэш топ треков ---
     @classmethod
     def get_top_tracks(cls, limit=10):
-        """Кэшированный список популярных треков."""
-        key = f"top_tracks_{limit}"
-        top_tracks = cache.get(key)
-        if top_tracks is None:
-            top_tracks = list(
-                cls.objects.filter(is_published=True)
-                .order_by("-plays_count")[:limit]
-            )
-            cache.set(key, top_tracks, timeout=60)
-        return top_tracks
+        """Популярные треки из рейтинга в Redis (или кэшированный запрос без Redis)."""
+        from apps.musics.services import leaderboards
+
+        top_tracks = leaderboards.top_objects(
+            "tracks", cls.objects.filter(is_published=True), limit=limit
+        )
+        if top_tracks is not None:
+            return top_tracks
+
+        from apps.shared.cache import get_or_refresh
+
+        return get_or_refresh(
+            f"top_tracks_{limit}",
+            lambda: list(cls.objects.filter(is_published=True).order_by("-plays_count")[:limit]),
+            ttl=60,
+        )
 
     # --- Свойства для сериализатора ---
     @property
@@ -0,0 +1,315 @@
+import json
+import logging
+import re
+import time
+import uuid
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from apps.musics.models import Album, Artist, Playlist, Track
+from apps.shared.utils.redis import get_redis_connection
+from apps.shared.utils.text import fold
+
+KEY_PREFIX = "musics:autocomplete"
+ENTITIES = ("tracks", "artists", "albums", "playlists")
+# Префиксы длиннее не индексируются: запрос обрезается, лишнее отсекается по имени
+MAX_PREFIX_LENGTH = 15
+# Сколько самых популярных id хранить на один префикс
+MAX_ENTRIES_PER_PREFIX = 50
+REBUILD_CHUNK_SIZE = 2000
+# Версия индекса живёт двое суток: её обновляет ночная пересборка, а брошенные
+# (упавшая или параллельная сборка) версии истекают сами
+VERSION_TIMEOUT = 60 * 60 * 24 * 2
+# Пока держится замок, пересборку повторно не ставим
+REBUILD_LOCK_TIMEOUT = 60 * 10
+
+logger = logging.getLogger(__name__)
+
+
+def prefixes(name):
+    """Префиксы свёрнутого (fold) имени с начала каждого слова: "Bahor Tuni" -> b, ba, ..., t, tu, ..."""
+    normalized = fold(name)
+    result = set()
+    starts = [0] + [match.end() for match in re.finditer(" ", normalized)]
+    for start in starts:
+        tail = normalized[start : start + MAX_PREFIX_LENGTH].rstrip()
+        result.update(tail[:length] for length in range(1, len(tail) + 1))
+    result.discard("")
+    return result
+
+
+def get_source(entity):
+    """Queryset индексируемых объектов с аннотацией score (популярность)."""
+    if entity == "tracks":
+        return (
+            Track.objects.filter(is_published=True)
+            .select_related("artist")
+            .annotate(score=F("plays_count"))
+        )
+    if entity == "albums":
+        return (
+            Album.objects.filter(is_published=True)
+            .select_related("artist")
+            .annotate(score=F("plays_count"))
+        )
+    if entity == "artists":
+        return Artist.objects.annotate(score=F("followers_count"))
+    if entity == "playlists":
+        return Playlist.objects.filter(is_public=True).annotate(score=F("followers_count"))
+    raise ValueError(f"Unknown autocomplete entity: {entity}")
+
+
+def to_payload(obj):
+    payload = {"id": obj.pk, "name": obj.name, "slug": obj.slug}
+    artist = getattr(obj, "artist", None)
+    if artist is not None:
+        payload["artist"] = artist.name
+    return payload
+
+
+def complete(query, entities=ENTITIES, limit=5):
+    """
+    Подсказки по префиксу: {entity: [payload, ...]} по убыванию популярности.
+    Из Redis — ZREVRANGE по префиксу + HMGET готовых payload, без запросов в БД.
+    Без Redis или пока индекс сущности не собран — startswith по search_key,
+    а сборка уходит в фон.
+    """
+    normalized = fold(query)
+    if not normalized:
+        return {entity: [] for entity in entities}
+
+    redis = get_redis_connection()
+    if redis is None:
+        return {entity: _complete_from_db(entity, normalized, limit) for entity in entities}
+
+    prefix = normalized[:MAX_PREFIX_LENGTH]
+    entities = list(entities)
+    versions = dict(zip(entities, redis.mget([_version_key(e) for e in entities])))
+    results = {}
+    for entity, version in versions.items():
+        if version is None:
+            schedule_rebuild(redis, entity)
+            results[entity] = _complete_from_db(entity, normalized, limit)
+    indexed = [entity for entity in entities if entity not in results]
+    if not indexed:
+        return results
+
+    # Запрос длиннее индексируемого префикса — берём с запасом и дофильтровываем
+    fetch = limit if prefix == normalized else MAX_ENTRIES_PER_PREFIX
+    pipe = redis.pipeline(transaction=False)
+    for entity in indexed:
+        pipe.zrevrange(_prefix_key(entity, versions[entity], prefix), 0, fetch - 1)
+    id_lists = pipe.execute()
+
+    pipe = redis.pipeline(transaction=False)
+    for entity, ids in zip(indexed, id_lists):
+        pipe.hmget(_items_key(entity, versions[entity]), ids or ["0"])
+    raw_lists = pipe.execute()
+
+    for entity, raw_items in zip(indexed, raw_lists):
+        items = [json.loads(raw) for raw in raw_items if raw]
+        if prefix != normalized:
+            items = [item for item in items if _matches(item["name"], normalized)]
+        results[entity] = items[:limit]
+    return results
+
+
+def index_objects(entity, objects):
+    """Добавляет/обновляет объекты в индексе (старые префиксы при переименовании убираются)."""
+    redis = get_redis_connection()
+    if redis is None or not objects:
+        return 0
+    version = _current_version(redis, entity)
+    if version is None:
+        # Индекса ещё нет — соберётся целиком при первом запросе
+        return 0
+    _write(redis, entity, version, objects, expire_at=int(time.time()) + VERSION_TIMEOUT)
+    return len(objects)
+
+
+def index_queryset(entity, queryset=None):
+    """index_objects() для выборки из get_source(), порциями."""
+    source = get_source(entity)
+    if queryset is not None:
+        source = source.filter(pk__in=queryset.values("pk"))
+    pks = set(queryset.values_list("pk", flat=True)) if queryset is not None else None
+
+    total = 0
+    seen = set()
+    for chunk in _chunks(source):
+        total += index_objects(entity, chunk)
+        seen.update(obj.pk for obj in chunk)
+    if pks is not None and pks - seen:
+        # Снятые с публикации / скрытые объекты убираем из индекса
+        remove_objects(entity, pks - seen)
+    return total
+
+
+def remove_objects(entity, pks):
+    redis = get_redis_connection()
+    if redis is None or not pks:
+        return
+    version = _current_version(redis, entity)
+    if version is None:
+        return
+    items_key = _items_key(entity, version)
+    pks = list(pks)
+    pipe = redis.pipeline(transaction=False)
+    for pk, raw in zip(pks, redis.hmget(items_key, pks)):
+        if raw:
+            for prefix in prefixes(json.loads(raw)["name"]):
+                pipe.zrem(_prefix_key(entity, version, prefix), pk)
+        pipe.hdel(items_key, pk)
+    pipe.execute()
+
+
+def rebuild(entity):
+    """
+    Собирает индекс заново под новой версией, переключает указатель версии
+    и удаляет ключи старой. Читатели всё время видят целый индекс.
+    Указатель истекает не позже ключей версии, так что на пустой индекс не смотрит.
+    """
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+
+    old_version = _current_version(redis, entity)
+    version = uuid.uuid4().hex[:12]
+    expire_at = int(time.time()) + VERSION_TIMEOUT
+    total = 0
+    for chunk in _chunks(get_source(entity)):
+        _write(redis, entity, version, chunk, replace=False, expire_at=expire_at)
+        total += len(chunk)
+
+    redis.set(_version_key(entity), version, exat=expire_at)
+    redis.delete(_lock_key(entity))
+    if old_version and old_version != version:
+        _drop_version(redis, entity, old_version)
+    return total
+
+
+def schedule_rebuild(redis, entity):
+    """Ставит фоновую пересборку индекса сущности, если её ещё никто не поставил."""
+    if not redis.set(_lock_key(entity), 1, nx=True, ex=REBUILD_LOCK_TIMEOUT):
+        return False
+
+    from apps.musics.tasks.autocomplete import rebuild_autocomplete
+
+    try:
+        rebuild_autocomplete.delay([entity])
+    except Exception:
+        logger.exception("Failed to schedule autocomplete rebuild for %s", entity)
+        redis.delete(_lock_key(entity))
+        return False
+    return True
+
+
+def schedule_index(entity, queryset):
+    """Обновить подсказки после коммита текущей транзакции."""
+    if get_redis_connection() is None:
+        return
+    transaction.on_commit(lambda: index_queryset(entity, queryset))
+
+
+def schedule_remove(entity, pks):
+    if get_redis_connection() is None:
+        return
+    pks = list(pks)
+    transaction.on_commit(lambda: remove_objects(entity, pks))
+
+
+def _write(redis, entity, version, objects, replace=True, expire_at=None):
+    items_key = _items_key(entity, version)
+    pks = [obj.pk for obj in objects]
+    old = dict(zip(pks, redis.hmget(items_key, pks))) if replace else {}
+
+    touched = set()
+    pipe = redis.pipeline(transaction=False)
+    for obj in objects:
+        new_prefixes = prefixes(obj.name)
+        if old.get(obj.pk):
+            for prefix in prefixes(json.loads(old[obj.pk])["name"]) - new_prefixes:
+                pipe.zrem(_prefix_key(entity, version, prefix), obj.pk)
+        for prefix in new_prefixes:
+            key = _prefix_key(entity, version, prefix)
+            pipe.zadd(key, {obj.pk: obj.score or 0})
+            touched.add(key)
+        pipe.hset(items_key, obj.pk, json.dumps(to_payload(obj), ensure_ascii=False))
+    for key in touched:
+        pipe.zremrangebyrank(key, 0, -(MAX_ENTRIES_PER_PREFIX + 1))
+    if expire_at is not None:
+        for key in touched | {items_key}:
+            pipe.expireat(key, expire_at)
+    pipe.execute()
+
+
+def _drop_version(redis, entity, version):
+    batch = []
+    for key in redis.scan_iter(match=f"{KEY_PREFIX}:{entity}:{version}:*", count=1000):
+        batch.append(key)
+        if len(batch) >= 1000:
+            redis.unlink(*batch)
+            batch = []
+    if batch:
+        redis.unlink(*batch)
+
+
+def _complete_from_db(entity, normalized, limit):
+    condition = Q(search_key__startswith=normalized) | Q(search_key__contains=f" {normalized}")
+    objects = get_source(entity).filter(condition).order_by("-score", "-pk")[:limit]
+    return [to_payload(obj) for obj in objects]
+
+
+def _matches(name, normalized):
+    name = fold(name)
+    return name.startswith(normalized) or f" {normalized}" in name
+
+
+def _chunks(queryset):
+    last_pk = 0
+    queryset = queryset.order_by("pk")
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:REBUILD_CHUNK_SIZE])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def _current_version(redis, entity):
+    return _decode(redis.get(_version_key(entity)))
+
+
+def _version_key(entity):
+    return f"{KEY_PREFIX}:{entity}:version"
+
+
+def _lock_key(entity):
+    return f"{KEY_PREFIX}:{entity}:lock"
+
+
+def _items_key(entity, version):
+    return f"{KEY_PREFIX}:{entity}:{_decode(version)}:items"
+
+
+def _prefix_key(entity, version, prefix):
+    return f"{KEY_PREFIX}:{entity}:{_decode(version)}:p:{prefix}"
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+__all__ = [
+    "ENTITIES",
+    "prefixes",
+    "complete",
+    "index_objects",
+    "index_queryset",
+    "remove_objects",
+    "rebuild",
+    "schedule_rebuild",
+    "schedule_index",
+    "schedule_remove",
+]
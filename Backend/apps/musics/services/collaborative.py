@@ -0,0 +1,95 @@
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+
+from apps.musics.models import Like, ListeningHistory, Track, TrackItemNeighbors
+from .neighbors import save_neighbors
+from .recommendations import HISTORY_WEIGHT, LIKE_WEIGHT
+
+ITEM_NEIGHBORS_COUNT = getattr(settings, "MUSICS_ITEM_NEIGHBORS_COUNT", 50)
+# Пары с меньшим числом общих пользователей шумные — не считаем соседями
+MIN_CO_USERS = 2
+# Сколько треков (столбцов) за раз умножать: ограничивает память на блок
+SIMILARITY_CHUNK = 1000
+
+
+def compute_item_neighbors(k=ITEM_NEIGHBORS_COUNT):
+    """
+    Строит разреженную матрицу пользователь x трек из ListeningHistory и Like,
+    считает косинусное сходство треков блоками столбцов и сохраняет top-k
+    соседей в TrackItemNeighbors. Возвращает количество треков с соседями.
+    """
+    track_ids, matrix = build_matrix()
+    if not track_ids:
+        return save_neighbors(TrackItemNeighbors, [])
+
+    presence = matrix.copy()
+    presence.data[:] = 1
+    rows = []
+    for start in range(0, len(track_ids), SIMILARITY_CHUNK):
+        for column, neighbors, scores in _top_k_block(matrix, presence, start, k):
+            rows.append((track_ids[column], [track_ids[j] for j in neighbors], scores))
+    return save_neighbors(TrackItemNeighbors, rows)
+
+
+def build_matrix():
+    """(track_ids, CSC-матрица пользователи x треки; столбцы нормированы по L2)."""
+    published = set(Track.objects.filter(is_published=True).values_list("pk", flat=True))
+    weights = defaultdict(float)
+    sources = (
+        (ListeningHistory.objects.values_list("user_id", "track_id"), HISTORY_WEIGHT),
+        (Like.objects.values_list("user_id", "track_id"), LIKE_WEIGHT),
+    )
+    for pairs, weight in sources:
+        for user_id, track_id in pairs.iterator(chunk_size=10000):
+            if track_id in published:
+                weights[user_id, track_id] += weight
+    if not weights:
+        return [], None
+
+    user_index = {}
+    track_index = {}
+    rows, columns = [], []
+    for user_id, track_id in weights:
+        rows.append(user_index.setdefault(user_id, len(user_index)))
+        columns.append(track_index.setdefault(track_id, len(track_index)))
+    data = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+
+    matrix = sparse.csc_matrix(
+        (data, (rows, columns)), shape=(len(user_index), len(track_index))
+    )
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0))).ravel()
+    norms[norms == 0] = 1.0
+    matrix = matrix @ sparse.diags(1.0 / norms)
+    return list(track_index), matrix.tocsc()
+
+
+def _top_k_block(matrix, presence, start, k):
+    """Для столбцов start..start+SIMILARITY_CHUNK: (столбец, соседи, сходство)."""
+    stop = min(start + SIMILARITY_CHUNK, matrix.shape[1])
+    similarity = (matrix[:, start:stop].T @ matrix).tocsr()
+    # Число общих пользователей; структура та же, что у similarity
+    support = (presence[:, start:stop].T @ presence).tocsr()
+    similarity.sort_indices()
+    support.sort_indices()
+
+    for offset in range(stop - start):
+        column = start + offset
+        begin, end = similarity.indptr[offset], similarity.indptr[offset + 1]
+        indices = similarity.indices[begin:end]
+        scores = similarity.data[begin:end]
+        counts = support.data[support.indptr[offset] : support.indptr[offset + 1]]
+        mask = (indices != column) & (counts >= MIN_CO_USERS)
+        indices, scores = indices[mask], scores[mask]
+        if not len(indices):
+            continue
+        if len(indices) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            indices, scores = indices[top], scores[top]
+        order = np.argsort(-scores)
+        yield column, indices[order].tolist(), scores[order].tolist()
+
+
+__all__ = ["ITEM_NEIGHBORS_COUNT", "compute_item_neighbors", "build_matrix"]
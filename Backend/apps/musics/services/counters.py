@@ -0,0 +1,249 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Value, When
+
+from apps.musics.models import Album, Artist, Like, ListeningEvent, Track
+from apps.musics.signals.responses import COUNTER_TAGS
+from apps.shared.cache import invalidate_tags
+from apps.shared.utils.redis import get_redis_connection
+
+# Имя счётчика -> колонка в musics_tracks
+COUNTER_FIELDS = {
+    "plays": "plays_count",
+    "likes": "likes_count",
+    "downloads": "download_count",
+}
+
+# Счётчики треков, которые суммируются в колонки альбома и артиста.
+# Прослушивания туда пишет plays.apply_play_deltas, лайки — здесь
+ROLLUP_COLUMNS = {
+    "likes": ((Album, "album_id", "likes_count"), (Artist, "artist_id", "total_likes")),
+}
+
+COUNTER_SHARDS = getattr(settings, "MUSICS_COUNTER_SHARDS", 64)
+DIRTY_KEY = "musics:counters:dirty"
+
+# HINCRBY только если счётчик уже засеян из БД, иначе nil
+_INCR_IF_SEEDED = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+    redis.call('SADD', KEYS[2], ARGV[3])
+    return redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+end
+return false
+"""
+
+
+def incr(track_id, name, amount=1):
+    """
+    Увеличивает живой счётчик трека в шардированном Redis-хэше.
+    Колонки в БД догоняют значения в reconcile_counters().
+    Без Redis — обычный UPDATE ... SET x = x + amount.
+    """
+    column = COUNTER_FIELDS[name]
+    redis = get_redis_connection()
+    if redis is None:
+        with transaction.atomic():
+            Track.objects.filter(pk=track_id).update(**{column: F(column) + amount})
+            if name in ROLLUP_COLUMNS:
+                _roll_up(
+                    name,
+                    [
+                        (album_id, artist_id, amount)
+                        for album_id, artist_id in Track.objects.filter(pk=track_id).values_list(
+                            "album_id", "artist_id"
+                        )
+                    ],
+                )
+        cache.delete(f"track_{track_id}_stats")
+        invalidate_tags(COUNTER_TAGS[Track])
+        return None
+
+    script = redis.register_script(_INCR_IF_SEEDED)
+    args = [_field(track_id, name), amount, track_id]
+    keys = [_shard_key(track_id), DIRTY_KEY]
+    value = script(keys=keys, args=args)
+    if value is None:
+        _seed(redis, [track_id])
+        value = script(keys=keys, args=args)
+    return value
+
+
+def get_counts(track_ids):
+    """{track_id: {"plays": .., "likes": .., "downloads": ..}} для засеянных треков."""
+    redis = get_redis_connection()
+    if redis is None or not track_ids:
+        return {}
+
+    pipe = redis.pipeline(transaction=False)
+    for track_id in track_ids:
+        pipe.hmget(_shard_key(track_id), [_field(track_id, name) for name in COUNTER_FIELDS])
+
+    counts = {}
+    for track_id, values in zip(track_ids, pipe.execute()):
+        if any(value is None for value in values):
+            continue
+        counts[track_id] = {
+            name: int(value) for name, value in zip(COUNTER_FIELDS, values)
+        }
+    return counts
+
+
+def reconcile_counters(batch_size=None):
+    """Переносит живые значения изменившихся треков в колонки БД одним UPDATE."""
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+
+    batch_size = batch_size or getattr(settings, "MUSICS_COUNTER_RECONCILE_BATCH", 1000)
+    track_ids = [int(pk) for pk in redis.spop(DIRTY_KEY, batch_size) or []]
+    counts = get_counts(track_ids)
+    if not counts:
+        return 0
+
+    try:
+        with transaction.atomic():
+            # Прежние значения — чтобы сдвинуть альбомы и артистов на разницу
+            previous = {
+                pk: (album_id, artist_id, dict(zip(COUNTER_FIELDS, values)))
+                for pk, album_id, artist_id, *values in Track.objects.select_for_update()
+                .filter(pk__in=list(counts))
+                .values_list("pk", "album_id", "artist_id", *COUNTER_FIELDS.values())
+            }
+            Track.objects.filter(pk__in=list(counts)).update(
+                **{
+                    column: Case(
+                        *[
+                            When(pk=pk, then=Value(values[name]))
+                            for pk, values in counts.items()
+                        ],
+                        default=F(column),
+                        output_field=models.BigIntegerField(),
+                    )
+                    for name, column in COUNTER_FIELDS.items()
+                }
+            )
+            for name in ROLLUP_COLUMNS:
+                _roll_up(
+                    name,
+                    [
+                        (album_id, artist_id, counts[pk][name] - values[name])
+                        for pk, (album_id, artist_id, values) in previous.items()
+                    ],
+                )
+    except Exception:
+        redis.sadd(DIRTY_KEY, *counts)
+        raise
+    cache.delete_many([f"track_{pk}_stats" for pk in counts])
+    invalidate_tags(COUNTER_TAGS[Track])
+    return len(counts)
+
+
+def rebuild_counters(track_ids=None, chunk_size=1000):
+    """
+    Пересобирает счётчики после потери данных в Redis:
+    лайки — из Like, прослушивания — из журнала ListeningEvent (но не меньше,
+    чем уже сохранено в БД), скачивания — из колонки.
+    """
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+
+    qs = Track.objects.order_by("pk")
+    if track_ids is not None:
+        qs = qs.filter(pk__in=track_ids)
+
+    rebuilt = 0
+    last_pk = 0
+    while True:
+        rows = list(
+            qs.filter(pk__gt=last_pk).values_list(
+                "pk", "plays_count", "download_count"
+            )[:chunk_size]
+        )
+        if not rows:
+            break
+        ids = [row[0] for row in rows]
+        likes = dict(
+            Like.objects.filter(track_id__in=ids)
+            .values("track_id")
+            .annotate(total=Count("id"))
+            .values_list("track_id", "total")
+        )
+        listens = dict(
+            ListeningEvent.objects.filter(track_id__in=ids)
+            .values("track_id")
+            .annotate(total=Count("id"))
+            .values_list("track_id", "total")
+        )
+
+        pipe = redis.pipeline()
+        for pk, plays, downloads in rows:
+            pipe.hset(
+                _shard_key(pk),
+                mapping={
+                    _field(pk, "plays"): max(plays, listens.get(pk, 0)),
+                    _field(pk, "likes"): likes.get(pk, 0),
+                    _field(pk, "downloads"): downloads,
+                },
+            )
+        pipe.sadd(DIRTY_KEY, *ids)
+        pipe.execute()
+
+        rebuilt += len(rows)
+        last_pk = ids[-1]
+    return rebuilt
+
+
+def _roll_up(name, rows):
+    """Сдвигает колонки альбомов и артистов на дельты треков: rows — (album_id, artist_id, delta)."""
+    totals = {"album_id": Counter(), "artist_id": Counter()}
+    for album_id, artist_id, delta in rows:
+        if album_id and delta:
+            totals["album_id"][album_id] += delta
+        if delta:
+            totals["artist_id"][artist_id] += delta
+    for model, ref, column in ROLLUP_COLUMNS[name]:
+        deltas = {pk: delta for pk, delta in totals[ref].items() if delta}
+        if not deltas:
+            continue
+        model.objects.filter(pk__in=list(deltas)).update(
+            **{
+                column: F(column)
+                + Case(
+                    *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                    default=Value(0),
+                    output_field=models.BigIntegerField(),
+                )
+            }
+        )
+        invalidate_tags(COUNTER_TAGS[model])
+
+
+def _seed(redis, track_ids):
+    rows = Track.objects.filter(pk__in=track_ids).values_list(
+        "pk", *COUNTER_FIELDS.values()
+    )
+    pipe = redis.pipeline()
+    for pk, *values in rows:
+        for name, value in zip(COUNTER_FIELDS, values):
+            pipe.hsetnx(_shard_key(pk), _field(pk, name), value)
+    pipe.execute()
+
+
+def _shard_key(track_id):
+    return f"musics:counters:{int(track_id) % COUNTER_SHARDS}"
+
+
+def _field(track_id, name):
+    return f"{track_id}:{name}"
+
+
+__all__ = [
+    "incr",
+    "get_counts",
+    "reconcile_counters",
+    "rebuild_counters",
+]
@@ -0,0 +1,188 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.musics.models import ListeningEvent, ListeningHistory, Track
+from apps.musics.services import listens
+from apps.shared.utils.redis import get_redis_connection
+
+EVENT_BUFFER_KEY = "musics:history:buffer"
+BULK_BATCH_SIZE = 1000
+# Сколько помнить момент очистки истории: дольше, чем событие лежит в буфере
+CLEARED_MARK_TIMEOUT = 60 * 60 * 24
+HISTORY_FIELDS = ("user_id", "track_id", "listened_at", "duration", "additional_info")
+
+
+def record_listen(user_id, track_id, duration=None, additional_info=None, listened_at=None):
+    """
+    Добавляет событие прослушивания в буфер (RPUSH, без обращения к БД).
+    В журнал и в ListeningHistory оно попадает пачкой в flush_listen_buffer().
+    Без Redis (dev/тесты) пишется сразу.
+    """
+    event = ListeningEvent(
+        user_id=user_id,
+        track_id=track_id,
+        listened_at=listened_at or timezone.now(),
+        duration=duration,
+        additional_info=additional_info or {},
+    )
+    redis = get_redis_connection()
+    if redis is None:
+        write_events([event])
+        return event
+    redis.rpush(EVENT_BUFFER_KEY, _encode(event))
+    return event
+
+
+def flush_listen_buffer(batch_size=None):
+    """Забирает до batch_size событий из буфера и записывает их. Возвращает число событий."""
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+
+    batch_size = batch_size or getattr(settings, "MUSICS_HISTORY_FLUSH_BATCH", 5000)
+    pipe = redis.pipeline()
+    pipe.lrange(EVENT_BUFFER_KEY, 0, batch_size - 1)
+    pipe.ltrim(EVENT_BUFFER_KEY, batch_size, -1)
+    raw, _ = pipe.execute()
+    if not raw:
+        return 0
+
+    try:
+        written = write_events(_drop_cleared(redis, [_decode(item) for item in raw]))
+    except Exception:
+        # Возвращаем события в буфер, чтобы не потерять историю
+        redis.rpush(EVENT_BUFFER_KEY, *raw)
+        raise
+    # Почасовые счётчики — из тех же событий, что легли в журнал
+    listens.record(written)
+    return len(raw)
+
+
+@transaction.atomic
+def write_events(events):
+    """
+    bulk_create в журнал и один upsert "последнего прослушивания"
+    (INSERT ... ON CONFLICT (user_id, track_id) DO UPDATE ... WHERE новее) в ListeningHistory.
+    События удалённых за это время пользователей и треков отбрасываются.
+    Возвращает записанные события.
+    """
+    events = _existing_only(events)
+    if not events:
+        return []
+
+    ListeningEvent.objects.bulk_create(events, batch_size=BULK_BATCH_SIZE)
+
+    latest = {}
+    for event in events:
+        key = (event.user_id, event.track_id)
+        if key not in latest or event.listened_at >= latest[key].listened_at:
+            latest[key] = event
+    _upsert_latest(list(latest.values()))
+    return events
+
+
+def clear_history(user_id):
+    """
+    Удаляет историю пользователя. События, ещё лежащие в буфере, отбрасываются
+    при сбросе по метке времени очистки — иначе они вернули бы историю.
+    """
+    redis = get_redis_connection()
+    if redis is not None:
+        redis.set(_cleared_key(user_id), timezone.now().isoformat(), ex=CLEARED_MARK_TIMEOUT)
+    with transaction.atomic():
+        ListeningEvent.objects.filter(user_id=user_id).delete()
+        deleted_count, _ = ListeningHistory.objects.filter(user_id=user_id).delete()
+    return deleted_count
+
+
+def _upsert_latest(events):
+    """
+    INSERT ... ON CONFLICT (user_id, track_id) DO UPDATE ... WHERE новое событие
+    свежее записанного: запоздавшая пачка не откатывает listened_at назад.
+    """
+    table = connection.ops.quote_name(ListeningHistory._meta.db_table)
+    fields = [ListeningHistory._meta.get_field(name) for name in HISTORY_FIELDS]
+    columns = [connection.ops.quote_name(field.column) for field in fields]
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns[2:])
+    listened_at = columns[2]
+    row_sql = "(" + ", ".join(["%s"] * len(fields)) + ")"
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(events), BULK_BATCH_SIZE):
+            batch = events[start : start + BULK_BATCH_SIZE]
+            params = [
+                field.get_db_prep_save(getattr(event, field.attname), connection)
+                for event in batch
+                for field in fields
+            ]
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES {', '.join([row_sql] * len(batch))} "
+                f"ON CONFLICT ({columns[0]}, {columns[1]}) DO UPDATE SET {updates} "
+                f"WHERE EXCLUDED.{listened_at} > {table}.{listened_at}",
+                params,
+            )
+
+
+def _drop_cleared(redis, events):
+    user_ids = sorted({event.user_id for event in events})
+    marks = redis.mget([_cleared_key(user_id) for user_id in user_ids])
+    cleared_at = {
+        user_id: parse_datetime(mark.decode() if isinstance(mark, bytes) else mark)
+        for user_id, mark in zip(user_ids, marks)
+        if mark
+    }
+    if not cleared_at:
+        return events
+    return [
+        event
+        for event in events
+        if event.user_id not in cleared_at or event.listened_at > cleared_at[event.user_id]
+    ]
+
+
+def _cleared_key(user_id):
+    return f"musics:history:cleared:{user_id}"
+
+
+def _existing_only(events):
+    track_ids = set(
+        Track.objects.filter(pk__in={e.track_id for e in events}).values_list("pk", flat=True)
+    )
+    user_ids = set(
+        get_user_model()
+        .objects.filter(pk__in={e.user_id for e in events})
+        .values_list("pk", flat=True)
+    )
+    return [e for e in events if e.track_id in track_ids and e.user_id in user_ids]
+
+
+def _encode(event):
+    return json.dumps(
+        {
+            "u": event.user_id,
+            "t": event.track_id,
+            "at": event.listened_at.isoformat(),
+            "d": event.duration,
+            "i": event.additional_info,
+        }
+    )
+
+
+def _decode(raw):
+    data = json.loads(raw)
+    return ListeningEvent(
+        user_id=data["u"],
+        track_id=data["t"],
+        listened_at=parse_datetime(data["at"]),
+        duration=data["d"],
+        additional_info=data["i"],
+    )
+
+
+__all__ = ["record_listen", "flush_listen_buffer", "write_events", "clear_history"]
@@ -0,0 +1,217 @@
+import logging
+import uuid
+
+from django.utils import timezone
+
+from apps.musics.models import Album, Artist, Track
+from apps.shared.utils.redis import get_redis_connection
+
+ENTITIES = {
+    "tracks": Track,
+    "albums": Album,
+    "artists": Artist,
+}
+# Колонки, из которых собирается общий (all) рейтинг. Лайки альбомов и
+# артистов ведёт counters.reconcile_counters вместе с лайками треков
+COLUMNS = {
+    ("tracks", "plays"): "plays_count",
+    ("tracks", "likes"): "likes_count",
+    ("albums", "plays"): "plays_count",
+    ("albums", "likes"): "likes_count",
+    ("artists", "plays"): "total_plays",
+    ("artists", "likes"): "total_likes",
+}
+METRICS = ("plays", "likes")
+# Окно -> (формат корзины, TTL ключа)
+WINDOWS = {
+    "all": (None, None),
+    "day": ("%Y%m%d", 60 * 60 * 24 * 2),
+    "week": ("%G%V", 60 * 60 * 24 * 8),
+    "month": ("%Y%m", 60 * 60 * 24 * 32),
+}
+REBUILD_CHUNK_SIZE = 5000
+# Пока держится замок, пересборку общего рейтинга повторно не ставим
+REBUILD_LOCK_TIMEOUT = 60 * 10
+# Сколько порций id максимум гидрировать, если часть объектов отфильтрована
+MAX_HYDRATION_ROUNDS = 5
+
+logger = logging.getLogger(__name__)
+
+
+def record(metric, track_deltas, album_deltas, artist_deltas):
+    """ZINCRBY агрегированных дельт во все окна. Общий рейтинг — только если уже собран."""
+    redis = get_redis_connection()
+    if redis is None:
+        return
+
+    now = timezone.now()
+    deltas = {"tracks": track_deltas, "albums": album_deltas, "artists": artist_deltas}
+    all_keys = [board_key(entity, metric, "all") for entity in deltas]
+    pipe = redis.pipeline(transaction=False)
+    for key in all_keys:
+        pipe.exists(key)
+    seeded = dict(zip(all_keys, pipe.execute()))
+
+    pipe = redis.pipeline(transaction=False)
+    for entity, entity_deltas in deltas.items():
+        if not entity_deltas:
+            continue
+        for window, (_, timeout) in WINDOWS.items():
+            key = board_key(entity, metric, window, now)
+            if window == "all" and not seeded[key]:
+                continue
+            for pk, delta in entity_deltas.items():
+                pipe.zincrby(key, delta, pk)
+            if timeout:
+                pipe.expire(key, timeout)
+    pipe.execute()
+
+
+def top_ids(entity, metric="plays", window="all", limit=10, offset=0):
+    """id из рейтинга (ZREVRANGE) или None, если Redis недоступен или рейтинг ещё собирается."""
+    redis = get_redis_connection()
+    if redis is None:
+        return None
+    key = _ensure_board(redis, entity, metric, window)
+    if key is None:
+        return None
+    return [int(pk) for pk in redis.zrevrange(key, offset, offset + limit - 1)]
+
+
+def top_objects(
+    entity, queryset=None, metric="plays", window="all", limit=10, offset=0, tiebreak=None
+):
+    """
+    Рейтинг с гидрацией через in_bulk (один запрос на порцию id).
+    Объекты, не попавшие в queryset (неопубликованные и т.п.), пропускаются.
+    tiebreak — поле объекта для порядка при равном счёте (например "-followers_count").
+    Возвращает None, если Redis недоступен или общий рейтинг ещё собирается —
+    тогда вызывающий код сортирует в БД.
+    """
+    redis = get_redis_connection()
+    if redis is None:
+        return None
+
+    if queryset is None:
+        queryset = ENTITIES[entity].objects.all()
+    key = _ensure_board(redis, entity, metric, window)
+    if key is None:
+        return None
+
+    scored = []
+    start = offset
+    for _ in range(MAX_HYDRATION_ROUNDS):
+        if len(scored) >= limit:
+            break
+        rows = redis.zrevrange(key, start, start + limit - 1, withscores=True)
+        if not rows:
+            break
+        start += len(rows)
+        scored.extend(_hydrate(queryset, rows))
+
+    if tiebreak and scored:
+        # Граница страницы может разрезать группу с равным счётом: дочитываем её целиком
+        last_score = scored[-1][1]
+        seen = {obj.pk for obj, _ in scored}
+        rows = [
+            (pk, score)
+            for pk, score in redis.zrevrangebyscore(key, last_score, last_score, withscores=True)
+            if int(pk) not in seen
+        ]
+        scored.extend(_hydrate(queryset, rows))
+        field = tiebreak.lstrip("-")
+        sign = -1 if tiebreak.startswith("-") else 1
+        scored.sort(key=lambda item: (-item[1], sign * getattr(item[0], field), -item[0].pk))
+    return [obj for obj, _ in scored[:limit]]
+
+
+def rebuild(entity, metric):
+    """Пересобирает общий рейтинг из колонок БД и атомарно подменяет ключ."""
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+
+    column = COLUMNS[(entity, metric)]
+    key = board_key(entity, metric, "all")
+    # Свой временный ключ у каждой сборки: параллельные не пишут в чужой
+    tmp_key = f"{key}:rebuild:{uuid.uuid4().hex}"
+    qs = ENTITIES[entity].objects.order_by("pk")
+
+    total = 0
+    last_pk = 0
+    try:
+        while True:
+            rows = list(qs.filter(pk__gt=last_pk).values_list("pk", column)[:REBUILD_CHUNK_SIZE])
+            if not rows:
+                break
+            pipe = redis.pipeline(transaction=False)
+            pipe.zadd(tmp_key, {pk: score for pk, score in rows})
+            pipe.expire(tmp_key, REBUILD_LOCK_TIMEOUT)
+            pipe.execute()
+            total += len(rows)
+            last_pk = rows[-1][0]
+        if total:
+            redis.rename(tmp_key, key)
+    finally:
+        # И при пустой таблице, и при ошибке: следующая пересборка не должна ждать замка
+        redis.delete(_lock_key(key))
+    return total
+
+
+def schedule_rebuild(redis, entity, metric):
+    """Ставит фоновую пересборку общего рейтинга, если её ещё никто не поставил."""
+    key = board_key(entity, metric, "all")
+    if not redis.set(_lock_key(key), 1, nx=True, ex=REBUILD_LOCK_TIMEOUT):
+        return False
+
+    from apps.musics.tasks.leaderboards import rebuild_leaderboard
+
+    try:
+        rebuild_leaderboard.delay(entity, metric)
+    except Exception:
+        logger.exception("Failed to schedule leaderboard rebuild for %s", key)
+        redis.delete(_lock_key(key))
+        return False
+    return True
+
+
+def board_key(entity, metric, window, now=None):
+    if entity not in ENTITIES or metric not in METRICS or window not in WINDOWS:
+        raise ValueError(f"Unknown leaderboard: {entity}/{metric}/{window}")
+    bucket_format, _ = WINDOWS[window]
+    if bucket_format is None:
+        return f"musics:charts:{entity}:{metric}:all"
+    bucket = (now or timezone.now()).strftime(bucket_format)
+    return f"musics:charts:{entity}:{metric}:{window}:{bucket}"
+
+
+def _ensure_board(redis, entity, metric, window):
+    """Ключ рейтинга или None, если общий рейтинг не собран (сборка уходит в фон)."""
+    key = board_key(entity, metric, window)
+    if window == "all" and not redis.exists(key):
+        schedule_rebuild(redis, entity, metric)
+        return None
+    return key
+
+
+def _hydrate(queryset, rows):
+    ids = [int(pk) for pk, _ in rows]
+    found = queryset.in_bulk(ids)
+    return [(found[pk], score) for pk, (_, score) in zip(ids, rows) if pk in found]
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+__all__ = [
+    "ENTITIES",
+    "METRICS",
+    "WINDOWS",
+    "record",
+    "top_ids",
+    "top_objects",
+    "rebuild",
+    "schedule_rebuild",
+    "board_key",
+]
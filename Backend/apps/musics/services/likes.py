@@ -0,0 +1,131 @@
+import uuid
+
+from django.db import transaction
+
+from apps.musics.models import Like
+from apps.shared.utils.redis import get_redis_connection
+
+LIKED_SET_TIMEOUT = 60 * 60 * 24
+# Сколько живёт журнал изменений, пришедших во время загрузки множества
+LOADING_TIMEOUT = 60
+# id треков начинаются с 1, "0" означает "множество загружено, но лайков нет"
+EMPTY_MARKER = 0
+LOAD_CHUNK_SIZE = 5000
+
+# SADD/SREM в загруженное множество; пока идёт загрузка — в журнал,
+# иначе ничего: множество соберёт ленивая загрузка
+_UPDATE_IF_LOADED = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call(ARGV[1], KEYS[1], ARGV[2])
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('RPUSH', KEYS[2], ARGV[1] .. ':' .. ARGV[2])
+end
+return 0
+"""
+
+# Начало загрузки: журнал создаётся до чтения из БД
+_BEGIN_LOAD = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('RPUSH', KEYS[1], '*')
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+"""
+
+# Конец загрузки: накатить журнал на собранное множество и опубликовать его.
+# Если другая загрузка успела раньше — её множество уже получает изменения напрямую
+_FINISH_LOAD = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('DEL', KEYS[3])
+    return 0
+end
+for _, change in ipairs(redis.call('LRANGE', KEYS[2], 1, -1)) do
+    local sep = string.find(change, ':', 1, true)
+    redis.call(string.sub(change, 1, sep - 1), KEYS[3], string.sub(change, sep + 1))
+end
+redis.call('RENAME', KEYS[3], KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('DEL', KEYS[2])
+return 1
+"""
+
+
+def get_liked_track_ids(user, track_ids):
+    """
+    Какие из track_ids лайкнул пользователь.
+    С Redis — один SMISMEMBER по множеству musics:liked:{user_id},
+    без Redis — один IN-запрос к musics_likes.
+    """
+    if not user.is_authenticated or not track_ids:
+        return set()
+
+    track_ids = list(track_ids)
+    redis = get_redis_connection()
+    if redis is None:
+        return set(
+            Like.objects.filter(user=user, track_id__in=track_ids).values_list(
+                "track_id", flat=True
+            )
+        )
+
+    key = _liked_key(user.pk)
+    pipe = redis.pipeline(transaction=False)
+    pipe.exists(key)
+    pipe.smismember(key, track_ids)
+    exists, flags = pipe.execute()
+    if not exists:
+        _load(redis, user.pk)
+        flags = redis.smismember(key, track_ids)
+    return {track_id for track_id, flag in zip(track_ids, flags) if flag}
+
+
+def is_track_liked(user, track_id):
+    return track_id in get_liked_track_ids(user, [track_id])
+
+
+def remember_like(user_id, track_id, liked):
+    """Write-through: после коммита добавляет/убирает трек из множества пользователя."""
+    redis = get_redis_connection()
+    if redis is None:
+        return
+
+    def _update():
+        script = redis.register_script(_UPDATE_IF_LOADED)
+        script(
+            keys=[_liked_key(user_id), _pending_key(user_id)],
+            args=["SADD" if liked else "SREM", track_id],
+        )
+
+    transaction.on_commit(_update)
+
+
+def _load(redis, user_id):
+    """
+    Собирает множество во временном ключе. Лайки, закоммиченные во время
+    чтения из БД, remember_like пишет в журнал, и он накатывается в конце.
+    """
+    key, pending = _liked_key(user_id), _pending_key(user_id)
+    staging = f"{key}:loading:{uuid.uuid4().hex}"
+    redis.register_script(_BEGIN_LOAD)(keys=[pending], args=[LOADING_TIMEOUT])
+
+    track_ids = list(Like.objects.filter(user_id=user_id).values_list("track_id", flat=True))
+    pipe = redis.pipeline(transaction=False)
+    pipe.sadd(staging, EMPTY_MARKER)
+    pipe.expire(staging, LOADING_TIMEOUT)
+    for start in range(0, len(track_ids), LOAD_CHUNK_SIZE):
+        pipe.sadd(staging, *track_ids[start : start + LOAD_CHUNK_SIZE])
+    pipe.execute()
+    redis.register_script(_FINISH_LOAD)(
+        keys=[key, pending, staging], args=[LIKED_SET_TIMEOUT]
+    )
+
+
+def _liked_key(user_id):
+    return f"musics:liked:{user_id}"
+
+
+def _pending_key(user_id):
+    return f"musics:liked:{user_id}:pending"
+
+
+__all__ = ["get_liked_track_ids", "is_track_liked", "remember_like"]
@@ -0,0 +1,276 @@
+from collections import Counter
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import models, transaction
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.musics.models import (
+    Album,
+    Artist,
+    ListeningEvent,
+    RollupCheckpoint,
+    Track,
+    TrackListenDaily,
+    TrackListenHourly,
+)
+from apps.shared.utils.redis import get_redis_connection
+
+HOUR = timedelta(hours=1)
+HOUR_KEY_TIMEOUT = 60 * 60 * 24 * 2
+# Час считается закрытым спустя ROLLUP_GRACE после его конца
+ROLLUP_GRACE = timedelta(minutes=5)
+# Сколько уже свёрнутых часов пересворачивать: события из буфера приходят с опозданием
+LATE_HOURS = 2
+# С какой глубины начинать, если свёрток ещё нет
+BACKFILL_DAYS = 30
+MAX_HOURS_PER_RUN = 24 * 7
+BULK_BATCH_SIZE = 1000
+
+HOURLY_CHECKPOINT = "listens_hourly"
+DAILY_CHECKPOINT = "listens_daily"
+
+# Колонка -> длина окна в днях (включая текущий день)
+ROLLING_WINDOWS = {
+    "listens_last_week": 7,
+    "listens_last_month": 30,
+}
+ROLLING_TARGETS = (
+    (Track, "track"),
+    (Album, "album"),
+    (Artist, "artist"),
+)
+
+
+def record(events):
+    """
+    HINCRBY записанных в журнал событий (вызывается из flush_listen_buffer)
+    в хэши часов, когда слушали, а не когда сбросили буфер.
+    """
+    redis = get_redis_connection()
+    if redis is None or not events:
+        return
+
+    counts = Counter((_truncate_hour(event.listened_at), event.track_id) for event in events)
+    pipe = redis.pipeline(transaction=False)
+    for (bucket, track_id), count in counts.items():
+        pipe.hincrby(_hour_key(bucket), track_id, count)
+    for bucket in {bucket for bucket, _ in counts}:
+        pipe.expire(_hour_key(bucket), HOUR_KEY_TIMEOUT)
+    pipe.execute()
+
+
+def rollup_hours(now=None, backfill=False, since=None):
+    """
+    Сворачивает закрытые часы после контрольной точки в TrackListenHourly.
+    Прослушивание — событие журнала ListeningEvent в час, когда слушали.
+    С Redis счёт берётся из хэша часа, который пополняется при сбросе буфера
+    событий (нет хэша — в этот час не слушали); без Redis или при явном
+    backfill — из самого журнала. since — с какого часа пересвернуть заново.
+    Последние LATE_HOURS часов перед контрольной точкой сворачиваются ещё раз,
+    чтобы учесть опоздавшие события. Повторная свёртка часа перезаписывает
+    строки, поэтому задача идемпотентна.
+    """
+    redis = get_redis_connection()
+    from_history = backfill or redis is None
+    end = _truncate_hour((now or timezone.now()) - ROLLUP_GRACE)
+    if since is not None:
+        start = _truncate_hour(since)
+        RollupCheckpoint.objects.get_or_create(
+            name=HOURLY_CHECKPOINT, defaults={"position": start}
+        )
+    else:
+        start = _get_checkpoint(HOURLY_CHECKPOINT)
+        if start is None:
+            # С Redis старые часы подтягиваются только явным backfill
+            start = _initial_hour(end) if from_history else end
+            _set_checkpoint(HOURLY_CHECKPOINT, start)
+        else:
+            start -= HOUR * LATE_HOURS
+
+    processed = 0
+    while start < end and processed < MAX_HOURS_PER_RUN:
+        _rollup_hour(redis, start, from_history)
+        start += HOUR
+        processed += 1
+    return processed
+
+
+def rollup_days():
+    """
+    Пересобирает дневные строки из почасовых для дней после контрольной точки,
+    включая текущий незакрытый день (он пересчитывается при следующем запуске).
+    """
+    hourly_position = _get_checkpoint(HOURLY_CHECKPOINT)
+    if hourly_position is None:
+        return 0
+
+    last_day = _truncate_hour(hourly_position - HOUR).date()
+    daily_position = _get_checkpoint(DAILY_CHECKPOINT)
+    day = daily_position.date() if daily_position else _first_hourly_day()
+    if day is None:
+        return 0
+    # Пересвёрнутые rollup_hours часы могли прийтись на предыдущий день
+    day = min(day, _truncate_hour(hourly_position - HOUR * (LATE_HOURS + 1)).date())
+
+    processed = 0
+    while day <= last_day:
+        _rollup_day(day)
+        processed += 1
+        day += timedelta(days=1)
+    _set_checkpoint(DAILY_CHECKPOINT, _day_start(last_day))
+    return processed
+
+
+def refresh_rolling_counts(today=None):
+    """
+    Пересчитывает listens_last_week/month у треков, альбомов и артистов.
+    Один UPDATE ... SET x = COALESCE((SELECT SUM(...)), 0) на колонку, и только
+    для строк, которые попадают в окно или были ненулевыми (чтобы их обнулить).
+    """
+    today = today or timezone.now().date()
+    updated = 0
+    for column, days in ROLLING_WINDOWS.items():
+        window = TrackListenDaily.objects.filter(day__gte=today - timedelta(days=days - 1))
+        for model, field in ROLLING_TARGETS:
+            total = (
+                window.filter(**{field: OuterRef("pk")})
+                .values(field)
+                .annotate(total=Sum("plays"))
+                .values("total")
+            )
+            updated += model.objects.filter(
+                Q(**{f"{column}__gt": 0}) | Q(pk__in=window.values(field))
+            ).update(
+                **{
+                    column: Coalesce(
+                        Subquery(total, output_field=models.BigIntegerField()),
+                        Value(0),
+                    )
+                }
+            )
+    return updated
+
+
+def _rollup_hour(redis, bucket, from_history=False):
+    # Хэш не удаляется: он нужен для пересвёртки и истекает сам (HOUR_KEY_TIMEOUT)
+    key = _hour_key(bucket)
+    counts = _hour_from_history(bucket) if from_history else _hour_from_redis(redis, key)
+
+    refs = Track.objects.filter(pk__in=list(counts)).values_list(
+        "pk", "album_id", "artist_id"
+    )
+    rows = [
+        TrackListenHourly(
+            track_id=pk,
+            album_id=album_id,
+            artist_id=artist_id,
+            bucket=bucket,
+            plays=counts[pk],
+        )
+        for pk, album_id, artist_id in refs
+    ]
+    with transaction.atomic():
+        TrackListenHourly.objects.bulk_create(
+            rows,
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["track", "bucket"],
+            update_fields=["plays", "album", "artist"],
+        )
+        # Отметка не уходит назад при пересвёртке опоздавших часов
+        RollupCheckpoint.objects.filter(
+            name=HOURLY_CHECKPOINT, position__lt=bucket + HOUR
+        ).update(position=bucket + HOUR)
+
+
+def _hour_from_redis(redis, key):
+    raw = redis.hgetall(key)
+    return {int(track_id): int(count) for track_id, count in raw.items()}
+
+
+def _hour_from_history(bucket):
+    return dict(
+        ListeningEvent.objects.filter(
+            listened_at__gte=bucket, listened_at__lt=bucket + HOUR
+        )
+        .values("track_id")
+        .annotate(plays=Count("id"))
+        .values_list("track_id", "plays")
+    )
+
+
+def _rollup_day(day):
+    start = _day_start(day)
+    totals = (
+        TrackListenHourly.objects.filter(bucket__gte=start, bucket__lt=start + timedelta(days=1))
+        .values("track_id")
+        .annotate(total=Sum("plays"), last_album=Max("album_id"), last_artist=Max("artist_id"))
+        .values_list("track_id", "total", "last_album", "last_artist")
+    )
+    rows = [
+        TrackListenDaily(
+            track_id=track_id,
+            album_id=album_id,
+            artist_id=artist_id,
+            day=day,
+            plays=plays,
+        )
+        for track_id, plays, album_id, artist_id in totals
+    ]
+    TrackListenDaily.objects.bulk_create(
+        rows,
+        batch_size=BULK_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["track", "day"],
+        update_fields=["plays", "album", "artist"],
+    )
+
+
+def _initial_hour(end):
+    since = end - timedelta(days=BACKFILL_DAYS)
+    first = (
+        ListeningEvent.objects.filter(listened_at__gte=since, listened_at__lt=end)
+        .order_by("listened_at")
+        .values_list("listened_at", flat=True)
+        .first()
+    )
+    return _truncate_hour(first) if first else end
+
+
+def _first_hourly_day():
+    first = TrackListenHourly.objects.order_by("bucket").values_list("bucket", flat=True).first()
+    return first.astimezone(dt_timezone.utc).date() if first else None
+
+
+def _get_checkpoint(name):
+    return (
+        RollupCheckpoint.objects.filter(name=name)
+        .values_list("position", flat=True)
+        .first()
+    )
+
+
+def _set_checkpoint(name, position):
+    RollupCheckpoint.objects.update_or_create(name=name, defaults={"position": position})
+
+
+def _truncate_hour(value):
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _day_start(day):
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def _hour_key(bucket):
+    return f"musics:listens:hour:{bucket:%Y%m%d%H}"
+
+
+__all__ = [
+    "record",
+    "rollup_hours",
+    "rollup_days",
+    "refresh_rolling_counts",
+]
@@ -0,0 +1,414 @@
+import secrets
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from apps.musics.models import (
+    Genre,
+    Like,
+    ListeningHistory,
+    Playlist,
+    PlaylistTrack,
+    Track,
+    TrackItemNeighbors,
+    TrackNeighbors,
+)
+from apps.shared.utils.text import fold
+from .playlists import ORDER_GAP
+from .recommendations import HISTORY_WEIGHT, LIKE_WEIGHT, RECENCY_DECAY
+
+MIXES_PER_USER = getattr(settings, "MUSICS_MIXES_PER_USER", 3)
+MIX_SIZE = getattr(settings, "MUSICS_MIX_SIZE", 30)
+# Сколько знакомых треков пользователя кладётся в подборку (остальное — новое)
+SEEDS_PER_MIX = 10
+# Активный пользователь — слушал что-то за последние ACTIVE_DAYS дней
+ACTIVE_DAYS = 30
+# Из какого периода брать историю для подборок
+HISTORY_DAYS = 90
+RECENT_HISTORY = 200
+USER_BATCH_SIZE = 200
+MIX_SHARDS = getattr(settings, "MUSICS_MIX_SHARDS", 8)
+SYSTEM_USERNAME = getattr(settings, "MUSICS_SYSTEM_USERNAME", "tracks")
+# Подборки пересобираются раз в сутки, кэш живёт чуть дольше
+CACHE_TIMEOUT = 60 * 60 * 26
+
+
+def mixes_cache_key(user_id):
+    return f"musics:mixes:{user_id}"
+
+
+def get_user_mixes(user):
+    """
+    Готовые подборки пользователя: [{id, slug, name, description, track_ids}].
+    Из кэша, иначе из сохранённых плейлистов — без какого-либо расчёта.
+    """
+    key = mixes_cache_key(user.pk)
+    mixes = cache.get(key)
+    if mixes is None:
+        playlists = (
+            Playlist.objects.filter(kind=Playlist.KindChoices.DAILY_MIX, generated_for=user)
+            .order_by("mix_index")
+            .prefetch_related("playlist_tracks")
+        )
+        mixes = [
+            _mix_payload(playlist, [pt.track_id for pt in playlist.playlist_tracks.all()])
+            for playlist in playlists
+        ]
+        cache.set(key, mixes, timeout=CACHE_TIMEOUT)
+    return mixes
+
+
+def active_user_ids(shard=0, shards=1, batch_size=USER_BATCH_SIZE):
+    """
+    Порции id пользователей шарда (id % shards == shard), слушавших недавно.
+    Пользователи идут keyset-ом по pk, активность порции проверяется одним
+    запросом по индексу (user, listened_at) истории — без DISTINCT по журналу.
+    """
+    since = timezone.now() - timezone.timedelta(days=ACTIVE_DAYS)
+    users = (
+        get_user_model()
+        .objects.annotate(shard=F("pk") % shards)
+        .filter(shard=shard)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    last_id = 0
+    batch = []
+    while True:
+        user_ids = list(users.filter(pk__gt=last_id)[:batch_size])
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+        active = set(
+            ListeningHistory.objects.filter(user_id__in=user_ids, listened_at__gte=since)
+            .order_by()
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+        batch.extend(user_id for user_id in user_ids if user_id in active)
+        if len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+    if batch:
+        yield batch
+
+
+def generate_shard(shard=0, shards=1):
+    """Собирает подборки для всех активных пользователей шарда. Возвращает число пользователей."""
+    total = 0
+    for user_ids in active_user_ids(shard, shards):
+        generate_for_users(user_ids)
+        total += len(user_ids)
+    return total
+
+
+def prune_inactive(shard=0, shards=1, batch_size=USER_BATCH_SIZE):
+    """
+    Удаляет подборки пользователей шарда, переставших быть активными
+    (их generate_shard больше не обходит), и их кэш. Возвращает число пользователей.
+    """
+    since = timezone.now() - timezone.timedelta(days=ACTIVE_DAYS)
+    stale = (
+        Playlist.objects.filter(kind=Playlist.KindChoices.DAILY_MIX)
+        .annotate(shard=F("generated_for_id") % shards)
+        .filter(shard=shard)
+        .exclude(
+            Exists(
+                ListeningHistory.objects.filter(
+                    user_id=OuterRef("generated_for_id"), listened_at__gte=since
+                )
+            )
+        )
+        .order_by("generated_for_id")
+        .values_list("generated_for_id", flat=True)
+        .distinct()
+    )
+    pruned = 0
+    while True:
+        user_ids = list(stale[:batch_size])
+        if not user_ids:
+            return pruned
+        # Каскад от плейлистов: playlist_track_removed счётчики не трогает
+        Playlist.objects.filter(
+            kind=Playlist.KindChoices.DAILY_MIX, generated_for_id__in=user_ids
+        ).delete()
+        cache.delete_many([mixes_cache_key(user_id) for user_id in user_ids])
+        pruned += len(user_ids)
+
+
+def generate_for_users(user_ids):
+    """
+    Подборки для порции пользователей: по одной на любимый жанр
+    (до MIXES_PER_USER). Знакомые треки жанра + их соседи (item-item CF
+    и по признакам) + популярное в жанре на добор. Всё читается и
+    пишется пачками на всю порцию.
+    """
+    seeds = _load_seeds(user_ids)
+    seed_ids = {track_id for weights in seeds.values() for track_id in weights}
+    genres_by_track = _genres_by_track(seed_ids)
+
+    plans = {}
+    for user_id, weights in seeds.items():
+        plans[user_id] = _plan_mixes(weights, genres_by_track)
+
+    planned_seeds = {
+        track_id for mixes in plans.values() for _, mix_seeds in mixes for track_id in mix_seeds
+    }
+    neighbors = _load_neighbors(planned_seeds)
+    candidate_ids = {track_id for rows in neighbors.values() for track_id, _ in rows}
+    genres_by_track.update(_genres_by_track(candidate_ids - set(genres_by_track)))
+
+    popular = {}
+    mixes = {}
+    for user_id, user_plans in plans.items():
+        used = set()
+        user_mixes = []
+        for genre_id, mix_seeds in user_plans:
+            if genre_id is not None and genre_id not in popular:
+                popular[genre_id] = list(
+                    Track.objects.filter(is_published=True, genres=genre_id)
+                    .order_by("-plays_count")
+                    .values_list("pk", flat=True)[: MIX_SIZE * 2]
+                )
+            track_ids = _fill_mix(
+                mix_seeds,
+                seeds[user_id],
+                neighbors,
+                genres_by_track,
+                genre_id,
+                popular.get(genre_id, []),
+                used,
+            )
+            if track_ids:
+                used.update(track_ids)
+                user_mixes.append((genre_id, track_ids))
+        mixes[user_id] = user_mixes
+
+    _save_mixes(user_ids, mixes)
+    return mixes
+
+
+def _load_seeds(user_ids):
+    """{user_id: {track_id: вес}} из недавней истории и лайков (с затуханием по давности)."""
+    since = timezone.now() - timezone.timedelta(days=HISTORY_DAYS)
+    seeds = {user_id: defaultdict(float) for user_id in user_ids}
+    positions = defaultdict(int)
+    sources = (
+        (
+            ListeningHistory.objects.filter(user_id__in=user_ids, listened_at__gte=since)
+            .order_by("user_id", "-listened_at")
+            .values_list("user_id", "track_id"),
+            HISTORY_WEIGHT,
+        ),
+        (
+            Like.objects.filter(user_id__in=user_ids)
+            .order_by("user_id", "-created_at")
+            .values_list("user_id", "track_id"),
+            LIKE_WEIGHT,
+        ),
+    )
+    for pairs, weight in sources:
+        positions.clear()
+        for user_id, track_id in pairs:
+            position = positions[user_id]
+            if position >= RECENT_HISTORY:
+                continue
+            positions[user_id] += 1
+            seeds[user_id][track_id] += weight * RECENCY_DECAY**position
+
+    published = set(
+        Track.objects.filter(
+            is_published=True,
+            pk__in={track_id for weights in seeds.values() for track_id in weights},
+        ).values_list("pk", flat=True)
+    )
+    return {
+        user_id: {t: w for t, w in weights.items() if t in published}
+        for user_id, weights in seeds.items()
+    }
+
+
+def _genres_by_track(track_ids):
+    genres = defaultdict(set)
+    if track_ids:
+        pairs = Track.genres.through.objects.filter(track_id__in=track_ids).values_list(
+            "track_id", "genre_id"
+        )
+        for track_id, genre_id in pairs:
+            genres[track_id].add(genre_id)
+    return genres
+
+
+def _plan_mixes(weights, genres_by_track):
+    """[(genre_id, [seed_ids])] по убыванию веса жанра; без жанров — одна общая подборка."""
+    genre_weights = defaultdict(float)
+    for track_id, weight in weights.items():
+        for genre_id in genres_by_track.get(track_id, ()):
+            genre_weights[genre_id] += weight
+
+    by_weight = sorted(weights, key=weights.get, reverse=True)
+    if not genre_weights:
+        return [(None, by_weight[:SEEDS_PER_MIX])] if by_weight else []
+
+    top_genres = sorted(genre_weights, key=genre_weights.get, reverse=True)[:MIXES_PER_USER]
+    return [
+        (
+            genre_id,
+            [t for t in by_weight if genre_id in genres_by_track.get(t, ())][:SEEDS_PER_MIX],
+        )
+        for genre_id in top_genres
+    ]
+
+
+def _load_neighbors(track_ids):
+    """{track_id: [(neighbor_id, сходство)]} из обеих таблиц соседей, CF — первыми."""
+    neighbors = defaultdict(list)
+    if not track_ids:
+        return neighbors
+    for model in (TrackItemNeighbors, TrackNeighbors):
+        rows = model.objects.filter(track_id__in=track_ids).values_list(
+            "track_id", "neighbor_ids", "scores"
+        )
+        for track_id, neighbor_ids, scores in rows:
+            neighbors[track_id].extend(zip(neighbor_ids, scores))
+    return neighbors
+
+
+def _fill_mix(mix_seeds, weights, neighbors, genres_by_track, genre_id, popular, used):
+    """Треки подборки: новое по сумме сходств с затравками, через каждые два — знакомый."""
+    scores = defaultdict(float)
+    for seed_id in mix_seeds:
+        for neighbor_id, similarity in neighbors.get(seed_id, ()):
+            if genre_id is None or genre_id in genres_by_track.get(neighbor_id, ()):
+                scores[neighbor_id] += weights[seed_id] * similarity
+
+    excluded = used | set(weights)
+    fresh = [t for t in sorted(scores, key=scores.get, reverse=True) if t not in excluded]
+    fresh += [t for t in popular if t not in excluded and t not in scores]
+    familiar = [t for t in mix_seeds if t not in used]
+
+    track_ids = []
+    while len(track_ids) < MIX_SIZE and (fresh or familiar):
+        take_familiar = familiar and (not fresh or len(track_ids) % 3 == 2)
+        track_ids.append((familiar if take_familiar else fresh).pop(0))
+    return track_ids
+
+
+def _save_mixes(user_ids, mixes):
+    """Плейлисты подборок (создаются/обновляются/удаляются) и их треки — bulk-операциями."""
+    system_user = get_system_user()
+    genre_names = dict(
+        Genre.objects.filter(
+            pk__in={g for user_mixes in mixes.values() for g, _ in user_mixes if g}
+        ).values_list("pk", "name")
+    )
+    # Соседи посчитаны ночью — трек мог с тех пор пропасть или сняться с публикации
+    durations = dict(
+        Track.objects.filter(
+            is_published=True,
+            pk__in={t for user_mixes in mixes.values() for _, ids in user_mixes for t in ids},
+        ).values_list("pk", "duration")
+    )
+
+    with transaction.atomic():
+        existing = {
+            (playlist.generated_for_id, playlist.mix_index): playlist
+            for playlist in Playlist.objects.select_for_update().filter(
+                kind=Playlist.KindChoices.DAILY_MIX, generated_for_id__in=user_ids
+            )
+        }
+        now = timezone.now()
+        keep, to_create, to_update = {}, [], []
+        for user_id, user_mixes in mixes.items():
+            for index, (genre_id, track_ids) in enumerate(user_mixes, start=1):
+                track_ids = [t for t in track_ids if t in durations]
+                playlist = existing.get((user_id, index))
+                if playlist is None:
+                    playlist = Playlist(
+                        owner=system_user,
+                        generated_for_id=user_id,
+                        kind=Playlist.KindChoices.DAILY_MIX,
+                        mix_index=index,
+                        # Неугадываемый slug: по id пользователя чужую подборку не найти
+                        slug=f"daily-mix-{secrets.token_hex(6)}",
+                        is_public=False,
+                    )
+                    to_create.append(playlist)
+                else:
+                    to_update.append(playlist)
+                playlist.name = f"Daily Mix {index}"
+                playlist.search_key = fold(playlist.name)
+                playlist.description = genre_names.get(genre_id, "")
+                playlist.total_duration = sum(durations.get(t, 0) for t in track_ids)
+                playlist.tracks_count = len(track_ids)
+                playlist.updated_at = now
+                keep[(user_id, index)] = (playlist, track_ids)
+
+        Playlist.objects.filter(
+            pk__in=[p.pk for key, p in existing.items() if key not in keep]
+        ).delete()
+        Playlist.objects.bulk_create(to_create)
+        # Счётчики пишутся целиком ниже: playlist_track_removed эти строки пропускает
+        old_rows = PlaylistTrack.objects.filter(playlist__in=[p for p, _ in keep.values()])
+        old_rows.counters_applied = True
+        old_rows.delete()
+        PlaylistTrack.objects.bulk_create(
+            [
+                PlaylistTrack(playlist=playlist, track_id=track_id, order=position * ORDER_GAP)
+                for playlist, track_ids in keep.values()
+                for position, track_id in enumerate(track_ids, start=1)
+            ],
+            batch_size=1000,
+        )
+        Playlist.objects.bulk_update(
+            to_update,
+            ["name", "search_key", "description", "total_duration", "tracks_count", "updated_at"],
+        )
+
+    payloads = defaultdict(list)
+    for (user_id, _), (playlist, track_ids) in sorted(keep.items()):
+        payloads[user_id].append(_mix_payload(playlist, track_ids))
+    cache.set_many(
+        {mixes_cache_key(user_id): payloads.get(user_id, []) for user_id in user_ids},
+        timeout=CACHE_TIMEOUT,
+    )
+
+
+def get_system_user():
+    """Владелец системных плейлистов (не может войти)."""
+    user, created = get_user_model().objects.get_or_create(
+        username=SYSTEM_USERNAME,
+        defaults={"email": f"{SYSTEM_USERNAME}@system.invalid", "is_active": False},
+    )
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=["password"])
+    return user
+
+
+def _mix_payload(playlist, track_ids):
+    return {
+        "id": playlist.pk,
+        "slug": playlist.slug,
+        "name": playlist.name,
+        "description": playlist.description,
+        "track_ids": list(track_ids),
+    }
+
+
+__all__ = [
+    "MIXES_PER_USER",
+    "MIX_SHARDS",
+    "mixes_cache_key",
+    "get_user_mixes",
+    "active_user_ids",
+    "generate_shard",
+    "prune_inactive",
+    "generate_for_users",
+    "get_system_user",
+]
@@ -0,0 +1,192 @@
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.musics.models import Like, ListeningEvent, Track, TrackNeighbors
+from apps.shared.utils.text import fold
+
+NEIGHBORS_COUNT = getattr(settings, "MUSICS_NEIGHBORS_COUNT", 20)
+# Окно совместных прослушиваний
+CO_LISTEN_DAYS = getattr(settings, "MUSICS_NEIGHBORS_CO_LISTEN_DAYS", 90)
+# Слушатели хэшируются в столько корзин (feature hashing): вектор трека
+# фиксированной длины, а косинус по нему приближает пересечение аудиторий
+LISTENER_BUCKETS = 256
+# Вес каждого блока признаков (блоки нормируются по отдельности)
+WEIGHTS = {
+    "genres": 1.0,
+    "mood": 0.5,
+    "language": 0.5,
+    "bpm": 0.3,
+    "duration": 0.2,
+    "listeners": 1.5,
+}
+# Сколько float32 держать в памяти на один блок произведения матриц
+SIMILARITY_BLOCK = 2**24
+BULK_BATCH_SIZE = 1000
+
+
+def compute_neighbors(k=NEIGHBORS_COUNT):
+    """
+    Пересчитывает TrackNeighbors для всех опубликованных треков:
+    векторы признаков -> косинусное сходство блоками -> top-k на строку.
+    Возвращает количество обработанных треков.
+    """
+    track_ids, features = build_features()
+    if not track_ids:
+        return 0
+
+    neighbors, scores = top_k(features, k)
+    return save_neighbors(
+        TrackNeighbors,
+        (
+            (track_id, [track_ids[j] for j in row], row_scores)
+            for track_id, row, row_scores in zip(track_ids, neighbors, scores)
+        ),
+    )
+
+
+def save_neighbors(model, rows):
+    """
+    Upsert строк (track_id, neighbor_ids, scores) в таблицу соседей model
+    и удаление строк, не обновлённых этим проходом (трек снят/пропал).
+    """
+    now = timezone.now()
+    objects = [
+        model(
+            track_id=track_id,
+            neighbor_ids=list(neighbor_ids),
+            scores=[round(float(score), 4) for score in scores],
+            computed_at=now,
+        )
+        for track_id, neighbor_ids, scores in rows
+    ]
+    with transaction.atomic():
+        model.objects.bulk_create(
+            objects,
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["track"],
+            update_fields=["neighbor_ids", "scores", "computed_at"],
+        )
+        model.objects.exclude(computed_at=now).delete()
+    return len(objects)
+
+
+def build_features():
+    """(track_ids, матрица N x D float32 с нормированными строками)."""
+    tracks = list(
+        Track.objects.filter(is_published=True)
+        .order_by("pk")
+        .values_list("pk", "bpm", "duration", "mood", "language")
+    )
+    if not tracks:
+        return [], None
+
+    track_ids = [row[0] for row in tracks]
+    index = {track_id: i for i, track_id in enumerate(track_ids)}
+    n = len(track_ids)
+
+    genre_pairs = Track.genres.through.objects.filter(track_id__in=track_ids).values_list(
+        "track_id", "genre_id"
+    )
+    blocks = {
+        "genres": _multi_hot(n, [(index[t], g) for t, g in genre_pairs if t in index]),
+        "mood": _multi_hot(n, [(i, fold(row[3])) for i, row in enumerate(tracks) if row[3]]),
+        "language": _multi_hot(
+            n, [(i, fold(row[4])) for i, row in enumerate(tracks) if row[4]]
+        ),
+        "bpm": _angular(np.array([row[1] or np.nan for row in tracks], dtype=np.float32)),
+        "duration": _angular(
+            np.log1p(np.array([row[2] or np.nan for row in tracks], dtype=np.float32))
+        ),
+        "listeners": _listener_block(index),
+    }
+    features = np.hstack(
+        [_normalize_rows(block) * WEIGHTS[name] for name, block in blocks.items()]
+    )
+    return track_ids, _normalize_rows(features)
+
+
+def top_k(features, k):
+    """Индексы и сходство k ближайших строк для каждой строки (себя не считаем)."""
+    n = features.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return [[] for _ in range(n)], [[] for _ in range(n)]
+
+    block_rows = max(1, SIMILARITY_BLOCK // n)
+    neighbors = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float32)
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        similarity = features[start:stop] @ features.T
+        similarity[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        part = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(similarity, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+        neighbors[start:stop] = np.take_along_axis(part, order, axis=1)
+        scores[start:stop] = np.take_along_axis(part_scores, order, axis=1)
+
+    # Нулевое сходство — не сосед (трек без признаков)
+    keep = scores > 0
+    return (
+        [row[mask].tolist() for row, mask in zip(neighbors, keep)],
+        [row[mask].tolist() for row, mask in zip(scores, keep)],
+    )
+
+
+def _listener_block(index):
+    """Слушатели и лайкнувшие трек, хэшированные в LISTENER_BUCKETS корзин."""
+    since = timezone.now() - timezone.timedelta(days=CO_LISTEN_DAYS)
+    block = np.zeros((len(index), LISTENER_BUCKETS), dtype=np.float32)
+    sources = (
+        ListeningEvent.objects.filter(listened_at__gte=since).values_list("track_id", "user_id"),
+        Like.objects.values_list("track_id", "user_id"),
+    )
+    for pairs in sources:
+        for track_id, user_id in pairs.iterator(chunk_size=10000):
+            row = index.get(track_id)
+            if row is not None:
+                block[row, _bucket(user_id)] += 1
+    # Заядлый слушатель не должен перевешивать остальных
+    return np.log1p(block)
+
+
+def _bucket(user_id):
+    return zlib.crc32(str(user_id).encode()) % LISTENER_BUCKETS
+
+
+def _multi_hot(n, pairs):
+    values = sorted({value for _, value in pairs}, key=str)
+    columns = {value: j for j, value in enumerate(values)}
+    block = np.zeros((n, len(values)), dtype=np.float32)
+    for row, value in pairs:
+        block[row, columns[value]] = 1.0
+    return block
+
+
+def _angular(values):
+    """
+    Число -> точка на четверти окружности: косинус двух таких точек тем
+    больше, чем ближе значения (одну колонку нормировка строк бы обнулила).
+    Пропуски — среднее.
+    """
+    if np.isnan(values).all():
+        return np.zeros((len(values), 0), dtype=np.float32)
+    low, high = np.nanmin(values), np.nanmax(values)
+    values = np.where(np.isnan(values), np.nanmean(values), values)
+    scaled = (values - low) / (high - low) if high > low else np.zeros_like(values)
+    angle = scaled * (np.pi / 2)
+    return np.column_stack([np.cos(angle), np.sin(angle)]).astype(np.float32)
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+__all__ = ["NEIGHBORS_COUNT", "compute_neighbors", "save_neighbors", "build_features", "top_k"]
@@ -0,0 +1,144 @@
+"""
+Помесячные партиции журнала прослушиваний (PostgreSQL, PARTITION BY RANGE).
+Таблица переводится в партиционированную миграцией 0015; на SQLite
+все функции ничего не делают.
+"""
+
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.musics.models import ListeningEvent
+
+PARENT_TABLE = ListeningEvent._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+ARCHIVE_SCHEMA = getattr(settings, "MUSICS_PARTITION_ARCHIVE_SCHEMA", "musics_archive")
+_PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def is_supported():
+    return connection.vendor == "postgresql"
+
+
+def is_partitioned():
+    if not is_supported():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def list_partitions():
+    """[(имя, первый день месяца)] присоединённых помесячных партиций по возрастанию."""
+    if not is_supported():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s",
+            [PARENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def ensure_partitions(months_ahead=3, start=None):
+    """Создаёт недостающие партиции от start (по умолчанию — текущий месяц) на months_ahead вперёд."""
+    if not is_partitioned():
+        return []
+
+    month = _month_start(start or timezone.now().date())
+    existing = {name for name, _ in list_partitions()}
+    created = []
+    for _ in range(months_ahead + 1):
+        name = partition_name(month)
+        if name not in existing:
+            _create_partition(month)
+            created.append(name)
+        month = _add_months(month, 1)
+    return created
+
+
+def expire_partitions(retain_months, mode="detach"):
+    """
+    Убирает партиции старше retain_months месяцев — вместо DELETE по журналу.
+    mode: detach — отсоединить (таблица остаётся), archive — отсоединить и
+    перенести в схему ARCHIVE_SCHEMA, drop — удалить.
+    """
+    if mode not in ("detach", "archive", "drop"):
+        raise ValueError(f"Unknown partition expire mode: {mode}")
+    if not is_partitioned():
+        return []
+
+    cutoff = _add_months(_month_start(timezone.now().date()), -retain_months)
+    expired = [name for name, month in list_partitions() if month < cutoff]
+    for name in expired:
+        with transaction.atomic():
+            _execute(f"ALTER TABLE {_quote(PARENT_TABLE)} DETACH PARTITION {_quote(name)}")
+            if mode == "archive":
+                _execute(f"CREATE SCHEMA IF NOT EXISTS {_quote(ARCHIVE_SCHEMA)}")
+                _execute(f"ALTER TABLE {_quote(name)} SET SCHEMA {_quote(ARCHIVE_SCHEMA)}")
+            elif mode == "drop":
+                _execute(f"DROP TABLE {_quote(name)}")
+    return expired
+
+
+def _create_partition(month):
+    # Границы в DDL нельзя передать параметрами — подставляем литералы из дат
+    _execute(
+        f"CREATE TABLE IF NOT EXISTS {_quote(partition_name(month))} "
+        f"PARTITION OF {_quote(PARENT_TABLE)} "
+        f"FOR VALUES FROM ('{_month_start_ts(month)}') "
+        f"TO ('{_month_start_ts(_add_months(month, 1))}')"
+    )
+
+
+def _execute(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _month_start_ts(month):
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+__all__ = [
+    "DEFAULT_PARTITION",
+    "is_supported",
+    "is_partitioned",
+    "partition_name",
+    "list_partitions",
+    "ensure_partitions",
+    "expire_partitions",
+]
@@ -0,0 +1,402 @@
+"""
+Порядок треков в плейлисте с промежутками (gap-based ordering).
+
+Соседние PlaylistTrack.order отстоят на ORDER_GAP, поэтому вставка и
+перенос меняют order только у перемещаемых строк: новое значение берётся
+между соседями. Когда промежуток исчерпан, плейлист перенумеровывается
+целиком (редко: после ~log2(ORDER_GAP) вставок в одно и то же место).
+
+Там же счётчики плейлиста (tracks_count, total_duration, followers_count):
+change_counters() — инкрементально, repair_counters() — сверка с
+фактическими данными.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from apps.musics.models import Playlist, PlaylistTrack, Track
+from apps.musics.signals.responses import schedule_invalidate
+
+ORDER_GAP = getattr(settings, "MUSICS_PLAYLIST_ORDER_GAP", 1024)
+# PositiveIntegerField в PostgreSQL — integer
+ORDER_MAX = 2**31 - 1
+BULK_BATCH_SIZE = 1000
+
+
+def add_tracks(playlist, track_ids, position=None, user=None):
+    """
+    Добавляет треки блоком перед позицией position (0 — в начало,
+    None — в конец). Уже имеющиеся в плейлисте пропускаются.
+    Возвращает созданные PlaylistTrack.
+    """
+    with transaction.atomic():
+        _lock(playlist)
+        existing = set(
+            PlaylistTrack.objects.filter(playlist=playlist, track_id__in=track_ids).values_list(
+                "track_id", flat=True
+            )
+        )
+        new_ids = [track_id for track_id in dict.fromkeys(track_ids) if track_id not in existing]
+        if not new_ids:
+            return []
+        orders = _allocate(playlist, position, len(new_ids))
+        rows = PlaylistTrack.objects.bulk_create(
+            [
+                PlaylistTrack(playlist=playlist, track_id=track_id, order=order, added_by=user)
+                for track_id, order in zip(new_ids, orders)
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        # bulk_create мимо сигналов — счётчики здесь же, в той же транзакции
+        change_counters(
+            [playlist.pk], tracks=len(new_ids), duration=published_duration(new_ids)
+        )
+        _touch(playlist)
+    return rows
+
+
+def remove_tracks(playlist, track_ids):
+    """Убирает треки; порядок остальных не меняется. Возвращает число удалённых."""
+    with transaction.atomic():
+        _lock(playlist)
+        deleted = _delete_rows(
+            playlist, PlaylistTrack.objects.filter(playlist=playlist, track_id__in=track_ids)
+        )
+        if deleted:
+            _touch(playlist)
+    return deleted
+
+
+def clear_tracks(playlist):
+    """Убирает все треки плейлиста. Возвращает число удалённых."""
+    with transaction.atomic():
+        _lock(playlist)
+        deleted = _delete_rows(playlist, PlaylistTrack.objects.filter(playlist=playlist))
+        if deleted:
+            _touch(playlist)
+    return deleted
+
+
+def move_tracks(playlist, track_ids, position=None):
+    """
+    Переносит треки блоком (в порядке track_ids) на позицию position в
+    списке без них самих. Отсутствующие в плейлисте игнорируются.
+    Возвращает перенесённые PlaylistTrack.
+    """
+    with transaction.atomic():
+        _lock(playlist)
+        rows = {
+            row.track_id: row
+            for row in PlaylistTrack.objects.filter(playlist=playlist, track_id__in=track_ids)
+        }
+        moving = [rows[track_id] for track_id in dict.fromkeys(track_ids) if track_id in rows]
+        if not moving:
+            return []
+        orders = _allocate(playlist, position, len(moving), exclude=[row.pk for row in moving])
+        for row, order in zip(moving, orders):
+            row.order = order
+        PlaylistTrack.objects.bulk_update(moving, ["order"], batch_size=BULK_BATCH_SIZE)
+        _touch(playlist)
+    return moving
+
+
+def set_tracks(playlist, track_ids, user=None):
+    """
+    Заменяет список треков целиком (track_ids в PUT/PATCH плейлиста).
+    Строки, уже стоящие в нужном относительном порядке (наибольшая
+    возрастающая подпоследовательность), не трогаются: меняются только
+    удалённые, добавленные и переставленные.
+    """
+    track_ids = list(dict.fromkeys(track_ids))
+    with transaction.atomic():
+        _lock(playlist)
+        current = {
+            row.track_id: row
+            for row in PlaylistTrack.objects.filter(playlist=playlist).only(
+                "pk", "playlist_id", "track_id", "order"
+            )
+        }
+        wanted = set(track_ids)
+        removed = [row.pk for track_id, row in current.items() if track_id not in wanted]
+        if removed:
+            _delete_rows(playlist, PlaylistTrack.objects.filter(pk__in=removed))
+
+        kept = _longest_increasing([current[t] for t in track_ids if t in current])
+        orders = _orders_around(track_ids, {row.track_id: row.order for row in kept})
+        if orders is None:
+            orders = _spread(len(track_ids))
+
+        created, changed = [], []
+        for track_id, order in zip(track_ids, orders):
+            row = current.get(track_id)
+            if row is None:
+                created.append(
+                    PlaylistTrack(playlist=playlist, track_id=track_id, order=order, added_by=user)
+                )
+            elif row.order != order:
+                row.order = order
+                changed.append(row)
+        PlaylistTrack.objects.bulk_create(created, batch_size=BULK_BATCH_SIZE)
+        PlaylistTrack.objects.bulk_update(changed, ["order"], batch_size=BULK_BATCH_SIZE)
+        if created:
+            added = [row.track_id for row in created]
+            change_counters([playlist.pk], tracks=len(added), duration=published_duration(added))
+        if removed or created or changed:
+            _touch(playlist)
+
+
+def change_counters(playlist_ids, tracks=0, duration=0, followers=0):
+    """
+    Сдвигает счётчики плейлистов на дельты одним UPDATE (вызывать в
+    транзакции изменения). Ниже нуля не уходят — расхождение, если
+    оно всё же возникло, чинит repair_counters().
+    """
+    deltas = {"tracks_count": tracks, "total_duration": duration, "followers_count": followers}
+    changes = {
+        field: Greatest(F(field) + Value(delta), Value(0))
+        for field, delta in deltas.items()
+        if delta
+    }
+    if changes and playlist_ids:
+        Playlist.objects.filter(pk__in=playlist_ids).update(**changes)
+        # update() мимо post_save: ответы со счётчиками сбрасываем сами
+        schedule_invalidate("playlists")
+
+
+def published_duration(track_ids):
+    """Суммарная длительность опубликованных треков (total_duration считает только их)."""
+    if not track_ids:
+        return 0
+    return (
+        Track.objects.filter(pk__in=track_ids, is_published=True).aggregate(
+            total=Sum("duration")
+        )["total"]
+        or 0
+    )
+
+
+def counter_expressions():
+    """Фактические значения счётчиков — подзапросами, для update()/annotate()."""
+
+    def subquery(queryset, aggregate):
+        return Coalesce(
+            Subquery(
+                queryset.filter(playlist=OuterRef("pk"))
+                .order_by()
+                .values("playlist")
+                .annotate(value=aggregate)
+                .values("value")
+            ),
+            0,
+        )
+
+    return {
+        "tracks_count": subquery(PlaylistTrack.objects.all(), Count("pk")),
+        "total_duration": subquery(
+            PlaylistTrack.objects.filter(track__is_published=True), Sum("track__duration")
+        ),
+        "followers_count": subquery(Playlist.followers.through.objects.all(), Count("pk")),
+    }
+
+
+def refresh_counters(queryset, fields=None):
+    """Пересчитывает счётчики плейлистов queryset целиком (пакетные правки, смена трека)."""
+    expressions = counter_expressions()
+    updated = queryset.update(
+        **{field: expressions[field] for field in fields or expressions}
+    )
+    schedule_invalidate("playlists")
+    return updated
+
+
+def repair_counters(fix=True, chunk_size=1000):
+    """
+    Сверяет счётчики всех плейлистов с фактическими данными порциями по
+    chunk_size. Возвращает [(playlist_id, {поле: (было, должно быть)})];
+    при fix=True расхождения исправляются.
+    """
+    expressions = counter_expressions()
+    annotations = {f"actual_{field}": expression for field, expression in expressions.items()}
+    mismatches = []
+    last_pk = 0
+    while True:
+        rows = list(
+            Playlist.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .annotate(**annotations)
+            .values("pk", *expressions, *annotations)[:chunk_size]
+        )
+        if not rows:
+            return mismatches
+        last_pk = rows[-1]["pk"]
+        broken = []
+        for row in rows:
+            diff = {
+                field: (row[field], row[f"actual_{field}"])
+                for field in expressions
+                if row[field] != row[f"actual_{field}"]
+            }
+            if diff:
+                mismatches.append((row["pk"], diff))
+                broken.append(row["pk"])
+        if fix and broken:
+            with transaction.atomic():
+                refresh_counters(Playlist.objects.filter(pk__in=broken))
+            schedule_invalidate("playlists")
+
+
+def _allocate(playlist, position, count, exclude=()):
+    """count значений order для блока на позиции position (см. add_tracks)."""
+    rows = (
+        PlaylistTrack.objects.filter(playlist=playlist)
+        .exclude(pk__in=exclude)
+        .order_by("order", "pk")
+        .values_list("order", flat=True)
+    )
+    if position is None or position > 0:
+        neighbours = list(rows[position - 1 : position + 1]) if position else []
+        if not neighbours:
+            # В конец: за последней строкой
+            lo, hi = rows.aggregate(last=Max("order"))["last"] or 0, None
+        else:
+            lo, hi = neighbours[0], (neighbours[1] if len(neighbours) > 1 else None)
+    else:
+        lo, hi = 0, rows.first()
+
+    orders = _between(lo, hi, count)
+    if orders is None:
+        orders = _renumber(playlist, exclude, position, count)
+    return orders
+
+
+def _between(lo, hi, count):
+    """count возрастающих целых строго между lo и hi (hi=None — без верхней границы) или None."""
+    if hi is None:
+        orders = [lo + ORDER_GAP * i for i in range(1, count + 1)]
+        return orders if orders[-1] <= ORDER_MAX else None
+    step = (hi - lo) // (count + 1)
+    if step < 1:
+        return None
+    return [lo + step * i for i in range(1, count + 1)]
+
+
+def _renumber(playlist, exclude, position, count):
+    """Перенумеровывает плейлист с шагом ORDER_GAP, оставив count мест на позиции position."""
+    rows = list(
+        PlaylistTrack.objects.filter(playlist=playlist)
+        .exclude(pk__in=exclude)
+        .order_by("order", "pk")
+        .only("pk", "order")
+    )
+    position = len(rows) if position is None else min(position, len(rows))
+    orders = _spread(len(rows) + count)
+    block = orders[position : position + count]
+    changed = []
+    for row, order in zip(rows, orders[:position] + orders[position + count :]):
+        if row.order != order:
+            row.order = order
+            changed.append(row)
+    PlaylistTrack.objects.bulk_update(changed, ["order"], batch_size=BULK_BATCH_SIZE)
+    return block
+
+
+def _spread(count):
+    gap = min(ORDER_GAP, ORDER_MAX // (count + 1))
+    return [gap * i for i in range(1, count + 1)]
+
+
+def _orders_around(track_ids, anchors):
+    """
+    order для track_ids: у якорей (anchors: track_id -> order) прежние,
+    остальные — между соседними якорями. None, если где-то не хватило места.
+    """
+    orders = [anchors.get(track_id) for track_id in track_ids]
+    start = 0
+    while start < len(orders):
+        if orders[start] is not None:
+            start += 1
+            continue
+        end = start
+        while end < len(orders) and orders[end] is None:
+            end += 1
+        lo = orders[start - 1] if start else 0
+        hi = orders[end] if end < len(orders) else None
+        run = _between(lo, hi, end - start)
+        if run is None:
+            return None
+        orders[start:end] = run
+        start = end
+    return orders
+
+
+def _longest_increasing(rows):
+    """Наибольшая подпоследовательность rows со строго возрастающим order (O(n log n))."""
+    tails, tail_orders, previous = [], [], [None] * len(rows)
+    for i, row in enumerate(rows):
+        lo, hi = 0, len(tail_orders)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tail_orders[mid] < row.order:
+                lo = mid + 1
+            else:
+                hi = mid
+        previous[i] = tails[lo - 1] if lo else None
+        if lo == len(tails):
+            tails.append(i)
+            tail_orders.append(row.order)
+        else:
+            tails[lo] = i
+            tail_orders[lo] = row.order
+    result = []
+    i = tails[-1] if tails else None
+    while i is not None:
+        result.append(rows[i])
+        i = previous[i]
+    return result[::-1]
+
+
+def _delete_rows(playlist, rows):
+    """
+    Удаляет PlaylistTrack queryset-а rows одного плейлиста и сдвигает его
+    счётчики одной суммарной дельтой. Возвращает число удалённых строк.
+    """
+    totals = rows.aggregate(
+        tracks=Count("pk"),
+        duration=Sum("track__duration", filter=Q(track__is_published=True)),
+    )
+    if not totals["tracks"]:
+        return 0
+    # playlist_track_removed пропускает строки, посчитанные здесь
+    rows.counters_applied = True
+    rows.delete()
+    change_counters([playlist.pk], tracks=-totals["tracks"], duration=-(totals["duration"] or 0))
+    return totals["tracks"]
+
+
+def _lock(playlist):
+    # Параллельные правки одного плейлиста иначе получат одинаковые order
+    list(Playlist.objects.select_for_update().filter(pk=playlist.pk).values_list("pk", flat=True))
+
+
+def _touch(playlist):
+    # bulk_create/bulk_update не шлют post_save — кэш ответов сбрасываем сами
+    Playlist.objects.filter(pk=playlist.pk).update(updated_at=timezone.now())
+    schedule_invalidate("playlists")
+
+
+__all__ = [
+    "ORDER_GAP",
+    "add_tracks",
+    "remove_tracks",
+    "move_tracks",
+    "set_tracks",
+    "clear_tracks",
+    "change_counters",
+    "published_duration",
+    "counter_expressions",
+    "refresh_counters",
+    "repair_counters",
+]
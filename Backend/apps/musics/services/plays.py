@@ -0,0 +1,136 @@
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+
+from apps.musics.models import Album, Artist, Track
+from apps.musics.services import counters, leaderboards
+from apps.musics.signals.responses import COUNTER_TAGS
+from apps.shared.cache import invalidate_tags
+from apps.shared.utils.redis import get_redis_connection
+
+PLAY_BUFFER_KEY = "musics:plays:buffer"
+TRACK_REF_TIMEOUT = 60 * 60
+
+TrackRef = namedtuple("TrackRef", ["track_id", "album_id", "artist_id"])
+
+
+def get_track_ref(slug):
+    """id трека, альбома и артиста по slug (кэшируется, чтобы play() не ходил в БД)."""
+    key = _ref_key(slug)
+    ref = cache.get(key)
+    if ref is None:
+        ref = (
+            Track.objects.filter(slug=slug, is_published=True)
+            .values_list("id", "album_id", "artist_id")
+            .first()
+        )
+        if ref is None:
+            return None
+        cache.set(key, tuple(ref), timeout=TRACK_REF_TIMEOUT)
+    return TrackRef(*ref)
+
+
+def forget_track_ref(*slugs):
+    """Сбрасывает кэшированные ссылки get_track_ref (правка или удаление трека)."""
+    cache.delete_many([_ref_key(slug) for slug in dict.fromkeys(slugs) if slug])
+
+
+def record_play(ref):
+    """
+    Регистрирует прослушивание: счётчик трека растёт в Redis (services.counters),
+    а событие дописывается в буфер, который flush_play_events применяет пачкой
+    к альбомам и артистам. Без Redis (dev/тесты) всё применяется сразу.
+    Возвращает текущее число прослушиваний трека.
+    """
+    plays_count = counters.incr(ref.track_id, "plays")
+    redis = get_redis_connection()
+    if redis is None:
+        apply_play_deltas(*_aggregate([ref]))
+        return Track.objects.filter(pk=ref.track_id).values_list("plays_count", flat=True).first()
+    redis.rpush(PLAY_BUFFER_KEY, _encode(ref))
+    return plays_count
+
+
+def flush_play_buffer(batch_size=None):
+    """Забирает до batch_size событий из буфера и применяет их. Возвращает число событий."""
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+
+    batch_size = batch_size or getattr(settings, "MUSICS_PLAY_FLUSH_BATCH", 5000)
+    pipe = redis.pipeline()
+    pipe.lrange(PLAY_BUFFER_KEY, 0, batch_size - 1)
+    pipe.ltrim(PLAY_BUFFER_KEY, batch_size, -1)
+    raw, _ = pipe.execute()
+    if not raw:
+        return 0
+
+    deltas = _aggregate(_decode(item) for item in raw)
+    try:
+        apply_play_deltas(*deltas)
+    except Exception:
+        # Возвращаем события в буфер, чтобы не потерять прослушивания
+        redis.rpush(PLAY_BUFFER_KEY, *raw)
+        raise
+    leaderboards.record("plays", *deltas)
+    return len(raw)
+
+
+@transaction.atomic
+def apply_play_deltas(track_deltas, album_deltas, artist_deltas):
+    """
+    Один UPDATE на таблицу: plays_count = plays_count + CASE id WHEN ... END.
+    Track.plays_count сюда не входит — его синхронизирует reconcile_counters().
+    """
+    _bulk_increment(Album, "plays_count", album_deltas)
+    _bulk_increment(Artist, "total_plays", artist_deltas)
+    invalidate_tags(COUNTER_TAGS[Album], COUNTER_TAGS[Artist])
+
+
+def _bulk_increment(model, field, deltas):
+    if not deltas:
+        return 0
+    delta = Case(
+        *[When(pk=pk, then=Value(count)) for pk, count in deltas.items()],
+        default=Value(0),
+        output_field=models.BigIntegerField(),
+    )
+    return model.objects.filter(pk__in=list(deltas)).update(**{field: F(field) + delta})
+
+
+def _aggregate(refs):
+    tracks, albums, artists = Counter(), Counter(), Counter()
+    for ref in refs:
+        tracks[ref.track_id] += 1
+        if ref.album_id:
+            albums[ref.album_id] += 1
+        artists[ref.artist_id] += 1
+    return tracks, albums, artists
+
+
+def _ref_key(slug):
+    return f"track_ref_{slug}"
+
+
+def _encode(ref):
+    return f"{ref.track_id}:{ref.album_id or ''}:{ref.artist_id}"
+
+
+def _decode(raw):
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    track_id, album_id, artist_id = raw.split(":")
+    return TrackRef(int(track_id), int(album_id) if album_id else None, int(artist_id))
+
+
+__all__ = [
+    "TrackRef",
+    "get_track_ref",
+    "forget_track_ref",
+    "record_play",
+    "flush_play_buffer",
+    "apply_play_deltas",
+]
@@ -0,0 +1,60 @@
+from collections import defaultdict
+
+from apps.musics.models import Like, ListeningHistory, Track, TrackItemNeighbors
+
+# Вклад прослушивания и лайка — и в матрицу пользователь x трек, и в скоринг
+HISTORY_WEIGHT = 1.0
+LIKE_WEIGHT = 2.0
+# Сколько последних прослушиваний/лайков пользователя берётся в расчёт
+RECENT_HISTORY = 50
+# Вес i-го по давности трека: RECENCY_DECAY ** i
+RECENCY_DECAY = 0.95
+
+
+def recommend(user, limit=20):
+    """
+    Рекомендации по последним прослушиваниям и лайкам пользователя:
+    сумма сходств их соседей (TrackItemNeighbors, services.collaborative)
+    с затуханием по давности. Запросы только индексные (история, лайки,
+    соседи по pk) + гидрация. Уже знакомые треки исключаются.
+    Возвращает список треков (пустой, если сигналов нет).
+    """
+    recent = list(
+        ListeningHistory.objects.filter(user=user)
+        .order_by("-listened_at")
+        .values_list("track_id", flat=True)[:RECENT_HISTORY]
+    )
+    liked = list(
+        Like.objects.filter(user=user)
+        .order_by("-created_at")
+        .values_list("track_id", flat=True)[:RECENT_HISTORY]
+    )
+    seeds = defaultdict(float)
+    for position, track_id in enumerate(recent):
+        seeds[track_id] += HISTORY_WEIGHT * RECENCY_DECAY**position
+    for position, track_id in enumerate(liked):
+        seeds[track_id] += LIKE_WEIGHT * RECENCY_DECAY**position
+    if not seeds:
+        return []
+
+    scores = defaultdict(float)
+    neighbor_rows = TrackItemNeighbors.objects.filter(track_id__in=list(seeds)).values_list(
+        "track_id", "neighbor_ids", "scores"
+    )
+    for track_id, neighbor_ids, similarities in neighbor_rows:
+        for neighbor_id, similarity in zip(neighbor_ids, similarities):
+            scores[neighbor_id] += seeds[track_id] * similarity
+
+    for track_id in seeds:
+        scores.pop(track_id, None)
+    ranked = sorted(scores, key=scores.get, reverse=True)[: limit * 2]
+    found = (
+        Track.objects.filter(is_published=True)
+        .select_related("artist", "album")
+        .prefetch_related("genres")
+        .in_bulk(ranked)
+    )
+    return [found[pk] for pk in ranked if pk in found][:limit]
+
+
+__all__ = ["HISTORY_WEIGHT", "LIKE_WEIGHT", "recommend"]
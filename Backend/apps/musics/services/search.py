@@ -0,0 +1,73 @@
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+from apps.musics.models import Album, Artist, Track
+from apps.shared.filters.search import SEARCH_CONFIG, fulltext_search
+
+# Свёрнутые ключи для contains, когда полнотекстовый поиск недоступен (SQLite)
+FALLBACK_FIELDS = {
+    Track: ("search_key", "artist__search_key", "album__search_key"),
+    Artist: ("search_key",),
+    Album: ("search_key", "artist__search_key"),
+}
+
+
+def search(queryset, query):
+    """Полнотекстовый поиск с ранжированием (или contains по search_key без PostgreSQL)."""
+    return fulltext_search(queryset, query, fallback_fields=FALLBACK_FIELDS[queryset.model])
+
+
+def build_vector(model):
+    """
+    Выражение tsvector для модели. Имена индексируются вместе с search_key
+    (транслит), чтобы кириллица и латиница находили друг друга.
+    Связанные имена берутся подзапросами, потому что UPDATE в Django не умеет JOIN.
+    """
+    if model is Track:
+        return (
+            _vector(_own_name(), "A")
+            + _vector(_related_name(Artist, "artist_id"), "B")
+            + _vector(_related_name(Album, "album_id"), "C")
+            + _vector("lyrics", "D")
+        )
+    if model is Album:
+        return (
+            _vector(_own_name(), "A")
+            + _vector(_related_name(Artist, "artist_id"), "B")
+            + _vector("description", "D")
+        )
+    if model is Artist:
+        return _vector(_own_name(), "A") + _vector("bio", "D")
+    raise ValueError(f"No search vector for {model.__name__}")
+
+
+def refresh_vectors(queryset):
+    """Один UPDATE ... SET search_vector = ... для строк queryset (только PostgreSQL)."""
+    if connection.vendor != "postgresql":
+        return 0
+    return queryset.update(search_vector=build_vector(queryset.model))
+
+
+def schedule_refresh(queryset):
+    """Пересчитать векторы после коммита текущей транзакции."""
+    if connection.vendor != "postgresql":
+        return
+    transaction.on_commit(lambda: refresh_vectors(queryset))
+
+
+def _vector(expression, weight):
+    return SearchVector(expression, weight=weight, config=SEARCH_CONFIG)
+
+
+def _own_name():
+    return Concat("name", Value(" "), "search_key")
+
+
+def _related_name(model, fk):
+    names = model.objects.filter(pk=OuterRef(fk)).annotate(full_name=_own_name())
+    return Subquery(names.values("full_name")[:1])
+
+
+__all__ = ["search", "build_vector", "refresh_vectors", "schedule_refresh"]
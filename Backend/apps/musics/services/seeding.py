@@ -0,0 +1,741 @@
+"""
+Генерация больших объёмов тестовых данных (seed_music --high-volume).
+
+Строки генерируются пачками в пуле процессов (Faker медленный), а
+основной процесс сразу льёт каждую пачку в таблицу через COPY FROM STDIN
+(PostgreSQL) или executemany на остальных бэкендах. id выдаются заранее
+диапазонами, поэтому внешние ключи известны без повторных запросов.
+
+Популярность треков и активность пользователей — по Зипфу: лайки,
+история и прослушивания сосредоточены на небольшой «голове», как в проде.
+"""
+
+import io
+import itertools
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+from faker import Faker
+
+from apps.musics.models import (
+    Album,
+    Artist,
+    Genre,
+    Like,
+    ListeningEvent,
+    ListeningHistory,
+    Playlist,
+    PlaylistTrack,
+    Track,
+)
+from apps.musics.services import autocomplete, partitions, search
+from apps.musics.services.playlists import ORDER_GAP
+from apps.shared.utils.text import fold
+
+GENRES = ["pop", "rock", "electronic", "hiphop", "jazz", "classical", "indie"]
+DEFAULT_PASSWORD = "password"
+# Сколько пачек держать в полёте на воркер: больше — лишняя память
+INFLIGHT_PER_WORKER = 2
+# Активность пользователей распределена площе популярности треков:
+# при том же показателе один пользователь набирал бы заметную долю всей истории
+USER_ACTIVITY_EXPONENT = 0.6
+# Раундов добора уникальных пар (пользователь, трек) для лайков и истории
+UNIQUE_PAIR_ATTEMPTS = 4
+# Модели с search_vector и строк на один его UPDATE
+SEARCH_MODELS = (Artist, Album, Track)
+SEARCH_CHUNK_SIZE = 10_000
+
+# Общие для воркеров массивы (наследуются при fork, см. BulkSeeder._map)
+_context = {}
+_tables = {}
+
+
+class CopyTable:
+    """
+    Строки модели в формате для COPY (text) или executemany.
+    Колонки, не переданные в render(), получают default поля
+    (auto_now/auto_now_add — момент генерации).
+    """
+
+    def __init__(self, model, vendor, now, include_pk=True):
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if include_pk or not field.primary_key
+        ]
+        self.table = model._meta.db_table
+        self.columns = [field.column for field in fields]
+        self.vendor = vendor
+        self._index = {field.attname: i for i, field in enumerate(fields)}
+        self._defaults = [self._cell(_field_default(field, now)) for field in fields]
+
+    def render(self, n, columns):
+        cells = [itertools.repeat(value, n) for value in self._defaults]
+        for name, values in columns.items():
+            cells[self._index[name]] = self._column(values)
+        rows = zip(*cells)
+        if self.vendor == "postgresql":
+            return "".join("\t".join(row) + "\n" for row in rows)
+        return list(rows)
+
+    def _column(self, values):
+        if not isinstance(values, np.ndarray):
+            return [self._cell(value) for value in values]
+        if values.dtype.kind == "M":
+            if np.datetime_data(values.dtype)[0] == "D":
+                return values.astype(str).tolist()
+            text = np.datetime_as_string(values, unit="s")
+            suffix = "+00" if self.vendor == "postgresql" else ""
+            return [value.replace("T", " ") + suffix for value in text.tolist()]
+        if self.vendor != "postgresql":
+            return values.tolist()
+        if values.dtype.kind == "b":
+            return np.where(values, "t", "f").tolist()
+        return values.astype(str).tolist()
+
+    def _cell(self, value):
+        if self.vendor == "postgresql":
+            return _copy_text(value)
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if isinstance(value, datetime):
+            # Как DatabaseOperations.adapt_datetimefield_value для SQLite
+            return value.astimezone(dt_timezone.utc).replace(tzinfo=None).isoformat(" ")
+        return value
+
+
+class BulkSeeder:
+    """
+    Один прогон high-volume генерации: counts — сколько чего создать
+    (users, artists, albums, tracks, playlists, playlist_tracks, likes,
+    history, events).
+    """
+
+    def __init__(
+        self,
+        counts,
+        chunk_size=100_000,
+        workers=None,
+        zipf=1.1,
+        days=90,
+        seed=None,
+        log=None,
+    ):
+        self.counts = counts
+        self.chunk_size = max(chunk_size, 1)
+        self.workers = os.cpu_count() if workers is None else workers
+        self.zipf = zipf
+        self.days = days
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.rng = np.random.default_rng(self.seed)
+        self.log = log or (lambda message: None)
+        self.vendor = connection.vendor
+        self.now = timezone.now().replace(microsecond=0)
+        self.ids = {}
+
+    def run(self):
+        User = get_user_model()
+        for model in (User, Artist, Album, Track, Playlist):
+            self.ids[model] = _next_id(model), self.counts[_COUNT_NAMES[model]]
+        self._build_context()
+
+        for kind in ("users", "artists", "albums", "tracks", "playlists"):
+            self._stage(kind)
+        for model in (User, Artist, Album, Track, Playlist):
+            self._reset_sequence(model)
+
+        likes = self._per_user_stage("likes", self.counts["likes"])
+        history = self._per_user_stage("history", self.counts["history"])
+        if self.counts["events"]:
+            first_month = (self.now - timedelta(days=self.days)).date()
+            months = (self.now.year - first_month.year) * 12 + self.now.month - first_month.month
+            partitions.ensure_partitions(months_ahead=months, start=first_month)
+        events = self._per_user_stage("events", self.counts["events"])
+
+        # Счётчики — ровно по созданным строкам (plays — по журналу, а без
+        # него по истории), чтобы rebuild/reconcile ничего не «исправляли»
+        plays = events if self.counts["events"] else history
+        self._write_counters(plays, likes)
+
+        refresh_search_indexes(
+            {
+                model: (first, first + count - 1)
+                for model, (first, count) in self.ids.items()
+                if model in SEARCH_MODELS and count
+            },
+            log=self.log,
+        )
+
+    def _build_context(self):
+        User = get_user_model()
+        rng = self.rng
+        user_start, users = self.ids[User]
+        artist_start, artists = self.ids[Artist]
+        album_start, albums = self.ids[Album]
+        track_start, tracks = self.ids[Track]
+
+        artist_owner = user_start + rng.integers(0, users, artists)
+        album_artist = rng.integers(0, artists, albums)
+        # 80% треков в альбомах (артист — артист альбома), остальные — синглы
+        track_album = np.where(
+            rng.random(tracks) < 0.8 if albums else np.zeros(tracks, bool),
+            rng.integers(0, max(albums, 1), tracks),
+            -1,
+        )
+        track_artist = np.where(
+            track_album >= 0,
+            album_artist[np.maximum(track_album, 0)] if albums else 0,
+            rng.integers(0, artists, tracks),
+        )
+        genre_ids = [Genre.objects.get_or_create(name=name)[0].pk for name in GENRES]
+
+        _context.clear()
+        _context.update(
+            seed=self.seed,
+            vendor=self.vendor,
+            now=self.now,
+            days=self.days,
+            password=make_password(DEFAULT_PASSWORD),
+            staff_id=user_start if not User.objects.filter(is_staff=True).exists() else -1,
+            user_start=user_start,
+            users=users,
+            artist_start=artist_start,
+            album_start=album_start,
+            track_start=track_start,
+            artist_owner=artist_owner,
+            album_artist=album_artist,
+            track_album=track_album,
+            track_artist=track_artist,
+            track_duration=rng.integers(60, 421, tracks),
+            genre_ids=np.array(genre_ids),
+            track_cdf=_zipf_cdf(tracks, self.zipf, rng),
+            playlist_tracks=min(self.counts["playlist_tracks"], tracks),
+        )
+        self.user_weights = np.diff(_zipf_cdf(users, USER_ACTIVITY_EXPONENT, rng), prepend=0.0)
+
+    def _stage(self, kind):
+        """Сущности с заранее выданными id: пачки по chunk_size подряд."""
+        model = _STAGE_MODELS[kind]
+        start, total = self.ids[model]
+        tasks = [
+            (kind, chunk, {"start": start + offset, "count": min(self.chunk_size, total - offset)})
+            for chunk, offset in enumerate(range(0, total, self.chunk_size))
+        ]
+        for table, rows in self._consume(tasks).items():
+            self.log(f"Created {rows} rows in {table}")
+
+    def _per_user_stage(self, kind, total):
+        """likes/history/events: пачки по диапазонам пользователей, пары (user, track) — внутри пачки."""
+        tracks = self.ids[Track][1]
+        counts = np.zeros(tracks, np.int64)
+        if not total:
+            return counts
+        per_user = self.rng.multinomial(total, self.user_weights)
+        cumulative = np.cumsum(per_user)
+        bounds = np.searchsorted(
+            cumulative, np.arange(self.chunk_size, total, self.chunk_size), side="right"
+        )
+        bounds = np.unique(np.concatenate([[0], bounds, [len(per_user)]]))
+        tasks = [
+            (kind, chunk, {"first": int(lo), "per_user": per_user[lo:hi]})
+            for chunk, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:]))
+            if per_user[lo:hi].sum()
+        ]
+        for table, rows in self._consume(tasks, counts).items():
+            self.log(f"Created {rows} rows in {table}")
+        return counts
+
+    def _consume(self, tasks, counts=None):
+        written = {}
+        for payloads, stats in self._map(tasks):
+            for table, columns, payload in payloads:
+                written[table] = written.get(table, 0) + _write(table, columns, payload)
+            if counts is not None and stats is not None:
+                counts += stats
+        return written
+
+    def _map(self, tasks):
+        """Результаты _generate(task) по порядку; не больше INFLIGHT_PER_WORKER пачек на воркер в памяти."""
+        if self.workers <= 1 or len(tasks) <= 1:
+            yield from map(_generate, tasks)
+            return
+        # Воркеры получают _context через fork; соединение с БД им не нужно
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(self.workers, mp_context=context) as executor:
+            pending = deque()
+            for task in tasks:
+                pending.append(executor.submit(_generate, task))
+                if len(pending) >= self.workers * INFLIGHT_PER_WORKER:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _write_counters(self, plays, likes):
+        track_start, tracks = self.ids[Track]
+        if not tracks:
+            return
+        ids = np.arange(track_start, track_start + tracks)
+        _update_columns(Track, ids, {"plays_count": plays, "likes_count": likes})
+
+        track_album = _context["track_album"]
+        in_album = track_album >= 0
+        album_start, albums = self.ids[Album]
+        if albums:
+            _update_columns(
+                Album,
+                np.arange(album_start, album_start + albums),
+                {
+                    "plays_count": np.bincount(track_album[in_album], plays[in_album], albums),
+                    "likes_count": np.bincount(track_album[in_album], likes[in_album], albums),
+                },
+            )
+        artist_start, artists = self.ids[Artist]
+        track_artist = _context["track_artist"]
+        _update_columns(
+            Artist,
+            np.arange(artist_start, artist_start + artists),
+            {
+                "total_plays": np.bincount(track_artist, plays, artists),
+                "total_likes": np.bincount(track_artist, likes, artists),
+            },
+        )
+        self.log("Updated play and like counters")
+
+    def _reset_sequence(self, model):
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
+
+
+def refresh_search_indexes(ranges, chunk_size=SEARCH_CHUNK_SIZE, log=None):
+    """
+    COPY и bulk_create не вызывают save(), поэтому после загрузки:
+    search_vector — UPDATE-ами по диапазонам pk ({модель: (первый, последний)}),
+    подсказки — полной пересборкой (популярность уже посчитана).
+    """
+    log = log or (lambda message: None)
+    for model in SEARCH_MODELS:
+        if model not in ranges:
+            continue
+        first, last = ranges[model]
+        refreshed = 0
+        for start in range(first, last + 1, chunk_size):
+            refreshed += search.refresh_vectors(
+                model.objects.filter(pk__gte=start, pk__lt=min(start + chunk_size, last + 1))
+            )
+        if refreshed:
+            log(f"Refreshed search vectors for {refreshed} {model._meta.verbose_name_plural}")
+    indexed = {entity: autocomplete.rebuild(entity) for entity in autocomplete.ENTITIES}
+    if any(indexed.values()):
+        log("Rebuilt autocomplete: " + ", ".join(f"{n} {e}" for e, n in indexed.items()))
+
+
+# ---------------------------------------------------------------------------
+# Воркеры: строки одной пачки
+# ---------------------------------------------------------------------------
+
+
+def _generate(task):
+    """(kind, chunk, params) -> ([(таблица, колонки, payload)], статистика по трекам или None)."""
+    kind, chunk, params = task
+    rng = np.random.default_rng([_context["seed"], _KINDS.index(kind), chunk])
+    fake = Faker()
+    fake.seed_instance(int(rng.integers(2**32)))
+    parts, stats = _GENERATORS[kind](rng, fake, **params)
+    payloads = []
+    for (model, include_pk), n, columns in parts:
+        table = _table(model, include_pk)
+        payloads.append((table.table, table.columns, table.render(n, columns)))
+    return payloads, stats
+
+
+def _users(rng, fake, start, count):
+    ids = np.arange(start, start + count)
+    usernames = [f"{fake.user_name()}{pk}"[:150] for pk in ids.tolist()]
+    return [
+        (
+            (get_user_model(), True),
+            count,
+            {
+                "id": ids,
+                "username": usernames,
+                "email": [f"{username}@example.com" for username in usernames],
+                "password": [_context["password"]] * count,
+                "first_name": [fake.first_name() for _ in range(count)],
+                "last_name": [fake.last_name() for _ in range(count)],
+                "is_staff": ids == _context["staff_id"],
+            },
+        )
+    ], None
+
+
+def _artists(rng, fake, start, count):
+    ids = np.arange(start, start + count)
+    names = [fake.company()[:200] for _ in range(count)]
+    offset = start - _context["artist_start"]
+    return [
+        (
+            (Artist, True),
+            count,
+            {
+                "id": ids,
+                "name": names,
+                "slug": _slugs(names, ids),
+                "search_key": [fold(name) for name in names],
+                "owner_id": _context["artist_owner"][offset : offset + count],
+                "bio": [fake.text(max_nb_chars=200) for _ in range(count)],
+            },
+        )
+    ], None
+
+
+def _albums(rng, fake, start, count):
+    ids = np.arange(start, start + count)
+    names = [fake.sentence(nb_words=3).rstrip(".")[:200] for _ in range(count)]
+    offset = start - _context["album_start"]
+    artists = _context["album_artist"][offset : offset + count]
+    released = np.datetime64(_context["now"].date()) - rng.integers(0, 5 * 365, count).astype(
+        "timedelta64[D]"
+    )
+    return [
+        (
+            (Album, True),
+            count,
+            {
+                "id": ids,
+                "name": names,
+                "slug": _slugs(names, ids),
+                "search_key": [fold(name) for name in names],
+                "artist_id": _context["artist_start"] + artists,
+                "owner_id": _context["artist_owner"][artists],
+                "release_date": released,
+                "is_published": np.ones(count, bool),
+            },
+        )
+    ], None
+
+
+def _tracks(rng, fake, start, count):
+    ids = np.arange(start, start + count)
+    offset = start - _context["track_start"]
+    window = slice(offset, offset + count)
+    artists = _context["track_artist"][window]
+    albums = _context["track_album"][window]
+    # Имя уникально в пределах артиста (unique_track_per_artist) — с id надёжнее
+    names = [
+        f"{fake.sentence(nb_words=4).rstrip('.')[:190]} {pk}" for pk in ids.tolist()
+    ]
+    album_start = _context["album_start"]
+
+    genre_ids = _context["genre_ids"]
+    per_track = rng.integers(1, 3, count)
+    track_ids = np.repeat(ids, per_track)
+    picks = np.concatenate(
+        [rng.choice(len(genre_ids), size=k, replace=False) for k in per_track.tolist()]
+    )
+    return [
+        (
+            (Track, True),
+            count,
+            {
+                "id": ids,
+                "name": names,
+                "slug": _slugs(names, ids),
+                "search_key": [fold(name) for name in names],
+                "artist_id": _context["artist_start"] + artists,
+                "owner_id": _context["artist_owner"][artists],
+                "album_id": [
+                    album_start + album if album >= 0 else None for album in albums.tolist()
+                ],
+                "duration": _context["track_duration"][window],
+                "is_published": np.ones(count, bool),
+            },
+        ),
+        (
+            (Track.genres.through, False),
+            len(track_ids),
+            {"track_id": track_ids, "genre_id": genre_ids[picks]},
+        ),
+    ], None
+
+
+def _playlists(rng, fake, start, count):
+    ids = np.arange(start, start + count)
+    names = [fake.sentence(nb_words=3).rstrip(".")[:200] for _ in range(count)]
+    owners = _context["user_start"] + _user_picks(rng, count)
+    size = _context["playlist_tracks"]
+
+    playlist_ids, track_ids, orders, durations = [], [], [], []
+    for pk in ids.tolist():
+        picked = _unique_in_order(_track_picks(rng, size * 2))[:size]
+        playlist_ids.append(np.full(len(picked), pk))
+        track_ids.append(picked)
+        orders.append(np.arange(1, len(picked) + 1) * ORDER_GAP)
+        durations.append(_context["track_duration"][picked].sum())
+    track_ids = np.concatenate(track_ids) if track_ids else np.array([], np.int64)
+    playlist_ids = np.concatenate(playlist_ids) if playlist_ids else track_ids
+    added_by = np.repeat(owners, [len(chunk) for chunk in orders]) if orders else track_ids
+    return [
+        (
+            (Playlist, True),
+            count,
+            {
+                "id": ids,
+                "name": names,
+                "slug": _slugs(names, ids),
+                "search_key": [fold(name) for name in names],
+                "owner_id": owners,
+                "is_public": rng.random(count) > 0.3,
+                "total_duration": np.array(durations, np.int64),
+                "tracks_count": np.array([len(chunk) for chunk in orders], np.int64),
+            },
+        ),
+        (
+            (PlaylistTrack, False),
+            len(track_ids),
+            {
+                "playlist_id": playlist_ids,
+                "track_id": _context["track_start"] + track_ids,
+                "order": np.concatenate(orders) if orders else track_ids,
+                "added_by_id": added_by,
+            },
+        ),
+    ], None
+
+
+def _likes(rng, fake, first, per_user):
+    users, tracks = _unique_pairs(rng, first, per_user)
+    return [
+        (
+            (Like, False),
+            len(users),
+            {
+                "user_id": _context["user_start"] + users,
+                "track_id": _context["track_start"] + tracks,
+                "created_at": _moments(rng, len(users)),
+            },
+        )
+    ], _track_counts(tracks)
+
+
+def _history(rng, fake, first, per_user):
+    users, tracks = _unique_pairs(rng, first, per_user)
+    return [
+        (
+            (ListeningHistory, False),
+            len(users),
+            {
+                "user_id": _context["user_start"] + users,
+                "track_id": _context["track_start"] + tracks,
+                "listened_at": _moments(rng, len(users)),
+                "duration": _listened(rng, tracks),
+            },
+        )
+    ], _track_counts(tracks)
+
+
+def _events(rng, fake, first, per_user):
+    users = np.repeat(np.arange(first, first + len(per_user)), per_user)
+    tracks = _track_picks(rng, len(users))
+    return [
+        (
+            (ListeningEvent, False),
+            len(users),
+            {
+                "user_id": _context["user_start"] + users,
+                "track_id": _context["track_start"] + tracks,
+                "listened_at": _moments(rng, len(users)),
+                "duration": _listened(rng, tracks),
+            },
+        )
+    ], _track_counts(tracks)
+
+
+_GENERATORS = {
+    "users": _users,
+    "artists": _artists,
+    "albums": _albums,
+    "tracks": _tracks,
+    "playlists": _playlists,
+    "likes": _likes,
+    "history": _history,
+    "events": _events,
+}
+_KINDS = list(_GENERATORS)
+_STAGE_MODELS = {
+    "users": get_user_model(),
+    "artists": Artist,
+    "albums": Album,
+    "tracks": Track,
+    "playlists": Playlist,
+    "likes": Like,
+    "history": ListeningHistory,
+    "events": ListeningEvent,
+}
+_COUNT_NAMES = {model: kind for kind, model in _STAGE_MODELS.items()}
+
+
+# ---------------------------------------------------------------------------
+# Вспомогательное
+# ---------------------------------------------------------------------------
+
+
+def _zipf_cdf(n, exponent, rng):
+    """Функция распределения Зипфа на n элементах; ранги перемешаны, чтобы «хиты» не шли подряд по id."""
+    if not n:
+        return np.array([])
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    weights = weights[rng.permutation(n)]
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def _track_picks(rng, size):
+    cdf = _context["track_cdf"]
+    return np.minimum(np.searchsorted(cdf, rng.random(size)), len(cdf) - 1)
+
+
+def _user_picks(rng, size):
+    return rng.integers(0, _context["users"], size)
+
+
+def _unique_in_order(values):
+    _, first = np.unique(values, return_index=True)
+    return values[np.sort(first)]
+
+
+def _unique_pairs(rng, first, per_user):
+    """
+    Пары (пользователь, трек) без повторов. Дубли от Зипфа добираются
+    повторными выборками, последняя — равномерная, чтобы не упираться в «голову».
+    """
+    tracks_total = len(_context["track_cdf"])
+    users = np.arange(first, first + len(per_user))
+    wanted = np.minimum(per_user, tracks_total)
+    keys = np.array([], np.int64)
+    for attempt in range(UNIQUE_PAIR_ATTEMPTS):
+        have = np.bincount(keys // tracks_total - first, minlength=len(users))
+        missing = wanted - have
+        if not missing.any():
+            break
+        if attempt < UNIQUE_PAIR_ATTEMPTS - 1:
+            picks = _track_picks(rng, missing.sum())
+        else:
+            picks = rng.integers(0, tracks_total, missing.sum())
+        keys = np.union1d(keys, np.repeat(users, missing) * tracks_total + picks)
+    return keys // tracks_total, keys % tracks_total
+
+
+def _moments(rng, size):
+    now = np.datetime64(_context["now"].replace(tzinfo=None), "s")
+    seconds = rng.integers(0, _context["days"] * 86400, size)
+    return now - seconds.astype("timedelta64[s]")
+
+
+def _listened(rng, tracks):
+    durations = _context["track_duration"][tracks]
+    return rng.integers(10, np.maximum(durations, 11))
+
+
+def _track_counts(tracks):
+    return np.bincount(tracks, minlength=len(_context["track_cdf"]))
+
+
+def _slugs(names, ids):
+    # slug как в save() моделей (bulk-вставка его не вызывает), уникальность — по id
+    return [f"{slugify(name)[:200] or 'item'}-{pk}" for name, pk in zip(names, ids.tolist())]
+
+
+def _table(model, include_pk):
+    key = (model._meta.label, include_pk)
+    if key not in _tables:
+        _tables[key] = CopyTable(model, _context["vendor"], _context["now"], include_pk)
+    return _tables[key]
+
+
+def _field_default(field, now):
+    if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+        return now
+    return field.get_default()
+
+
+def _copy_text(value):
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _write(table, columns, payload):
+    quote = connection.ops.quote_name
+    names = ", ".join(quote(column) for column in columns)
+    with connection.cursor() as cursor:
+        if isinstance(payload, str):
+            if payload:
+                cursor.copy_expert(f"COPY {quote(table)} ({names}) FROM STDIN", io.StringIO(payload))
+            return payload.count("\n")
+        if payload:
+            placeholders = ", ".join(["%s"] * len(columns))
+            cursor.executemany(
+                f"INSERT INTO {quote(table)} ({names}) VALUES ({placeholders})", payload
+            )
+        return len(payload)
+
+
+def _update_columns(model, ids, columns):
+    """UPDATE по id большими порциями: через временную таблицу на PostgreSQL."""
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    names = list(columns)
+    values = [np.asarray(columns[name], np.int64) for name in names]
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "CREATE TEMP TABLE seed_counters (id bigint PRIMARY KEY, "
+                + ", ".join(f"{quote(name)} bigint" for name in names)
+                + ") ON COMMIT DROP"
+            )
+            rows = np.column_stack([ids, *values]).astype(str)
+            cursor.copy_expert(
+                "COPY seed_counters FROM STDIN",
+                io.StringIO("".join("\t".join(row) + "\n" for row in rows.tolist())),
+            )
+            assignments = ", ".join(f"{quote(name)} = c.{quote(name)}" for name in names)
+            cursor.execute(f"UPDATE {table} t SET {assignments} FROM seed_counters c WHERE t.id = c.id")
+            return
+        assignments = ", ".join(f"{quote(name)} = %s" for name in names)
+        cursor.executemany(
+            f"UPDATE {table} SET {assignments} WHERE id = %s",
+            zip(*(column.tolist() for column in values), ids.tolist()),
+        )
+
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+
+__all__ = ["BulkSeeder", "CopyTable", "refresh_search_indexes"]
@@ -0,0 +1,36 @@
+from apps.musics.models import Album, Artist, Genre
+from apps.shared.cache import TieredCache
+
+# Краткие представления сущностей, которые вкладываются в ответы о треках
+# и альбомах. Меняются редко — держим в памяти процесса (TieredCache)
+SUMMARY_CACHES = {
+    Artist: TieredCache("summaries:artists"),
+    Album: TieredCache("summaries:albums"),
+    Genre: TieredCache("summaries:genres"),
+}
+
+
+def get_summaries(serializer_class, ids):
+    """
+    {pk: serializer_class(obj).data} для ids. Сериализуется без request,
+    поэтому ссылки на файлы — относительные (см. SummaryField).
+    """
+    model = serializer_class.Meta.model
+    prefix = f"{serializer_class.__module__}.{serializer_class.__qualname__}"
+    keys = {f"{prefix}:{pk}": pk for pk in ids}
+
+    def load(missing):
+        objects = model._default_manager.filter(pk__in=[keys[key] for key in missing])
+        return {f"{prefix}:{obj.pk}": dict(serializer_class(obj).data) for obj in objects}
+
+    found = SUMMARY_CACHES[model].get_many(list(keys), load)
+    return {keys[key]: data for key, data in found.items()}
+
+
+def invalidate_summaries(model):
+    cache = SUMMARY_CACHES.get(model)
+    if cache is not None:
+        cache.invalidate()
+
+
+__all__ = ["SUMMARY_CACHES", "get_summaries", "invalidate_summaries"]
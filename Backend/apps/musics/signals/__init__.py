@@ -0,0 +1,6 @@
+from .autocomplete import *  # noqa
+from .search import *  # noqa
+from .responses import *  # noqa
+from .summaries import *  # noqa
+from .playlists import *  # noqa
+from .plays import *  # noqa
@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.musics.models import Album, Artist, Playlist, Track
+from apps.musics.services.autocomplete import schedule_index, schedule_remove
+
+ENTITY_BY_MODEL = {
+    Track: "tracks",
+    Album: "albums",
+    Artist: "artists",
+    Playlist: "playlists",
+}
+
+
+@receiver(post_save, sender=Track, dispatch_uid="musics_track_autocomplete")
+@receiver(post_save, sender=Album, dispatch_uid="musics_album_autocomplete")
+@receiver(post_save, sender=Artist, dispatch_uid="musics_artist_autocomplete")
+@receiver(post_save, sender=Playlist, dispatch_uid="musics_playlist_autocomplete")
+def autocomplete_index(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_index(ENTITY_BY_MODEL[sender], sender.objects.filter(pk=instance.pk))
+    if sender is Artist:
+        # Имя артиста хранится в подсказках его треков и альбомов
+        schedule_index("albums", Album.objects.filter(artist_id=instance.pk))
+        schedule_index("tracks", Track.objects.filter(artist_id=instance.pk))
+
+
+@receiver(post_delete, sender=Track, dispatch_uid="musics_track_autocomplete_delete")
+@receiver(post_delete, sender=Album, dispatch_uid="musics_album_autocomplete_delete")
+@receiver(post_delete, sender=Artist, dispatch_uid="musics_artist_autocomplete_delete")
+@receiver(post_delete, sender=Playlist, dispatch_uid="musics_playlist_autocomplete_delete")
+def autocomplete_remove(sender, instance, **kwargs):
+    schedule_remove(ENTITY_BY_MODEL[sender], [instance.pk])
+
+
+__all__ = ["autocomplete_index", "autocomplete_remove"]
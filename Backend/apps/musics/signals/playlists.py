@@ -0,0 +1,98 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.musics.models import Playlist, PlaylistTrack, Track
+from apps.musics.services.playlists import change_counters, published_duration, refresh_counters
+
+from .responses import schedule_invalidate
+
+# Поля трека, от которых зависит total_duration плейлистов
+TRACK_DURATION_FIELDS = {"duration", "is_published"}
+
+
+@receiver(post_save, sender=PlaylistTrack, dispatch_uid="musics_playlist_track_added")
+def playlist_track_added(sender, instance, created, raw=False, **kwargs):
+    # PlaylistTrack.save() обёрнут в транзакцию — счётчик меняется в ней же
+    if created and not raw:
+        change_counters(
+            [instance.playlist_id], tracks=1, duration=published_duration([instance.track_id])
+        )
+
+
+@receiver(post_delete, sender=PlaylistTrack, dispatch_uid="musics_playlist_track_removed")
+def playlist_track_removed(sender, instance, origin=None, **kwargs):
+    # Удаляется сам плейлист — считать незачем
+    if isinstance(origin, Playlist) or (isinstance(origin, QuerySet) and origin.model is Playlist):
+        return
+    # Сервисы плейлистов удаляют queryset-ом и сдвигают счётчики сами, одной дельтой
+    if getattr(origin, "counters_applied", False):
+        return
+    # Трек удаляется каскадом после своих PlaylistTrack, так что ещё на месте
+    change_counters(
+        [instance.playlist_id], tracks=-1, duration=-published_duration([instance.track_id])
+    )
+
+
+@receiver(m2m_changed, sender=PlaylistTrack, dispatch_uid="musics_playlist_tracks_m2m")
+def playlist_tracks_added(sender, instance, action, reverse, pk_set, **kwargs):
+    # tracks.add() пишет PlaylistTrack через bulk_create; remove()/clear()
+    # удаляют queryset-ом, и их считает playlist_track_removed
+    if action != "post_add" or not pk_set:
+        return
+    if reverse:
+        change_counters(pk_set, tracks=1, duration=published_duration([instance.pk]))
+    else:
+        change_counters([instance.pk], tracks=len(pk_set), duration=published_duration(pk_set))
+
+
+@receiver(
+    m2m_changed, sender=Playlist.followers.through, dispatch_uid="musics_playlist_followers"
+)
+def playlist_followers_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("pre_remove", "pre_clear"):
+        # pk_set в remove() — запрошенные id, а не удалённые: считаем до удаления
+        links = sender.objects.filter(**{"user" if reverse else "playlist": instance})
+        if pk_set is not None:
+            links = links.filter(**{"playlist__in" if reverse else "user__in": pk_set})
+        instance._removed_follow_links = list(links.values_list("playlist_id", flat=True))
+        return
+    if action == "post_add" and pk_set:
+        playlist_ids = pk_set if reverse else [instance.pk]
+        change_counters(playlist_ids, followers=1 if reverse else len(pk_set))
+    elif action in ("post_remove", "post_clear"):
+        removed = getattr(instance, "_removed_follow_links", [])
+        instance._removed_follow_links = []
+        if not removed:
+            return
+        if reverse:
+            change_counters(removed, followers=-1)
+        else:
+            change_counters([instance.pk], followers=-len(removed))
+    else:
+        return
+    schedule_invalidate("playlists")
+
+
+@receiver(post_save, sender=Track, dispatch_uid="musics_playlist_track_duration")
+def track_duration_changed(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if created or raw:
+        return
+    if update_fields is not None and not TRACK_DURATION_FIELDS & set(update_fields):
+        return
+    # Редкая правка трека: пересчитываем только total_duration его плейлистов
+    refresh_counters(
+        Playlist.objects.filter(
+            pk__in=PlaylistTrack.objects.filter(track=instance).values("playlist")
+        ),
+        fields=["total_duration"],
+    )
+
+
+__all__ = [
+    "playlist_track_added",
+    "playlist_track_removed",
+    "playlist_tracks_added",
+    "playlist_followers_changed",
+    "track_duration_changed",
+]
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.musics.models import Track
+from apps.musics.services.plays import forget_track_ref
+
+
+@receiver(post_delete, sender=Track, dispatch_uid="musics_track_ref_delete")
+def track_ref_deleted(sender, instance, **kwargs):
+    # Иначе play() ещё час принимал бы прослушивания удалённого трека
+    forget_track_ref(instance.slug, instance.loaded_value("slug"))
+
+
+__all__ = ["track_ref_deleted"]
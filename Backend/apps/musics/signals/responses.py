@@ -0,0 +1,56 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.musics.models import Album, Artist, Genre, Like, Playlist, PlaylistTrack, Track
+from apps.shared.cache import invalidate_tags
+
+# Модель -> тег закэшированных ответов (apps.shared.cache.CachedResponseMixin)
+RESPONSE_TAGS = {
+    Track: "tracks",
+    Album: "albums",
+    Artist: "artists",
+    Genre: "genres",
+    Playlist: "playlists",
+    PlaylistTrack: "playlists",
+}
+# Счётчики, которые пишутся update()-ом мимо сигналов (фоновые задачи):
+# их теги сбрасывают сами задачи, а вьюхи со счётчиками добавляют их в cache_tags
+COUNTER_TAGS = {
+    Track: "counters:tracks",
+    Album: "counters:albums",
+    Artist: "counters:artists",
+}
+
+
+def schedule_invalidate(*tags):
+    # Сразу и ещё раз после коммита: параллельный запрос мог успеть
+    # закэшировать данные до коммита
+    invalidate_tags(*tags)
+    transaction.on_commit(partial(invalidate_tags, *tags))
+
+
+@receiver(post_save, dispatch_uid="musics_response_cache_save")
+@receiver(post_delete, dispatch_uid="musics_response_cache_delete")
+def catalog_changed(sender, raw=False, **kwargs):
+    tag = RESPONSE_TAGS.get(sender)
+    if tag and not raw:
+        schedule_invalidate(tag)
+
+
+@receiver(m2m_changed, sender=Track.genres.through, dispatch_uid="musics_response_cache_genres")
+def track_genres_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        schedule_invalidate("tracks")
+
+
+@receiver(post_save, sender=Like, dispatch_uid="musics_response_cache_like")
+@receiver(post_delete, sender=Like, dispatch_uid="musics_response_cache_unlike")
+def like_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_invalidate(f"likes:{instance.user_id}")
+
+
+__all__ = ["COUNTER_TAGS", "catalog_changed", "track_genres_changed", "like_changed"]
@@ -0,0 +1,42 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.musics.models import Album, Artist, Track
+from apps.musics.services.search import schedule_refresh
+
+
+@receiver(post_save, sender=Track, dispatch_uid="musics_track_search_vector")
+def track_search_vector(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_refresh(Track.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Album, dispatch_uid="musics_album_search_vector")
+def album_search_vector(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_refresh(Album.objects.filter(pk=instance.pk))
+    # Имя альбома входит в векторы его треков
+    if _name_changed(instance, created, update_fields):
+        schedule_refresh(Track.objects.filter(album_id=instance.pk))
+
+
+@receiver(post_save, sender=Artist, dispatch_uid="musics_artist_search_vector")
+def artist_search_vector(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_refresh(Artist.objects.filter(pk=instance.pk))
+    if _name_changed(instance, created, update_fields):
+        schedule_refresh(Album.objects.filter(artist_id=instance.pk))
+        schedule_refresh(Track.objects.filter(artist_id=instance.pk))
+
+
+def _name_changed(instance, created, update_fields):
+    # У нового объекта ещё нет альбомов и треков; правка био или аватара векторы не трогает
+    if created or (update_fields is not None and "name" not in update_fields):
+        return False
+    return instance.loaded_value("name") != instance.name
+
+
+__all__ = ["track_search_vector", "album_search_vector", "artist_search_vector"]
@@ -0,0 +1,20 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.musics.services.summaries import SUMMARY_CACHES, invalidate_summaries
+
+
+@receiver(post_save, dispatch_uid="musics_summaries_save")
+@receiver(post_delete, dispatch_uid="musics_summaries_delete")
+def summary_changed(sender, raw=False, **kwargs):
+    if raw or sender not in SUMMARY_CACHES:
+        return
+    # Как и с кэшем ответов: сразу и ещё раз после коммита
+    invalidate_summaries(sender)
+    transaction.on_commit(partial(invalidate_summaries, sender))
+
+
+__all__ = ["summary_changed"]
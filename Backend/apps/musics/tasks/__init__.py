@@ -0,0 +1,9 @@
+from .autocomplete import *  # noqa
+from .counters import *  # noqa
+from .history import *  # noqa
+from .leaderboards import *  # noqa
+from .listens import *  # noqa
+from .mixes import *  # noqa
+from .partitions import *  # noqa
+from .plays import *  # noqa
+from .recommendations import *  # noqa
@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from apps.musics.services.autocomplete import ENTITIES, rebuild
+
+
+@shared_task
+def rebuild_autocomplete(entities=None):
+    """Полная пересборка подсказок: подтягивает популярность (plays_count и т.п.)."""
+    return {entity: rebuild(entity) for entity in entities or ENTITIES}
+
+
+__all__ = ["rebuild_autocomplete"]
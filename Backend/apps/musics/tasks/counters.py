@@ -0,0 +1,20 @@
+from celery import shared_task
+
+from apps.musics.services.counters import reconcile_counters
+
+MAX_BATCHES_PER_RUN = 50
+
+
+@shared_task
+def reconcile_track_counters():
+    """Синхронизирует колонки plays/likes/download_count с живыми счётчиками в Redis."""
+    total = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        reconciled = reconcile_counters()
+        if not reconciled:
+            break
+        total += reconciled
+    return total
+
+
+__all__ = ["reconcile_track_counters"]
@@ -0,0 +1,20 @@
+from celery import shared_task
+
+from apps.musics.services.history import flush_listen_buffer
+
+MAX_BATCHES_PER_RUN = 20
+
+
+@shared_task
+def flush_listening_events():
+    """Периодически сливает буфер событий прослушивания в журнал и ListeningHistory."""
+    total = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        flushed = flush_listen_buffer()
+        if not flushed:
+            break
+        total += flushed
+    return total
+
+
+__all__ = ["flush_listening_events"]
@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from apps.musics.services.leaderboards import rebuild
+
+
+@shared_task
+def rebuild_leaderboard(entity, metric):
+    """Фоновая сборка общего рейтинга, если его ключа нет в Redis."""
+    return rebuild(entity, metric)
+
+
+__all__ = ["rebuild_leaderboard"]
@@ -0,0 +1,17 @@
+from celery import shared_task
+
+from apps.musics.services.listens import refresh_rolling_counts, rollup_days, rollup_hours
+
+
+@shared_task
+def rollup_listens(backfill=False):
+    """Сворачивает новые часы и дни и обновляет listens_last_week/month."""
+    hours = rollup_hours(backfill=backfill)
+    if not hours:
+        return 0
+    rollup_days()
+    refresh_rolling_counts()
+    return hours
+
+
+__all__ = ["rollup_listens"]
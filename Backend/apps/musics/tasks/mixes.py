@@ -0,0 +1,24 @@
+from celery import shared_task
+
+from apps.musics.services.mixes import MIX_SHARDS, generate_shard, prune_inactive
+
+
+@shared_task
+def generate_daily_mixes(shards=MIX_SHARDS):
+    """Раздаёт сборку подборок по шардам пользователей (user_id % shards)."""
+    for shard in range(shards):
+        generate_daily_mixes_shard.delay(shard, shards)
+    return {"shards": shards}
+
+
+@shared_task
+def generate_daily_mixes_shard(shard, shards=MIX_SHARDS):
+    """Подборки для активных пользователей одного шарда, порциями; подборки неактивных удаляются."""
+    return {
+        "shard": shard,
+        "users": generate_shard(shard, shards),
+        "pruned": prune_inactive(shard, shards),
+    }
+
+
+__all__ = ["generate_daily_mixes", "generate_daily_mixes_shard"]
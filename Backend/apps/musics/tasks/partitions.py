@@ -0,0 +1,24 @@
+from celery import shared_task
+from django.conf import settings
+
+from apps.musics.services.partitions import ensure_partitions, expire_partitions
+
+
+@shared_task
+def maintain_listening_partitions():
+    """
+    Заранее создаёт партиции журнала прослушиваний и убирает старые
+    (MUSICS_HISTORY_RETENTION_MONTHS, MUSICS_HISTORY_RETENTION_MODE).
+    """
+    created = ensure_partitions()
+    retain_months = getattr(settings, "MUSICS_HISTORY_RETENTION_MONTHS", None)
+    expired = []
+    if retain_months:
+        expired = expire_partitions(
+            retain_months,
+            mode=getattr(settings, "MUSICS_HISTORY_RETENTION_MODE", "detach"),
+        )
+    return {"created": created, "expired": expired}
+
+
+__all__ = ["maintain_listening_partitions"]
@@ -0,0 +1,20 @@
+from celery import shared_task
+
+from apps.musics.services.plays import flush_play_buffer
+
+MAX_BATCHES_PER_RUN = 20
+
+
+@shared_task
+def flush_play_events():
+    """Периодически сливает буфер прослушиваний в БД (см. CELERY beat_schedule)."""
+    total = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        flushed = flush_play_buffer()
+        if not flushed:
+            break
+        total += flushed
+    return total
+
+
+__all__ = ["flush_play_events"]
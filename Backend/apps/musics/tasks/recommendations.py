@@ -0,0 +1,19 @@
+from celery import shared_task
+
+from apps.musics.services.collaborative import compute_item_neighbors
+from apps.musics.services.neighbors import compute_neighbors
+
+
+@shared_task
+def compute_track_neighbors():
+    """Пересчёт похожих треков (TrackNeighbors) по признакам и совместным прослушиваниям."""
+    return {"tracks": compute_neighbors()}
+
+
+@shared_task
+def compute_track_item_neighbors():
+    """Пересчёт соседей для персональных рекомендаций (item-item CF по лайкам и истории)."""
+    return {"tracks": compute_item_neighbors()}
+
+
+__all__ = ["compute_track_neighbors", "compute_track_item_neighbors"]
@@ -4,7 +4,11 @@ from rest_framework.routers import DefaultRouter
 from apps.musics.api_endpoints.v1 import (
     AlbumViewSet,
     ArtistViewSet,
+    ChartsViewSet,
+    MixViewSet,
     PlaylistViewSet,
+    RecommendationViewSet,
+    SearchViewSet,
     LikeViewSet,
     ListeningHistoryViewSet,
     TrackViewSet,
@@ -19,6 +23,10 @@ router.register(r"playlists", PlaylistViewSet, basename="playlist")
 router.register(r"tracks", TrackViewSet, basename="track")
 router.register(r"likes", LikeViewSet, basename="like")
 router.register(r"history", ListeningHistoryViewSet, basename="history")
+router.register(r"charts", ChartsViewSet, basename="charts")
+router.register(r"search", SearchViewSet, basename="search")
+router.register(r"recommendations", RecommendationViewSet, basename="recommendations")
+router.register(r"mixes", MixViewSet, basename="mixes")
 
 urlpatterns = [
     path("", include(router.urls)),  # /musics/...
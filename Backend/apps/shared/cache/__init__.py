@@ -0,0 +1,5 @@
+from .responses import *  # noqa
+from .tags import *  # noqa
+from .conditional import *  # noqa
+from .swr import *  # noqa
+from .tiered import *  # noqa
@@ -0,0 +1,49 @@
+from .responses import CachedResponseMixin
+
+
+class ConditionalGetMixin(CachedResponseMixin):
+    """
+    Условный GET для list/retrieve. Совпал If-None-Match / If-Modified-Since —
+    304 без сериализации и без чтения кэша ответов.
+
+    Список: отпечаток — только версии cache_tags, без запросов в БД. Поэтому
+    всё, что меняет список, должно сбрасывать теги: модели — сигналами,
+    счётчики, которые пишутся update()-ом, — своими тегами (counters:*),
+    которые сбрасывают фоновые задачи; такие теги вьюха добавляет в cache_tags.
+
+    Объект: updated_at и stamp_fields одной строкой по первичному ключу.
+    stamp_fields — поля, которые меняются через update() мимо updated_at
+    (счётчики). Last-Modified их не учитывает, поэтому точен только ETag.
+    """
+
+    last_modified_field = "updated_at"
+    stamp_fields = ()
+
+    def get_response_stamp(self, request):
+        if self.action == "list":
+            return self.get_list_stamp()
+        if self.action == "retrieve":
+            return self.get_object_stamp()
+        return None
+
+    def get_list_stamp(self):
+        # ETag — хэш ключа ответа (путь, параметры, область, версии тегов),
+        # Last-Modified — самая свежая версия тега
+        return {"last_modified": None}
+
+    def get_object_stamp(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = (
+            self.get_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values(self.last_modified_field, *self.stamp_fields)
+            .first()
+        )
+        # Нет объекта — пусть обработчик вернёт 404
+        if row is None:
+            return None
+        row["last_modified"] = row.pop(self.last_modified_field)
+        return row
+
+
+__all__ = ["ConditionalGetMixin"]
@@ -0,0 +1,150 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+from django.utils.cache import patch_vary_headers, quote_etag
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .tags import get_tag_versions
+
+RESPONSE_CACHE_TIMEOUT = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 60)
+RESPONSE_KEY_PREFIX = "cache:response"
+
+
+class CachedResponseMixin:
+    """
+    Кэширует сериализованные ответы list/retrieve. Ключ — путь, query-параметры,
+    язык, область авторизации и версии cache_tags (apps.shared.cache.tags),
+    так что инвалидация — это invalidate_tags() из сигналов моделей.
+
+    Отдаёт ETag и 304 на If-None-Match — и из кэша, и на промахе.
+    Если get_response_stamp() что-то вернул, ETag/Last-Modified считаются
+    из отпечатка до похода в кэш (см. ConditionalGetMixin).
+    cache_per_user — ответ зависит от пользователя (is_liked и т.п.),
+    иначе делится между всеми авторизованными.
+    """
+
+    cache_tags = ()
+    cache_timeout = RESPONSE_CACHE_TIMEOUT
+    cache_per_user = False
+
+    def list(self, request, *args, **kwargs):
+        handler = super().list
+        return self.cached_response(request, lambda: handler(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        handler = super().retrieve
+        return self.cached_response(request, lambda: handler(request, *args, **kwargs))
+
+    def get_cache_tags(self, request):
+        return list(self.cache_tags)
+
+    def get_cache_scope(self, request):
+        if not request.user.is_authenticated:
+            return "anon"
+        return f"user:{request.user.pk}" if self.cache_per_user else "auth"
+
+    def get_response_stamp(self, request):
+        """
+        Дешёвый отпечаток данных ответа (см. ConditionalGetMixin) или None.
+        Отпечаток входит в ключ и сам даёт ETag — 304 без сериализации.
+        """
+        return None
+
+    def get_response_cache_key(self, request, versions=None, stamp=None):
+        if versions is None:
+            versions = get_tag_versions(self.get_cache_tags(request))
+        params = sorted(
+            (key, value)
+            for key in request.query_params
+            for value in request.query_params.getlist(key)
+        )
+        raw = json.dumps(
+            [
+                request.path,
+                params,
+                translation.get_language() or "",
+                self.get_cache_scope(request),
+                sorted(versions.items()),
+                stamp,
+            ],
+            cls=JSONEncoder,
+        )
+        return f"{RESPONSE_KEY_PREFIX}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+    def cached_response(self, request, compute):
+        """Ответ из кэша или compute() с записью в кэш (только 200 на GET)."""
+        if request.method != "GET":
+            return compute()
+
+        versions = get_tag_versions(self.get_cache_tags(request))
+        stamp = self.get_response_stamp(request)
+        key = self.get_response_cache_key(request, versions, stamp)
+        etag = last_modified = None
+        if stamp is not None:
+            etag = quote_etag(key.rsplit(":", 1)[1])
+            moments = (stamp["last_modified"], *versions.values())
+            last_modified = max(
+                (_timestamp(value) for value in moments if value is not None), default=None
+            )
+            if is_not_modified(request, etag, last_modified):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                return self.finalize_cached_response(response, etag, last_modified)
+
+        entry = cache.get(key)
+        if entry is None:
+            response = compute()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            entry = {"data": response.data, "etag": etag or make_etag(response.data)}
+            cache.set(key, entry, timeout=self.cache_timeout)
+
+        if etag_matches(entry["etag"], request.headers.get("If-None-Match")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry["data"])
+        return self.finalize_cached_response(response, entry["etag"], last_modified)
+
+    def finalize_cached_response(self, response, etag, last_modified=None):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_vary_headers(response, ("Authorization", "Accept-Language"))
+        return response
+
+
+def make_etag(data):
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True)
+    return quote_etag(hashlib.md5(content.encode()).hexdigest())
+
+
+def etag_matches(etag, header):
+    """Слабое сравнение для If-None-Match (W/ не учитывается, * совпадает со всем)."""
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag.removeprefix("W/") in {e.removeprefix("W/") for e in etags}
+
+
+def is_not_modified(request, etag, last_modified=None):
+    """If-None-Match, а если его нет — If-Modified-Since (RFC 9110, 13.2.2)."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        return etag_matches(etag, if_none_match)
+    since = parse_http_date_safe(request.headers.get("If-Modified-Since"))
+    return since is not None and last_modified is not None and int(last_modified) <= since
+
+
+def _timestamp(value):
+    # updated_at — datetime, версия тега — time_ns()
+    if isinstance(value, int):
+        return value / 1e9
+    return value.timestamp()
+
+
+__all__ = ["CachedResponseMixin", "make_etag", "etag_matches", "is_not_modified"]
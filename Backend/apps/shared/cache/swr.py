@@ -0,0 +1,143 @@
+import logging
+import math
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from apps.shared.utils.redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY_PREFIX = "cache:swr:lock"
+# Сколько держать блокировку пересчёта (дольше — значит, пересчёт упал)
+LOCK_TIMEOUT = 30
+# Сколько ждать чужого пересчёта при полном промахе, прежде чем считать самим
+MISS_WAIT = 2.0
+MISS_POLL = 0.05
+# Жёсткий TTL по умолчанию — во столько раз больше мягкого
+HARD_TTL_FACTOR = 5
+# Фоновые пересчёты; без фона (тесты) пересчёт идёт в запросе-победителе
+BACKGROUND_REFRESH = getattr(settings, "CACHE_SWR_BACKGROUND_REFRESH", True)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-swr")
+
+
+def get_or_refresh(key, compute, ttl, hard_ttl=None, beta=1.0):
+    """
+    Stale-while-revalidate для горячих ключей.
+
+    Значение свежее ttl секунд; потом до hard_ttl отдаётся устаревшим, а
+    пересчёт уходит в фон. Незадолго до ttl пересчёт запускается с
+    вероятностью, растущей к сроку и ко времени самого пересчёта (XFetch,
+    beta — агрессивность). Пересчитывает только взявший блокировку
+    (single-flight), остальные отдают то, что есть; при полном промахе
+    ждут его до MISS_WAIT секунд.
+    """
+    hard_ttl = hard_ttl or ttl * HARD_TTL_FACTOR
+    entry = cache.get(key)
+    if entry is not None:
+        early = entry["delta"] * beta * math.log(random.random() or 1e-12)
+        if time.time() - early >= entry["expires"]:
+            _refresh_in_background(key, compute, ttl, hard_ttl)
+        return entry["value"]
+
+    token = _acquire(key)
+    if token is None:
+        entry = _wait_for(key)
+        if entry is not None:
+            return entry["value"]
+        # Победитель не успел или упал — считаем сами, без записи
+        return compute()
+    try:
+        return _store(key, compute, ttl, hard_ttl)["value"]
+    finally:
+        _release(key, token)
+
+
+def _refresh_in_background(key, compute, ttl, hard_ttl):
+    token = _acquire(key)
+    if token is None:
+        return
+    if not BACKGROUND_REFRESH:
+        _refresh(key, compute, ttl, hard_ttl, token)
+        return
+    try:
+        _executor.submit(_refresh_in_thread, key, compute, ttl, hard_ttl, token)
+    except RuntimeError:
+        # Пул уже остановлен (завершение процесса)
+        _release(key, token)
+
+
+def _refresh_in_thread(key, compute, ttl, hard_ttl, token):
+    try:
+        _refresh(key, compute, ttl, hard_ttl, token)
+    finally:
+        # У потока свои соединения с БД — закрываем, чтобы не копились
+        connections.close_all()
+
+
+def _refresh(key, compute, ttl, hard_ttl, token):
+    try:
+        _store(key, compute, ttl, hard_ttl)
+    except Exception:
+        # Пока есть устаревшее значение, ошибка пересчёта не должна ронять запрос
+        logger.exception("Background refresh of %s failed", key)
+    finally:
+        _release(key, token)
+
+
+def _store(key, compute, ttl, hard_ttl):
+    started = time.time()
+    value = compute()
+    now = time.time()
+    entry = {"value": value, "expires": now + ttl, "delta": now - started}
+    cache.set(key, entry, timeout=hard_ttl)
+    return entry
+
+
+def _wait_for(key):
+    deadline = time.monotonic() + MISS_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(MISS_POLL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def _acquire(key):
+    """Токен блокировки пересчёта key или None, если она занята."""
+    token = uuid.uuid4().hex
+    lock_key = f"{LOCK_KEY_PREFIX}:{key}"
+    redis = get_redis_connection()
+    if redis is not None:
+        acquired = redis.set(lock_key, token, nx=True, ex=LOCK_TIMEOUT)
+    else:
+        acquired = cache.add(lock_key, token, timeout=LOCK_TIMEOUT)
+    return token if acquired else None
+
+
+def _release(key, token):
+    lock_key = f"{LOCK_KEY_PREFIX}:{key}"
+    redis = get_redis_connection()
+    if redis is not None:
+        # Снимаем только свою блокировку: чужая могла появиться после истечения нашей
+        redis.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+    elif cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+__all__ = ["get_or_refresh"]
@@ -0,0 +1,43 @@
+import time
+
+from django.core.cache import cache
+
+TAG_KEY_PREFIX = "cache:tag"
+# Версия тега живёт дольше любых закэшированных под ней значений
+TAG_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def get_tag_versions(tags):
+    """
+    Текущие версии тегов одним get_many. Версия входит в ключ кэша, поэтому
+    инвалидация — это просто новая версия: старые записи больше не адресуются
+    и дотухают по TTL. Отсутствующий тег получает новую версию (а не 0,
+    иначе после вытеснения ключа ожили бы старые записи).
+    """
+    keys = {tag: _tag_key(tag) for tag in tags}
+    stored = cache.get_many(list(keys.values()))
+    versions = {}
+    for tag, key in keys.items():
+        version = stored.get(key)
+        if version is None:
+            cache.add(key, _new_version(), timeout=TAG_TIMEOUT)
+            version = cache.get(key)
+        versions[tag] = version
+    return versions
+
+
+def invalidate_tags(*tags):
+    """Сбросить всё, что закэшировано под этими тегами."""
+    version = _new_version()
+    cache.set_many({_tag_key(tag): version for tag in tags}, timeout=TAG_TIMEOUT)
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def _tag_key(tag):
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+__all__ = ["get_tag_versions", "invalidate_tags"]
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .tags import get_tag_versions, invalidate_tags
+
+L1_MAXSIZE = getattr(settings, "CACHE_L1_MAXSIZE", 2048)
+L1_TTL = getattr(settings, "CACHE_L1_TTL", 300)
+# Как часто процесс сверяет версию пространства с L2 (сек) — это и есть
+# задержка, с которой инвалидация из другого воркера доходит до L1
+L1_VERSION_CHECK = getattr(settings, "CACHE_L1_VERSION_CHECK", 1.0)
+L2_TIMEOUT = 60 * 60
+
+
+class TieredCache:
+    """
+    Двухуровневый кэш для редко меняющихся данных каталога:
+    L1 — LRU в памяти процесса (maxsize записей, ttl секунд),
+    L2 — общий Django-кэш (django-redis в проде).
+
+    Инвалидация — версией пространства (apps.shared.cache.tags): версия
+    входит в ключи L2 и в записи L1, так что invalidate() в одном воркере
+    доходит до остальных не позже чем через L1_VERSION_CHECK секунд.
+    """
+
+    def __init__(self, namespace, maxsize=L1_MAXSIZE, ttl=L1_TTL, timeout=L2_TIMEOUT):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timeout = timeout
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked = 0.0
+
+    def get_many(self, keys, loader):
+        """
+        {key: value} для keys. Чего нет ни в L1, ни в L2, берётся из
+        loader(missing_keys) -> {key: value}; отсутствующие в ответе
+        loader ключи не кэшируются и в результат не попадают.
+        """
+        version = self._current_version()
+        now = time.monotonic()
+        found, missing = {}, []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                item = self._local.get(key)
+                if item is not None and item[0] == version and item[1] > now:
+                    self._local.move_to_end(key)
+                    found[key] = item[2]
+                else:
+                    missing.append(key)
+        if not missing:
+            return found
+
+        l2_keys = {self._l2_key(version, key): key for key in missing}
+        fetched = {l2_keys[l2_key]: value for l2_key, value in cache.get_many(list(l2_keys)).items()}
+        rest = [key for key in missing if key not in fetched]
+        if rest:
+            loaded = loader(rest)
+            cache.set_many(
+                {self._l2_key(version, key): value for key, value in loaded.items()},
+                timeout=self.timeout,
+            )
+            fetched.update(loaded)
+
+        expires = now + self.ttl
+        with self._lock:
+            for key, value in fetched.items():
+                self._local[key] = (version, expires, value)
+                self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+        found.update(fetched)
+        return found
+
+    def invalidate(self):
+        """Сбросить пространство во всех процессах (в текущем — сразу)."""
+        invalidate_tags(self._tag)
+        with self._lock:
+            self._local.clear()
+            self._version = None
+
+    def _current_version(self):
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked >= L1_VERSION_CHECK:
+            self._version = get_tag_versions([self._tag])[self._tag]
+            self._version_checked = now
+        return self._version
+
+    @property
+    def _tag(self):
+        return f"tiered:{self.namespace}"
+
+    def _l2_key(self, version, key):
+        return f"cache:tiered:{self.namespace}:{version}:{key}"
+
+
+__all__ = ["TieredCache"]
@@ -0,0 +1,113 @@
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from apps.shared.utils.text import fold
+
+# Без стемминга: названия на uz/ru/en, словари одного языка тут только мешают
+SEARCH_CONFIG = "simple"
+
+
+def supports_fulltext(queryset, vector_field="search_vector"):
+    if connections[queryset.db].vendor != "postgresql":
+        return False
+    try:
+        queryset.model._meta.get_field(vector_field)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def fulltext_search(
+    queryset,
+    query,
+    fallback_fields=("search_key",),
+    vector_field="search_vector",
+    trigram_field="search_key",
+):
+    """
+    Поиск по tsvector-колонке (GIN) плюс триграммы по search_key для опечаток
+    (оператор %, тоже GIN). Запрос ищется как есть и в свёрнутом виде (fold),
+    так что "Юлдуз" находит "Yulduz". Результат аннотирован search_rank
+    и отсортирован по нему. Без PostgreSQL — OR из contains по свёрнутым
+    fallback_fields (search_key и т.п.).
+    """
+    query = (query or "").strip()
+    folded = fold(query)
+    if not folded:
+        return queryset
+
+    if not supports_fulltext(queryset, vector_field):
+        condition = reduce(
+            or_, (Q(**{f"{field}__contains": folded}) for field in fallback_fields)
+        )
+        return queryset.filter(condition).distinct()
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    if folded != query:
+        search_query |= SearchQuery(folded, config=SEARCH_CONFIG, search_type="websearch")
+    condition = Q(**{vector_field: search_query})
+    if trigram_field:
+        condition |= Q(**{f"{trigram_field}__trigram_similar": folded})
+    return (
+        queryset.annotate(search_rank=SearchRank(F(vector_field), search_query))
+        .filter(condition)
+        .order_by("-search_rank")
+    )
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter, который на PostgreSQL ищет через fulltext_search()
+    (search_vector + триграммы), а в остальных случаях ведёт себя как обычный,
+    но со свёрнутыми (fold) терминами — search_fields вьюхи должны быть
+    search_key-полями.
+    """
+
+    vector_field = "search_vector"
+    trigram_field = "search_key"
+
+    def get_search_terms(self, request):
+        return [term for term in map(fold, super().get_search_terms(request)) if term]
+
+    def filter_queryset(self, request, queryset, view):
+        if not supports_fulltext(queryset, self.vector_field):
+            return super().filter_queryset(request, queryset, view)
+        query = request.query_params.get(self.search_param, "")
+        return fulltext_search(
+            queryset,
+            query,
+            vector_field=self.vector_field,
+            trigram_field=self.trigram_field,
+        )
+
+
+class RelevanceOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter, который при поиске не подставляет ordering вьюхи по
+    умолчанию: иначе он перебивает сортировку по search_rank. Явный
+    ?ordering= по-прежнему применяется.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params
+        if params.get(self.search_param, "").strip() and not params.get(self.ordering_param):
+            return None
+        return super().get_ordering(request, queryset, view)
+
+
+__all__ = [
+    "SEARCH_CONFIG",
+    "supports_fulltext",
+    "fulltext_search",
+    "FullTextSearchFilter",
+    "RelevanceOrderingFilter",
+]
@@ -15,7 +15,44 @@ class NamedModel(TimeStempedModel):
     slug = models.SlugField(
         verbose_name=_("Slug"), max_length=255, blank=True, null=True
     )
+    # Свёрнутое имя (транслит, без регистра и диакритики) для поиска и подсказок
+    search_key = models.CharField(
+        verbose_name=_("Search key"),
+        max_length=255,
+        blank=True,
+        default="",
+        db_index=True,
+        editable=False,
+    )
+
+    # Поля, значения которых запоминаются при загрузке (см. loaded_value)
+    TRACKED_FIELDS = ("name", "slug")
 
     class Meta:
         abstract = True
         ordering = ["-created_at"]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value
+            for name, value in zip(field_names, values)
+            if name in cls.TRACKED_FIELDS
+        }
+        return instance
+
+    def loaded_value(self, field):
+        """Значение поля на момент загрузки из БД (None у нового объекта или отложенного поля)."""
+        return getattr(self, "_loaded_values", {}).get(field)
+
+    def save(self, *args, **kwargs):
+        from apps.shared.utils.text import fold
+
+        self.search_key = fold(self.name)[:255]
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "search_key"}
+        super().save(*args, **kwargs)
+        # post_save уже отработал со старыми значениями
+        self._loaded_values = {name: getattr(self, name) for name in self.TRACKED_FIELDS}
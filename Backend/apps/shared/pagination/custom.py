@@ -1,10 +1,13 @@
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from apps.shared.paginations.estimated import EstimatedCountPaginator
+
 
 class CustomPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     page_size = 5
+    django_paginator_class = EstimatedCountPaginator
 
     def get_paginated_response(self, data):
         paginator = self.page.paginator
@@ -17,6 +20,7 @@ class CustomPagination(PageNumberPagination):
                     "previous": self.get_previous_link(),
                 },
                 "total_items": paginator.count,
+                "total_is_exact": paginator.count_is_exact,
                 "total_pages": paginator.num_pages,
                 "page_size": self.get_page_size(self.request),
                 "current_page": self.page.number,
@@ -1 +1,3 @@
 from .base import *  # noqa
+from .estimated import *  # noqa
+from .keyset import *  # noqa
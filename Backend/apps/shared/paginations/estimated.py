@@ -0,0 +1,86 @@
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from apps.shared.utils.counts import estimated_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator, у которого count — оценка (apps.shared.utils.counts).
+    Пока count неточный, номер страницы не ограничивается num_pages,
+    а наличие следующей страницы определяется лишним (per_page + 1) рядом.
+    """
+
+    @cached_property
+    def _estimate(self):
+        return estimated_count(self.object_list)
+
+    @cached_property
+    def count(self):
+        return self._estimate[0]
+
+    @property
+    def count_is_exact(self):
+        return self._estimate[1]
+
+    def validate_number(self, number):
+        if self.count_is_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_is_exact:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return EstimatedPage(rows[: self.per_page], number, self, len(rows) > self.per_page)
+
+
+class EstimatedPage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """PageNumberPagination без COUNT(*) на каждой странице; total_is_exact — точен ли count."""
+
+    django_paginator_class = EstimatedCountPaginator
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_paginated_response(self, data):
+        paginator = self.page.paginator
+        return Response(
+            {
+                "count": paginator.count,
+                "total_is_exact": paginator.count_is_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["total_is_exact"] = {"type": "boolean"}
+        return response_schema
+
+
+__all__ = ["EstimatedCountPaginator", "EstimatedCountPagination"]
@@ -0,0 +1,214 @@
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.shared.utils.counts import estimated_count
+from .estimated import EstimatedCountPagination
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset-пагинация: страница берётся условием WHERE (поле, id) < (последнее
+    значение) вместо OFFSET, поэтому глубокие страницы не дороже первой.
+
+    Порядок берётся из queryset (после OrderingFilter), к нему добавляется id
+    для однозначности. Курсор — base64 от значений последней строки и самого
+    порядка; курсор от другой сортировки не принимается.
+
+    page_number_compat — при ?page=N работать как PageNumberPagination
+    (для старых клиентов, count — оценка). optional — без ?cursor/?page_size не пагинировать.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    total_query_param = "with_total"
+    page_number_compat = False
+    optional = False
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_number_paginator = None
+
+        if self.page_number_compat and "page" in request.query_params:
+            self.page_number_paginator = self.get_page_number_paginator()
+            return self.page_number_paginator.paginate_queryset(queryset, request, view)
+
+        params = request.query_params
+        if self.optional and not (
+            self.cursor_query_param in params or self.page_size_query_param in params
+        ):
+            return None
+
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.total = None
+        if params.get(self.total_query_param):
+            self.total, self.total_is_exact = estimated_count(queryset)
+
+        values = self.decode_cursor(request, queryset)
+        queryset = queryset.order_by(*self.ordering)
+        if values is not None:
+            queryset = queryset.filter(self.get_keyset_filter(queryset.model, values))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        if self.page_number_paginator is not None:
+            return self.page_number_paginator.get_paginated_response(data)
+
+        payload = {"next": self.get_next_link(), "results": data}
+        if self.total is not None:
+            payload["total"] = self.total
+            payload["total_is_exact"] = self.total_is_exact
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "total": {"type": "integer"},
+                "total_is_exact": {"type": "boolean"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor from the `next` link",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.total_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include a (possibly estimated) total count",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+    def get_page_number_paginator(self):
+        paginator = EstimatedCountPagination()
+        paginator.page_size = self.page_size
+        paginator.page_size_query_param = self.page_size_query_param
+        paginator.max_page_size = self.max_page_size
+        return paginator
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Поля сортировки queryset + pk в том же направлении, что и последнее поле."""
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        pk_name = queryset.model._meta.pk.name
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str) or "__" in item or item.lstrip("-") == "?":
+                raise ImproperlyConfigured(
+                    f"KeysetPagination supports only local field ordering, got {item!r}"
+                )
+            name = item.lstrip("-")
+            name = pk_name if name == "pk" else name
+            fields.append(("-" if item.startswith("-") else "") + name)
+            if name == pk_name:
+                return fields
+        descending = fields[-1].startswith("-") if fields else False
+        fields.append(("-" if descending else "") + pk_name)
+        return fields
+
+    def get_keyset_filter(self, model, values):
+        """(a < x) OR (a = x AND b < y) OR ... с учётом направления каждого поля."""
+        condition = Q()
+        equal = {}
+        for item, value in zip(self.ordering, values):
+            name = item.lstrip("-")
+            lookup = "lt" if item.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [getattr(last, item.lstrip("-")) for item in self.ordering]
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "page")
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    def encode_cursor(self, values):
+        payload = {"o": self.ordering, "v": [self._dump(value) for value in values]}
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request, queryset):
+        """Значения курсора, приведённые к типам полей сортировки; битый курсор — 404."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            if payload["o"] != self.ordering or len(payload["v"]) != len(self.ordering):
+                raise ValueError
+            return [
+                self._load(self._ordering_field(queryset, item.lstrip("-")), value)
+                for item, value in zip(self.ordering, payload["v"])
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _ordering_field(queryset, name):
+        # Сортировка может идти по аннотации (например, search_rank)
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(name)
+
+    @staticmethod
+    def _load(field, value):
+        # Сравнение с NULL в keyset-условии не работает, а словари/списки — не значения поля
+        if value is None or isinstance(value, (dict, list)):
+            raise ValueError
+        value = field.to_python(value)
+        if value is None:
+            raise ValueError
+        return value
+
+    @staticmethod
+    def _dump(value):
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return value
+
+
+__all__ = ["KeysetPagination"]
@@ -1 +1,2 @@
 from .base import *  # noqa
+from .redis import *  # noqa
@@ -1,3 +1,17 @@
+import gc
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from faker import Faker
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -38,3 +52,100 @@ class BaseAPITestCase(APITestCase):
             "Content-Type": "application/json",
             "Authorization": f"bearer {token}",
         }
+
+
+class BenchmarkAPITestCase(APITestCase):
+    """
+    Бюджеты эндпоинтов: данные — seed_music с seed_options (умножаются на
+    BENCHMARK_SCALE из окружения), на эндпоинт — потолок запросов к БД и
+    p95 времени ответа. Каждый прогон — с пустым кэшем, то есть худший
+    случай. Замеры класса пишутся в JSON (BENCHMARK_REPORT), превышение
+    бюджета валит тест.
+    """
+
+    seed_options = {
+        "artists": 20,
+        "albums": 40,
+        "tracks": 200,
+        "users": 20,
+        "playlists": 20,
+        "likes": 400,
+        "history": 600,
+    }
+    runs = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.write_report()
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        scale = float(os.environ.get("BENCHMARK_SCALE", "1"))
+        # Одинаковые данные от прогона к прогону — сравнимые цифры
+        random.seed(0)
+        Faker.seed(0)
+        call_command(
+            "seed_music",
+            stdout=io.StringIO(),
+            **{key: max(1, int(value * scale)) for key, value in cls.seed_options.items()},
+        )
+
+    def assertBudget(self, name, url, max_queries, p95_ms, params=None):
+        """GET url runs раз (после прогрева): max запросов <= max_queries, p95 <= p95_ms."""
+        # Прогрев: импорты, L1-кэш сводок и т.п. в замер не попадают
+        self.client.get(url, params)
+        queries, timings = [], []
+        # Как timeit: сборщик мусора не должен давать случайные выбросы
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(self.runs):
+                cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = self.client.get(url, params)
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.assertEqual(response.status_code, 200, f"{name}: {response.status_code}")
+                queries.append(len(captured))
+        finally:
+            gc.enable()
+
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        self.results.append(
+            {
+                "name": name,
+                "url": url,
+                "runs": self.runs,
+                "queries": max(queries),
+                "max_queries": max_queries,
+                "p95_ms": round(p95, 2),
+                "p95_budget_ms": p95_ms,
+            }
+        )
+        self.assertLessEqual(
+            max(queries), max_queries, f"{name}: {max(queries)} queries > budget {max_queries}"
+        )
+        self.assertLessEqual(p95, p95_ms, f"{name}: p95 {p95:.1f}ms > budget {p95_ms}ms")
+
+    @classmethod
+    def write_report(cls):
+        path = os.environ.get("BENCHMARK_REPORT") or os.path.join(
+            tempfile.gettempdir(), "benchmark_report.json"
+        )
+        try:
+            with open(path) as file:
+                report = json.load(file)
+        except (OSError, ValueError):
+            report = {}
+        report[f"{cls.__module__}.{cls.__qualname__}"] = sorted(
+            cls.results, key=lambda result: result["name"]
+        )
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
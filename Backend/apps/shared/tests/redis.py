@@ -0,0 +1,34 @@
+import sys
+from unittest import mock
+
+import fakeredis
+
+from apps.shared.utils import redis as redis_utils
+
+
+class FakeRedisMixin:
+    """
+    Подменяет get_redis_connection на fakeredis (с Lua через lupa), чтобы
+    тесты шли по Redis-пути сервисов, а не по запасному через БД.
+    Сервисы импортируют функцию к себе, поэтому патчится каждый модуль,
+    который её держит. Клиент — self.redis, на каждый тест новый.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.redis = fakeredis.FakeRedis()
+        original = redis_utils.get_redis_connection
+        modules = [
+            module
+            for module in list(sys.modules.values())
+            if getattr(module, "get_redis_connection", None) is original
+        ]
+        for module in modules:
+            patcher = mock.patch.object(
+                module, "get_redis_connection", return_value=self.redis
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+__all__ = ["FakeRedisMixin"]
@@ -0,0 +1,68 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+# Ниже порога считаем точно, выше — довольствуемся оценкой планировщика
+COUNT_ESTIMATE_THRESHOLD = getattr(settings, "COUNT_ESTIMATE_THRESHOLD", 10000)
+COUNT_CACHE_TIMEOUT = getattr(settings, "COUNT_CACHE_TIMEOUT", 60)
+
+
+def estimated_count(queryset, threshold=None, timeout=None):
+    """
+    Возвращает (count, is_exact) без COUNT(*) на каждом запросе.
+
+    PostgreSQL: без фильтров — pg_class.reltuples, с фильтрами — "Plan Rows"
+    из EXPLAIN; если оценка ниже порога, делается точный COUNT(*).
+    Другие СУБД: COUNT(*), закэшированный на timeout секунд по тексту запроса
+    (то есть по набору фильтров); ответ из кэша помечается как неточный.
+    """
+    threshold = COUNT_ESTIMATE_THRESHOLD if threshold is None else threshold
+    timeout = COUNT_CACHE_TIMEOUT if timeout is None else timeout
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+
+    if connection.vendor == "postgresql":
+        estimate = _planner_estimate(queryset, connection)
+        if estimate is not None and estimate >= threshold:
+            return estimate, False
+        return queryset.count(), True
+
+    key = f"estimated_count_{_signature(queryset)}"
+    count = cache.get(key)
+    if count is not None:
+        return count, False
+    count = queryset.count()
+    cache.set(key, count, timeout=timeout)
+    return count, True
+
+
+def _planner_estimate(queryset, connection):
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 — таблица ещё ни разу не анализировалась
+            if row and row[0] >= 0:
+                return row[0]
+            return None
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _signature(queryset):
+    sql, params = queryset.query.sql_with_params()
+    return hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+
+
+__all__ = ["estimated_count"]
@@ -0,0 +1,21 @@
+from django.core.cache import DEFAULT_CACHE_ALIAS
+
+
+def get_redis_connection(alias=DEFAULT_CACHE_ALIAS):
+    """
+    Возвращает "сырой" клиент Redis, который стоит за django-redis кэшем.
+    Если кэш не Redis (dev/тесты на LocMemCache) — возвращает None,
+    и вызывающий код должен перейти на синхронный путь через БД.
+    """
+    try:
+        from django_redis import get_redis_connection as _get_redis_connection
+    except ImportError:
+        return None
+
+    try:
+        return _get_redis_connection(alias)
+    except NotImplementedError:
+        return None
+
+
+__all__ = ["get_redis_connection"]
@@ -0,0 +1,40 @@
+import re
+import unicodedata
+
+# Кириллица (ru + uz) -> латиница, близко к узбекской латинице
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "j", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "",
+    "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+    "ў": "o", "қ": "q", "ғ": "g", "ҳ": "h",
+}
+# Разные латинские записи одного звука сводятся к одной
+LATIN_EQUIVALENTS = (
+    ("kh", "x"),
+    ("zh", "j"),
+    ("shch", "sh"),
+)
+# oʻ / gʻ и прочие апострофы просто выкидываются
+_APOSTROPHES_RE = re.compile(r"['`ʻʼ‘’]")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text):
+    """
+    Ключ для поиска: нижний регистр, без диакритики и апострофов,
+    кириллица транслитерирована, всё кроме a-z0-9 — одиночные пробелы.
+    "Юлдуз" и "Yulduz" дают одно и то же "yulduz".
+    """
+    text = (text or "").lower()
+    text = "".join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = _APOSTROPHES_RE.sub("", text)
+    for variant, canonical in LATIN_EQUIVALENTS:
+        text = text.replace(variant, canonical)
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+__all__ = ["fold"]
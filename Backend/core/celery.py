@@ -2,7 +2,7 @@ import os
 
 from celery import Celery
 
-# from celery.schedules import crontab
+from celery.schedules import crontab
 
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
@@ -12,3 +12,42 @@ app = Celery("core")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 
 app.autodiscover_tasks()
+
+app.conf.beat_schedule = {
+    "musics-flush-play-events": {
+        "task": "apps.musics.tasks.plays.flush_play_events",
+        "schedule": 10.0,
+    },
+    "musics-reconcile-track-counters": {
+        "task": "apps.musics.tasks.counters.reconcile_track_counters",
+        "schedule": 60.0,
+    },
+    "musics-flush-listening-events": {
+        "task": "apps.musics.tasks.history.flush_listening_events",
+        "schedule": 10.0,
+    },
+    "musics-rollup-listens": {
+        "task": "apps.musics.tasks.listens.rollup_listens",
+        "schedule": crontab(minute=10),
+    },
+    "musics-maintain-listening-partitions": {
+        "task": "apps.musics.tasks.partitions.maintain_listening_partitions",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "musics-rebuild-autocomplete": {
+        "task": "apps.musics.tasks.autocomplete.rebuild_autocomplete",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "musics-compute-track-neighbors": {
+        "task": "apps.musics.tasks.recommendations.compute_track_neighbors",
+        "schedule": crontab(hour=4, minute=30),
+    },
+    "musics-compute-track-item-neighbors": {
+        "task": "apps.musics.tasks.recommendations.compute_track_item_neighbors",
+        "schedule": crontab(hour=5, minute=0),
+    },
+    "musics-generate-daily-mixes": {
+        "task": "apps.musics.tasks.mixes.generate_daily_mixes",
+        "schedule": crontab(hour=5, minute=30),
+    },
+}